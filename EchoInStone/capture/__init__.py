@@ -1,13 +1,22 @@
 # capture/__init__.py
 
+from .audio_buffer import AudioBuffer
 from .downloader_interface import DownloaderInterface
 from .youtube_downloader import YouTubeDownloader
+from .episode_selector import EpisodeSelector
+from .feed_sync_index import FeedSyncIndex
 from .podcast_downloader import PodcastDownloader
 from .audio_downloader import AudioDownloader
+from .download_cache import DownloadCache, CachedDownloader
 
 __all__ = [
+    'AudioBuffer',
     'DownloaderInterface',
     'YouTubeDownloader',
+    'EpisodeSelector',
+    'FeedSyncIndex',
     'PodcastDownloader',
-    'AudioDownloader'
+    'AudioDownloader',
+    'DownloadCache',
+    'CachedDownloader'
 ]
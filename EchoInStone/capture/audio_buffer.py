@@ -0,0 +1,176 @@
+import shutil
+import logging
+import subprocess
+import tempfile
+import wave
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class AudioBuffer:
+    def __init__(self, samples, sample_rate: int = 16000, source_path: str = None):
+        """
+        Initializes an in-memory mono audio buffer.
+
+        The buffer is decoded once and shared by the transcriber and the diarizer,
+        so neither library has to read and resample the file again.
+
+        Args:
+            samples: Mono samples in the [-1, 1] range; stored as a contiguous float32 array.
+            sample_rate (int): Sample rate of ``samples`` in Hz.
+            source_path (str): Path of the file the samples were decoded from, if any.
+        """
+        self.samples = np.ascontiguousarray(samples, dtype=np.float32)
+        self.sample_rate = sample_rate
+        self.source_path = source_path
+
+    def __len__(self):
+        return len(self.samples)
+
+    def __repr__(self):
+        return f"AudioBuffer(source={self.source_path!r}, duration={self.duration:.2f}s, sample_rate={self.sample_rate})"
+
+    @property
+    def duration(self) -> float:
+        """float: Duration of the buffer in seconds."""
+        return len(self.samples) / self.sample_rate
+
+    @classmethod
+    def from_file(cls, audio_path: str, sample_rate: int = 16000) -> "AudioBuffer":
+        """
+        Decodes an audio file into a mono float32 buffer at the requested sample rate.
+
+        16-bit PCM WAV files that are already mono at ``sample_rate`` are read
+        directly; anything else is decoded and resampled by ffmpeg.
+
+        Args:
+            audio_path (str): Path to the audio file.
+            sample_rate (int): Target sample rate in Hz.
+
+        Returns:
+            AudioBuffer: The decoded audio.
+        """
+        samples = cls._read_pcm_wav(audio_path, sample_rate)
+        if samples is None:
+            samples = cls._decode_with_ffmpeg(audio_path, sample_rate)
+        logger.debug(f"Decoded {audio_path}: {len(samples) / sample_rate:.2f}s at {sample_rate} Hz")
+        return cls(samples, sample_rate=sample_rate, source_path=audio_path)
+
+    @classmethod
+    def stream_file(cls, audio_path: str, block_s: float = 30.0, sample_rate: int = 16000):
+        """
+        Decodes an audio file block by block instead of all at once.
+
+        Only one block is held in memory at a time, so long recordings can be
+        processed while they are read.
+
+        Args:
+            audio_path (str): Path to the audio file.
+            block_s (float): Duration of each block in seconds; the last one may be shorter.
+            sample_rate (int): Target sample rate in Hz.
+
+        Yields:
+            np.ndarray: Mono float32 samples of each block.
+        """
+        block_samples = max(1, int(block_s * sample_rate))
+        blocks = cls._stream_pcm_wav(audio_path, block_samples, sample_rate)
+        if blocks is None:
+            blocks = cls._stream_with_ffmpeg(audio_path, block_samples, sample_rate)
+        yield from blocks
+
+    @staticmethod
+    def _stream_pcm_wav(audio_path: str, block_samples: int, sample_rate: int):
+        try:
+            wav = wave.open(audio_path, 'rb')
+        except (wave.Error, EOFError):
+            return None
+        if wav.getnchannels() != 1 or wav.getsampwidth() != 2 or wav.getframerate() != sample_rate:
+            wav.close()
+            return None
+
+        def blocks():
+            with wav:
+                while True:
+                    frames = wav.readframes(block_samples)
+                    if not frames:
+                        return
+                    yield np.frombuffer(frames, dtype='<i2').astype(np.float32) / 32768.0
+        return blocks()
+
+    @staticmethod
+    def _stream_with_ffmpeg(audio_path: str, block_samples: int, sample_rate: int):
+        if shutil.which("ffmpeg") is None:
+            raise RuntimeError("ffmpeg is required to decode audio but was not found in PATH")
+        command = [
+            "ffmpeg", "-hide_banner", "-loglevel", "error", "-nostdin",
+            "-i", audio_path,
+            "-vn", "-ac", "1", "-ar", str(sample_rate),
+            "-f", "f32le", "pipe:1",
+        ]
+        # stderr goes to a file rather than a pipe, so a chatty ffmpeg cannot block on it while stdout is read
+        stderr = tempfile.TemporaryFile()
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr)
+        try:
+            while True:
+                data = process.stdout.read(block_samples * 4)
+                if not data:
+                    break
+                yield np.frombuffer(data[:len(data) // 4 * 4], dtype='<f4')
+            if process.wait() != 0:
+                stderr.seek(0)
+                raise RuntimeError(f"ffmpeg exited with status {process.returncode}: {stderr.read().decode(errors='replace').strip()}")
+        finally:
+            # Also reached when the consumer stops early
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+            stderr.close()
+
+    @staticmethod
+    def _read_pcm_wav(audio_path: str, sample_rate: int):
+        try:
+            with wave.open(audio_path, 'rb') as wav:
+                if wav.getnchannels() != 1 or wav.getsampwidth() != 2 or wav.getframerate() != sample_rate:
+                    return None
+                frames = wav.readframes(wav.getnframes())
+        except (wave.Error, EOFError):
+            return None
+        return np.frombuffer(frames, dtype='<i2').astype(np.float32) / 32768.0
+
+    @staticmethod
+    def _decode_with_ffmpeg(audio_path: str, sample_rate: int):
+        if shutil.which("ffmpeg") is None:
+            raise RuntimeError("ffmpeg is required to decode audio but was not found in PATH")
+        command = [
+            "ffmpeg", "-hide_banner", "-loglevel", "error", "-nostdin",
+            "-i", audio_path,
+            "-vn", "-ac", "1", "-ar", str(sample_rate),
+            "-f", "f32le", "pipe:1",
+        ]
+        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg exited with status {result.returncode}: {result.stderr.decode(errors='replace').strip()}")
+        return np.frombuffer(result.stdout, dtype='<f4')
+
+    def to_pipeline_input(self) -> dict:
+        """
+        Returns the buffer in the form accepted by the transformers ASR pipeline.
+
+        Returns:
+            dict: ``{"raw": samples, "sampling_rate": sample_rate}``.
+        """
+        # The pipeline pops keys from the dict, so a fresh one is built for every call
+        return {"raw": self.samples, "sampling_rate": self.sample_rate}
+
+    def to_pyannote_input(self) -> dict:
+        """
+        Returns the buffer in the in-memory form accepted by pyannote pipelines.
+
+        Returns:
+            dict: ``{"waveform": (1, num_samples) tensor, "sample_rate": sample_rate}``.
+        """
+        import torch
+
+        # from_numpy shares memory with the samples array, no copy is made
+        return {"waveform": torch.from_numpy(self.samples).unsqueeze(0), "sample_rate": self.sample_rate}
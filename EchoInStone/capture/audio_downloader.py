@@ -1,22 +1,32 @@
 import os
 import shutil
 import logging
-import requests
 from urllib.parse import urlparse
 from pydub import AudioSegment
 from . import DownloaderInterface
+from .ffmpeg_stream_decoder import FFmpegStreamDecoder, decode_file
+from .http_download_engine import HttpDownloadEngine
 
 logger = logging.getLogger(__name__)
 
 class AudioDownloader(DownloaderInterface):
-    def __init__(self, output_dir='data/files'):
+    def __init__(self, output_dir='data/files', stream_decode=False, sample_rate=16000, engine=None):
         """
         Initializes the AudioDownloader with a specified output directory.
 
         Args:
             output_dir (str): The directory where copied files will be saved.
+            stream_decode (bool): If True, pipe the source straight into ffmpeg and write
+                mono PCM at ``sample_rate`` while it downloads, instead of saving the
+                original file and converting it in memory with pydub.
+            sample_rate (int): Output sample rate used in streaming mode.
+            engine (HttpDownloadEngine): Engine used for HTTP requests; its pooled session is
+                shared by validation and download, and it fetches ranges in parallel.
         """
         self.output_dir = output_dir
+        self.stream_decode = stream_decode
+        self.sample_rate = sample_rate
+        self.engine = engine or HttpDownloadEngine()
 
     def download(self, file_path: str) -> str:
         """
@@ -37,15 +47,13 @@ class AudioDownloader(DownloaderInterface):
             # Check if it's a URL or local file
             parsed_url = urlparse(file_path)
             is_url = bool(parsed_url.netloc)
+
+            if self.stream_decode:
+                return self._stream_decode(file_path, parsed_url, is_url)
             
             if is_url:
                 # Download from URL
                 logger.info(f"Downloading audio from URL: {file_path}")
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                }
-                response = requests.get(file_path, stream=True, headers=headers)
-                response.raise_for_status()
                 
                 # Get the file name from the URL
                 file_name = os.path.basename(parsed_url.path)
@@ -55,10 +63,8 @@ class AudioDownloader(DownloaderInterface):
                 file_base, file_ext = os.path.splitext(file_name)
                 destination_path = os.path.join(self.output_dir, file_name)
                 
-                # Save the downloaded file
-                with open(destination_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
+                # Save the downloaded file, in parallel ranges when the server supports them
+                self.engine.download(file_path, destination_path)
                 logger.info(f"File downloaded to {destination_path}")
             else:
                 # Copy from local file
@@ -83,6 +89,49 @@ class AudioDownloader(DownloaderInterface):
             logger.error(f"Error during file download/copy/conversion: {e}")
             return None
 
+    def _stream_decode(self, file_path, parsed_url, is_url) -> str:
+        """
+        Decodes the source to a mono WAV at ``self.sample_rate`` without keeping
+        the original file, overlapping the decode with the network transfer.
+
+        Args:
+            file_path (str): URL or local file path.
+            parsed_url: Result of ``urlparse(file_path)``.
+            is_url (bool): Whether ``file_path`` is a URL.
+
+        Returns:
+            str: Absolute path to the decoded WAV file.
+        """
+        if is_url:
+            file_name = os.path.basename(parsed_url.path) or "downloaded_audio.mp3"
+        else:
+            file_name = os.path.basename(file_path)
+        file_base, _ = os.path.splitext(file_name)
+        wav_file = os.path.join(self.output_dir, f"{file_base}.wav")
+        if not is_url and os.path.abspath(wav_file) == os.path.abspath(file_path):
+            # ffmpeg cannot overwrite its own input
+            wav_file = os.path.join(self.output_dir, f"{file_base}_{self.sample_rate}.wav")
+
+        if is_url:
+            logger.info(f"Streaming audio from URL into decoder: {file_path}")
+            response = self.engine.get(file_path, stream=True)
+            response.raise_for_status()
+            with FFmpegStreamDecoder(wav_file, sample_rate=self.sample_rate) as decoder:
+                for chunk in response.iter_content(chunk_size=65536):
+                    decoder.write(chunk)
+        else:
+            logger.info(f"Decoding local file: {file_path}")
+            decode_file(file_path, wav_file, sample_rate=self.sample_rate)
+
+        logger.info(f"File decoded to {self.sample_rate} Hz mono WAV: {wav_file}")
+        return os.path.abspath(wav_file)
+
+    def cache_fingerprint(self) -> str:
+        if self.stream_decode:
+            return f"{type(self).__name__}:mono-{self.sample_rate}"
+        # pydub keeps the source's channels and sample rate
+        return f"{type(self).__name__}:source-format"
+
     def validate_url(self, file_path: str) -> bool:
         """
         Validates if a file path or URL is valid.
@@ -100,10 +149,8 @@ class AudioDownloader(DownloaderInterface):
         if is_url:
             # For URLs, just check if the URL format is valid
             try:
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                }
-                response = requests.head(file_path, timeout=10, headers=headers)
+                # The engine keeps this HEAD response and reuses it for the download
+                response = self.engine.head(file_path)
                 if response.status_code == 200:
                     logger.debug(f"URL is valid: {file_path}")
                     return True
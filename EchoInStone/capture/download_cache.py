@@ -0,0 +1,290 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+import requests
+from collections import OrderedDict
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+from .downloader_interface import DownloaderInterface
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+def normalize_url(url: str) -> str:
+    """
+    Normalizes a URL so that equivalent spellings map to the same cache entry.
+
+    The scheme and host are lower-cased, default ports and fragments are dropped
+    and query parameters are sorted.
+
+    Args:
+        url (str): URL to normalize.
+
+    Returns:
+        str: The normalized URL.
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or '').lower()
+    if parsed.port and parsed.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parsed.port}"
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    return urlunparse((scheme, host, parsed.path or '/', parsed.params, query, ''))
+
+def hash_file(file_path: str, block_size: int = 1024 * 1024) -> str:
+    """
+    Computes the SHA-256 digest of a file's content.
+
+    Args:
+        file_path (str): Path of the file to hash.
+        block_size (int): Number of bytes read at a time.
+
+    Returns:
+        str: Hex digest of the file content.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class DownloadCache:
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, cache_dir='data/cache', max_bytes=10 * 1024 ** 3):
+        """
+        Initializes a content-addressed cache of converted WAV files.
+
+        Entries are evicted least-recently-used first once their total size
+        exceeds ``max_bytes``.
+
+        Args:
+            cache_dir (str): Directory holding the cached files and their index.
+            max_bytes (int): Disk budget for the cached files, in bytes.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._entries = self._load_index()
+
+    def _index_path(self) -> str:
+        return os.path.join(self.cache_dir, self.INDEX_FILE)
+
+    def _load_index(self) -> OrderedDict:
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                # Entries are stored oldest access first
+                return OrderedDict((key, entry) for key, entry in json.load(f)['entries'])
+        except FileNotFoundError:
+            return OrderedDict()
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache index {self._index_path()}: {e}")
+            return OrderedDict()
+
+    def _save_index(self):
+        tmp_path = self._index_path() + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'entries': list(self._entries.items())}, f, ensure_ascii=False)
+        os.replace(tmp_path, self._index_path())
+
+    def _entry_path(self, entry: dict) -> str:
+        return os.path.join(self.cache_dir, entry['file'])
+
+    @property
+    def total_bytes(self) -> int:
+        """int: Total size of the cached files."""
+        return sum(entry['size'] for entry in self._entries.values())
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: Hits, misses, number of entries and total size in bytes.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+            }
+
+    def get(self, key: str) -> str:
+        """
+        Looks up a cached file and marks it as most recently used.
+
+        Args:
+            key (str): Cache key of the source.
+
+        Returns:
+            str: Absolute path of the cached file, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not os.path.isfile(self._entry_path(entry)):
+                logger.debug(f"Cached file vanished, dropping entry: {key}")
+                del self._entries[key]
+                self._save_index()
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self._save_index()
+            return os.path.abspath(self._entry_path(entry))
+
+    def put(self, key: str, file_path: str) -> str:
+        """
+        Moves a converted file into the cache and evicts old entries if needed.
+
+        Args:
+            key (str): Cache key of the source.
+            file_path (str): Path of the converted file to store.
+
+        Returns:
+            str: Absolute path of the cached file.
+        """
+        _, ext = os.path.splitext(file_path)
+        file_name = hashlib.sha256(key.encode('utf-8')).hexdigest() + ext
+        cached_path = os.path.join(self.cache_dir, file_name)
+        with self._lock:
+            shutil.move(file_path, cached_path)
+            self._entries.pop(key, None)
+            self._entries[key] = {'file': file_name, 'size': os.path.getsize(cached_path)}
+            self._evict(keep=key)
+            self._save_index()
+        logger.info(f"Cached {key} as {cached_path}")
+        return os.path.abspath(cached_path)
+
+    def _evict(self, keep: str):
+        total = self.total_bytes
+        for key in list(self._entries):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            entry = self._entries.pop(key)
+            total -= entry['size']
+            try:
+                os.remove(self._entry_path(entry))
+            except FileNotFoundError:
+                pass
+            logger.info(f"Evicted least recently used cache entry: {key}")
+
+class CachedDownloader(DownloaderInterface):
+    def __init__(self, downloader: DownloaderInterface, cache: DownloadCache, use_http_validators=True):
+        """
+        Wraps a downloader so that already converted sources are served from a DownloadCache.
+
+        URLs are keyed on their normalized form plus the ETag/Last-Modified
+        validators returned by a HEAD request; local files are keyed on a hash
+        of their content. Both keys include the wrapped downloader's
+        ``cache_fingerprint``, so other conversion settings miss the cache.
+
+        Args:
+            downloader (DownloaderInterface): Downloader used on cache misses.
+            cache (DownloadCache): Cache storing the converted files.
+            use_http_validators (bool): Whether to add ETag/Last-Modified to URL keys.
+                Disable it for sources whose HEAD response does not describe the media.
+        """
+        self.downloader = downloader
+        self.cache = cache
+        self.use_http_validators = use_http_validators
+
+    @property
+    def output_dir(self):
+        return self.downloader.output_dir
+
+    def cache_key(self, url: str) -> str:
+        """
+        Computes the cache key of a URL or local file.
+
+        Args:
+            url (str): URL or local file path.
+
+        Returns:
+            str: The cache key.
+        """
+        settings = f"|settings={self.downloader.cache_fingerprint()}"
+        if not urlparse(url).netloc and os.path.isfile(url):
+            return f"file:{hash_file(url)}{settings}"
+
+        key = f"url:{normalize_url(url)}{settings}"
+        if self.use_http_validators:
+            try:
+                engine = getattr(self.downloader, 'engine', None)
+                if engine is not None:
+                    # Reuse the downloader's pooled session and cached HEAD response
+                    response = engine.head(url)
+                else:
+                    headers = {
+                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+                    }
+                    response = requests.head(url, timeout=10, headers=headers, allow_redirects=True)
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+                if etag or last_modified:
+                    key += f"|etag={etag or ''}|modified={last_modified or ''}"
+            except Exception as e:
+                logger.debug(f"Could not fetch cache validators for {url}: {e}")
+        return key
+
+    def download(self, url: str) -> str:
+        """
+        Returns the cached WAV file for a source, downloading and converting it on a miss.
+
+        Args:
+            url (str): URL or local file path.
+
+        Returns:
+            str: Absolute path to the converted WAV file, or None if the download failed.
+        """
+        key = self.cache_key(url)
+        cached_path = self.cache.get(key)
+        if cached_path:
+            logger.info(f"Cache hit for {url}: {cached_path}")
+            return cached_path
+
+        logger.info(f"Cache miss for {url}")
+        audio_path = self.downloader.download(url)
+        if not isinstance(audio_path, str) or not os.path.isfile(audio_path):
+            return audio_path
+        return self.cache.put(key, audio_path)
+
+    def validate_url(self, url: str) -> bool:
+        return self.downloader.validate_url(url)
+
+    def expand(self, url: str) -> list:
+        return self.downloader.expand(url)
+
+    def cache_fingerprint(self) -> str:
+        return self.downloader.cache_fingerprint()
+
+    def acknowledge(self, audio_path: str):
+        self.downloader.acknowledge(audio_path)
+
+    def iter_download(self, url: str, max_workers: int = None):
+        """
+        Yields the converted files of a URL, serving each collection item from the cache.
+
+        Downloaders that batch their items themselves (podcast feeds) are delegated to as is.
+
+        Args:
+            url (str): URL or source path, possibly a collection.
+            max_workers (int): Number of concurrent downloads.
+
+        Yields:
+            str: Path to each converted file.
+        """
+        if type(self.downloader).iter_download is not DownloaderInterface.iter_download:
+            yield from self.downloader.iter_download(url, max_workers)
+        else:
+            yield from super().iter_download(url, max_workers or getattr(self.downloader, 'max_workers', None))
@@ -4,24 +4,46 @@ from .podcast_downloader import PodcastDownloader
 from .youtube_downloader import YouTubeDownloader
 from .audio_downloader import AudioDownloader
 from .downloader_interface import DownloaderInterface
+from .download_cache import DownloadCache, CachedDownloader
+from .episode_selector import EpisodeSelector
+from .feed_sync_index import FeedSyncIndex
 
-def get_downloader(url: str, output_dir: str) -> DownloaderInterface:
+def get_downloader(url: str, output_dir: str, stream_decode: bool = False, cache: DownloadCache = None,
+                   selector: EpisodeSelector = None, sync_index: FeedSyncIndex = None) -> DownloaderInterface:
     """
     Determine the appropriate downloader based on the URL.
+
+    Args:
+        url (str): URL or local file path of the audio input.
+        output_dir (str): Directory where downloaded files will be saved.
+        stream_decode (bool): Decode direct audio sources to 16 kHz mono WAV while
+            they download instead of converting them afterwards.
+        cache (DownloadCache): Optional cache of converted files shared across runs.
+        selector (EpisodeSelector): Podcast episodes processed in batch mode.
+        sync_index (FeedSyncIndex): Podcast index used to process only new episodes in batch mode.
     """
+    downloader = _select_downloader(url, output_dir, stream_decode, selector, sync_index)
+    if cache is not None:
+        # YouTube watch pages carry no validators describing the media itself
+        use_http_validators = not isinstance(downloader, YouTubeDownloader)
+        return CachedDownloader(downloader, cache, use_http_validators=use_http_validators)
+    return downloader
+
+def _select_downloader(url: str, output_dir: str, stream_decode: bool,
+                       selector: EpisodeSelector, sync_index: FeedSyncIndex) -> DownloaderInterface:
     if "youtube.com" in url or "youtu.be" in url:
         return YouTubeDownloader(output_dir=output_dir)
     elif url.endswith(".xml"):
-        return PodcastDownloader(output_dir=output_dir)
+        return PodcastDownloader(output_dir=output_dir, selector=selector, sync_index=sync_index)
     elif url.endswith(".mp3") or url.endswith(".wav") or url.endswith(".m4a") or url.endswith(".flac"):
-        return AudioDownloader(output_dir=output_dir)
+        return AudioDownloader(output_dir=output_dir, stream_decode=stream_decode)
     elif os.path.isfile(url):  # Local file path
-        return AudioDownloader(output_dir=output_dir)
+        return AudioDownloader(output_dir=output_dir, stream_decode=stream_decode)
     else:
         # Check if it's a valid URL format
         parsed_url = urlparse(url)
         if bool(parsed_url.netloc):
             # It's a URL but doesn't match our specific patterns, try AudioDownloader
-            return AudioDownloader(output_dir=output_dir)
+            return AudioDownloader(output_dir=output_dir, stream_decode=stream_decode)
         else:
-            raise ValueError("Unsupported URL format")
\ No newline at end of file
+            raise ValueError("Unsupported URL format")
@@ -1,4 +1,9 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import logging
+from .audio_buffer import AudioBuffer
+
+logger = logging.getLogger(__name__)
 
 class DownloaderInterface(ABC):
     @abstractmethod
@@ -25,3 +30,88 @@ class DownloaderInterface(ABC):
             bool: True if the URL is valid, False otherwise.
         """
         pass
+
+    def download_audio(self, url: str, sample_rate: int = 16000) -> AudioBuffer:
+        """Downloads a file and decodes it once into an in-memory audio buffer.
+
+        Args:
+            url (str): URL or source path of the file to download.
+            sample_rate (int): Sample rate of the returned buffer.
+
+        Returns:
+            AudioBuffer: The decoded audio, or None if the download or decode failed.
+        """
+        audio_path = self.download(url)
+        if not isinstance(audio_path, str):
+            return None
+        try:
+            return AudioBuffer.from_file(audio_path, sample_rate=sample_rate)
+        except Exception as e:
+            logger.error(f"Error decoding {audio_path}: {e}")
+            return None
+
+    def expand(self, url: str) -> list:
+        """Expands a collection URL (playlist, channel...) into the URLs of its items.
+
+        Args:
+            url (str): URL or source path.
+
+        Returns:
+            list: The item URLs; a single-item list for anything that is not a collection.
+        """
+        return [url]
+
+    def cache_fingerprint(self) -> str:
+        """Describes the settings that shape the converted files.
+
+        Sources downloaded with different fingerprints are cached separately, so
+        changing the conversion settings never serves a file converted with the old ones.
+
+        Returns:
+            str: A short, stable description of the output settings.
+        """
+        return type(self).__name__
+
+    def acknowledge(self, audio_path: str):
+        """Reports that a file yielded by ``iter_download`` has been fully processed.
+
+        Downloaders that remember processed items, such as synced podcast feeds,
+        record the item only then, so an item whose processing fails is downloaded again.
+
+        Args:
+            audio_path (str): Path yielded by ``iter_download``.
+        """
+        pass
+
+    def iter_download(self, url: str, max_workers: int = None):
+        """Downloads every item of a URL and yields each converted file as soon as it is ready.
+
+        Items are downloaded by a bounded thread pool, so the caller can process the
+        first file while the others are still downloading.
+
+        Args:
+            url (str): URL or source path, possibly a collection.
+            max_workers (int): Number of concurrent downloads; defaults to ``self.max_workers`` or 1.
+
+        Yields:
+            str: Path to each converted file, in completion order. Failed items are skipped.
+        """
+        urls = self.expand(url)
+        if len(urls) == 1:
+            audio_path = self.download(urls[0])
+            if isinstance(audio_path, str):
+                yield audio_path
+            return
+
+        workers = max_workers or getattr(self, 'max_workers', None) or 1
+        logger.info(f"Downloading {len(urls)} items with {workers} workers.")
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = [executor.submit(self.download, item_url) for item_url in urls]
+            for future in as_completed(futures):
+                audio_path = future.result()
+                if isinstance(audio_path, str):
+                    yield audio_path
+        finally:
+            # Stop queued downloads if the caller stops consuming early
+            executor.shutdown(wait=True, cancel_futures=True)
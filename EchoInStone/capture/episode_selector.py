@@ -0,0 +1,102 @@
+import logging
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+class EpisodeSelector:
+    def __init__(self, latest: int = None, since: datetime = None, until: datetime = None, guids=None):
+        """
+        Initializes a selector choosing which episodes of a feed to download.
+
+        Criteria are combined: an episode must match every criterion that is set.
+        Use the ``latest_n``, ``date_range`` and ``by_guid`` constructors for the common cases.
+
+        Args:
+            latest (int): Keep only the N most recent matching episodes.
+            since (datetime): Keep episodes published at or after this date.
+            until (datetime): Keep episodes published at or before this date.
+            guids (iterable): Keep only episodes whose GUID is in this collection.
+        """
+        self.latest = latest
+        self.since = self._as_utc(since)
+        self.until = self._as_utc(until)
+        self.guids = set(guids) if guids is not None else None
+
+    @classmethod
+    def latest_n(cls, count: int) -> "EpisodeSelector":
+        """Selects the ``count`` most recent episodes."""
+        return cls(latest=count)
+
+    @classmethod
+    def date_range(cls, since: datetime = None, until: datetime = None) -> "EpisodeSelector":
+        """Selects the episodes published between ``since`` and ``until`` (inclusive)."""
+        return cls(since=since, until=until)
+
+    @classmethod
+    def by_guid(cls, guids) -> "EpisodeSelector":
+        """Selects the episodes with the given GUIDs."""
+        return cls(guids=guids)
+
+    @staticmethod
+    def _as_utc(value):
+        if value is not None and value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value
+
+    @staticmethod
+    def published(entry):
+        """
+        Returns the publication date of a feed entry.
+
+        Args:
+            entry: A feedparser entry.
+
+        Returns:
+            datetime: The UTC publication date, or None if the feed does not give one.
+        """
+        parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+        if parsed is None:
+            return None
+        return datetime(*parsed[:6], tzinfo=timezone.utc)
+
+    @staticmethod
+    def guid(entry) -> str:
+        """
+        Returns the GUID of a feed entry, falling back to its link.
+
+        Args:
+            entry: A feedparser entry.
+
+        Returns:
+            str: The episode identifier.
+        """
+        return entry.get('id') or entry.get('link')
+
+    def select(self, entries) -> list:
+        """
+        Filters feed entries, newest first.
+
+        Args:
+            entries (list): feedparser entries.
+
+        Returns:
+            list: The selected entries, most recent first.
+        """
+        dated = [(self.published(entry), index, entry) for index, entry in enumerate(entries)]
+        # Undated entries keep their feed order after the dated ones
+        dated.sort(key=lambda item: (item[0] is not None, item[0] or datetime.min.replace(tzinfo=timezone.utc), -item[1]), reverse=True)
+
+        selected = []
+        for published, _, entry in dated:
+            if self.guids is not None and self.guid(entry) not in self.guids:
+                continue
+            if self.since is not None and (published is None or published < self.since):
+                continue
+            if self.until is not None and (published is None or published > self.until):
+                continue
+            selected.append(entry)
+            if self.latest is not None and len(selected) >= self.latest:
+                break
+
+        logger.debug(f"Selected {len(selected)} of {len(entries)} episodes.")
+        return selected
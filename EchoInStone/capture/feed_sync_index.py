@@ -0,0 +1,102 @@
+import os
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+class FeedSyncIndex:
+    def __init__(self, index_path='data/podcasts/feed_index.json'):
+        """
+        Initializes a persistent index of polled feeds.
+
+        For every feed URL the index keeps the ETag/Last-Modified validators of
+        the last complete fetch and the GUIDs of the episodes already processed.
+
+        Args:
+            index_path (str): Path of the JSON file holding the index.
+        """
+        self.index_path = index_path
+        self._lock = threading.Lock()
+        self._feeds = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable feed index {self.index_path}: {e}")
+            return {}
+
+    def save(self):
+        """Writes the index to disk atomically."""
+        with self._lock:
+            directory = os.path.dirname(self.index_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.index_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._feeds, f, ensure_ascii=False, indent=4)
+            os.replace(tmp_path, self.index_path)
+
+    def _feed(self, url: str) -> dict:
+        return self._feeds.setdefault(url, {'etag': None, 'modified': None, 'processed': []})
+
+    def validators(self, url: str) -> tuple:
+        """
+        Returns the conditional-request validators stored for a feed.
+
+        Args:
+            url (str): Feed URL.
+
+        Returns:
+            tuple: ``(etag, modified)``; either may be None.
+        """
+        with self._lock:
+            feed = self._feeds.get(url, {})
+            return feed.get('etag'), feed.get('modified')
+
+    def update_validators(self, url: str, etag: str, modified: str):
+        """
+        Stores the validators returned by the last complete fetch of a feed.
+
+        Args:
+            url (str): Feed URL.
+            etag (str): ETag header of the response.
+            modified (str): Last-Modified header of the response.
+        """
+        with self._lock:
+            feed = self._feed(url)
+            feed['etag'] = etag
+            feed['modified'] = modified
+
+    def processed(self, url: str) -> set:
+        """
+        Returns the GUIDs already processed for a feed.
+
+        Args:
+            url (str): Feed URL.
+
+        Returns:
+            set: The processed episode GUIDs.
+        """
+        with self._lock:
+            return set(self._feeds.get(url, {}).get('processed', []))
+
+    def mark_processed(self, url: str, guids):
+        """
+        Records episodes as processed.
+
+        Args:
+            url (str): Feed URL.
+            guids (iterable): GUIDs of the processed episodes.
+        """
+        with self._lock:
+            feed = self._feed(url)
+            known = set(feed['processed'])
+            for guid in guids:
+                if guid not in known:
+                    feed['processed'].append(guid)
+                    known.add(guid)
@@ -0,0 +1,147 @@
+import os
+import shutil
+import logging
+import subprocess
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+class FFmpegStreamDecoder:
+    def __init__(self, output_path: str, source: str = None, sample_rate: int = 16000, channels: int = 1):
+        """
+        Initializes an ffmpeg subprocess that decodes audio to a PCM WAV file.
+
+        When no source is given, the encoded bytes are fed through ``write`` and
+        decoded while they arrive, so the full file never sits in memory or on disk.
+
+        Args:
+            output_path (str): Path of the WAV file to produce.
+            source (str): Optional local file to decode instead of the stdin stream.
+            sample_rate (int): Output sample rate in Hz.
+            channels (int): Number of output channels.
+        """
+        self.output_path = output_path
+        self.source = source
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.process = None
+        self._stderr = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    def command(self) -> list:
+        """
+        Builds the ffmpeg command line.
+
+        Returns:
+            list: The ffmpeg arguments.
+        """
+        command = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-y"]
+        if self.source:
+            command += ["-nostdin", "-i", self.source]
+        else:
+            command += ["-i", "pipe:0"]
+        command += [
+            "-vn", "-ac", str(self.channels), "-ar", str(self.sample_rate),
+            "-acodec", "pcm_s16le", "-f", "wav",
+            self.output_path,
+        ]
+        return command
+
+    def start(self):
+        """Starts the ffmpeg subprocess."""
+        if shutil.which("ffmpeg") is None:
+            raise RuntimeError("ffmpeg is required for streaming decode but was not found in PATH")
+        # stderr goes to a temporary file so a chatty ffmpeg can never block the pipe
+        self._stderr = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(
+            self.command(),
+            stdin=subprocess.DEVNULL if self.source else subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=self._stderr,
+        )
+        logger.debug(f"ffmpeg decoder started for {self.output_path}")
+
+    def write(self, chunk: bytes):
+        """
+        Feeds a chunk of encoded audio to the decoder.
+
+        Args:
+            chunk (bytes): Encoded audio bytes.
+
+        Raises:
+            RuntimeError: If ffmpeg stopped reading, with the error it reported.
+        """
+        if chunk:
+            try:
+                self.process.stdin.write(chunk)
+            except BrokenPipeError as e:
+                # ffmpeg exited early, typically because it rejected the input
+                raise self._failure() from e
+
+    def close(self) -> str:
+        """
+        Flushes the input stream and waits for ffmpeg to finish writing the WAV file.
+
+        Returns:
+            str: Path to the decoded WAV file.
+        """
+        if self.process.stdin:
+            try:
+                self.process.stdin.close()
+            except BrokenPipeError as e:
+                raise self._failure() from e
+        return_code = self.process.wait()
+        if return_code != 0:
+            raise self._failure()
+        self._read_stderr()
+        logger.debug(f"ffmpeg decoder finished: {self.output_path}")
+        return self.output_path
+
+    def abort(self):
+        """Stops ffmpeg and removes the partially written output."""
+        if self.process and self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+        self._read_stderr()
+        if os.path.exists(self.output_path):
+            os.remove(self.output_path)
+
+    def _failure(self) -> RuntimeError:
+        return_code = self.process.wait()
+        return RuntimeError(f"ffmpeg exited with status {return_code}: {self._read_stderr()}")
+
+    def _read_stderr(self) -> str:
+        if self._stderr is None:
+            return ""
+        self._stderr.seek(0)
+        output = self._stderr.read().decode(errors="replace").strip()
+        self._stderr.close()
+        self._stderr = None
+        return output
+
+def decode_file(source: str, output_path: str, sample_rate: int = 16000, channels: int = 1) -> str:
+    """
+    Decodes a local audio or video file to a PCM WAV file with ffmpeg.
+
+    Args:
+        source (str): Path of the file to decode.
+        output_path (str): Path of the WAV file to produce.
+        sample_rate (int): Output sample rate in Hz.
+        channels (int): Number of output channels.
+
+    Returns:
+        str: Path to the decoded WAV file.
+    """
+    with FFmpegStreamDecoder(output_path, source=source, sample_rate=sample_rate, channels=channels) as decoder:
+        pass
+    return decoder.output_path
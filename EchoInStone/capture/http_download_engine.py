@@ -0,0 +1,232 @@
+import os
+import json
+import time
+import logging
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+class HttpDownloadEngine:
+    def __init__(self, max_workers=4, part_size=8 * 1024 * 1024, min_parallel_size=16 * 1024 * 1024,
+                 max_retries=3, timeout=30, session=None, head_ttl=300):
+        """
+        Initializes a download engine sharing one pooled requests.Session.
+
+        Files served with ``Accept-Ranges: bytes`` are fetched as byte ranges in
+        parallel; interrupted downloads resume from a ``.part`` file instead of
+        starting over.
+
+        Args:
+            max_workers (int): Number of ranges downloaded in parallel.
+            part_size (int): Size of each byte range, in bytes.
+            min_parallel_size (int): Files smaller than this are fetched as a single stream.
+            max_retries (int): Attempts per range (or per stream) before giving up.
+            timeout (float): Connect/read timeout of each request, in seconds.
+            session (requests.Session): Session to use; a pooled one is created if omitted.
+            head_ttl (float): Seconds during which a successful HEAD response is reused.
+        """
+        self.max_workers = max_workers
+        self.part_size = part_size
+        self.min_parallel_size = min_parallel_size
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.session = session or self._create_session()
+        self.head_ttl = head_ttl
+        # url -> (response, monotonic time it was received)
+        self._head_cache = {}
+        self._lock = threading.Lock()
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(self.max_workers, 10))
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({'User-Agent': USER_AGENT})
+        return session
+
+    def head(self, url: str) -> requests.Response:
+        """
+        Sends a HEAD request, reusing a successful answer for the same URL for ``head_ttl`` seconds.
+
+        Error responses are not kept, so a transient failure does not outlive the call,
+        and validators older than ``head_ttl`` are fetched again.
+
+        Args:
+            url (str): URL to query.
+
+        Returns:
+            requests.Response: The HEAD response.
+        """
+        with self._lock:
+            cached = self._head_cache.get(url)
+        if cached is not None and time.monotonic() - cached[1] < self.head_ttl:
+            return cached[0]
+        response = self.session.head(url, timeout=self.timeout, allow_redirects=True)
+        with self._lock:
+            if 200 <= response.status_code < 300:
+                self._head_cache[url] = (response, time.monotonic())
+            else:
+                self._head_cache.pop(url, None)
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Sends a GET request through the pooled session.
+
+        Args:
+            url (str): URL to fetch.
+            **kwargs: Extra arguments forwarded to ``requests.Session.get``.
+
+        Returns:
+            requests.Response: The response.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def download(self, url: str, destination: str) -> str:
+        """
+        Downloads a URL to a file, in parallel ranges when the server allows it.
+
+        Args:
+            url (str): URL to download.
+            destination (str): Path of the file to write.
+
+        Returns:
+            str: The destination path.
+        """
+        size, etag, accepts_ranges = None, None, False
+        try:
+            response = self.head(url)
+            if response.status_code == 200:
+                size = int(response.headers.get('Content-Length', 0)) or None
+                etag = response.headers.get('ETag') or response.headers.get('Last-Modified')
+                accepts_ranges = response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+        except Exception as e:
+            logger.debug(f"HEAD request failed for {url}, falling back to a single stream: {e}")
+
+        if accepts_ranges and size and size >= self.min_parallel_size:
+            self._download_ranges(url, destination, size, etag)
+        else:
+            self._download_stream(url, destination, accepts_ranges, etag)
+        return destination
+
+    def _download_ranges(self, url, destination, size, etag):
+        part_path = destination + '.part'
+        state_path = part_path + '.json'
+        ranges = [(start, min(start + self.part_size, size) - 1) for start in range(0, size, self.part_size)]
+
+        completed = self._load_state(state_path, size, etag)
+        if completed and os.path.exists(part_path):
+            logger.info(f"Resuming {url}: {len(completed)}/{len(ranges)} ranges already downloaded")
+        else:
+            completed = set()
+            with open(part_path, 'wb') as f:
+                f.truncate(size)
+
+        pending = [index for index in range(len(ranges)) if index not in completed]
+        logger.info(f"Downloading {url} ({size} bytes) in {len(pending)} ranges with {self.max_workers} workers")
+
+        def fetch(index):
+            start, end = ranges[index]
+            self._fetch_range(url, part_path, start, end)
+            with self._lock:
+                completed.add(index)
+                self._save_state(state_path, size, etag, completed)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # list() re-raises the first failure; finished ranges stay recorded for a resume
+            list(executor.map(fetch, pending))
+
+        os.replace(part_path, destination)
+        os.remove(state_path)
+
+    def _fetch_range(self, url, part_path, start, end):
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                response = self.session.get(url, headers={'Range': f'bytes={start}-{end}'},
+                                            stream=True, timeout=self.timeout)
+                response.raise_for_status()
+                if response.status_code != 206:
+                    raise IOError(f"Server ignored the range request (status {response.status_code})")
+                written = 0
+                with open(part_path, 'r+b') as f:
+                    f.seek(start)
+                    for chunk in response.iter_content(chunk_size=65536):
+                        f.write(chunk)
+                        written += len(chunk)
+                if written != end - start + 1:
+                    raise IOError(f"Range {start}-{end} truncated after {written} bytes")
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                logger.warning(f"Range {start}-{end} failed (attempt {attempt}/{self.max_retries}): {e}")
+
+    def _download_stream(self, url, destination, accepts_ranges, etag=None):
+        part_path = destination + '.part'
+        state_path = part_path + '.json'
+        # A partial file is only continued under a strong validator, the one it was written under
+        resumable = accepts_ranges and bool(etag) and not etag.startswith('W/')
+        for attempt in range(1, self.max_retries + 1):
+            offset = 0
+            if resumable and os.path.exists(part_path) and self._load_validator(state_path) == etag:
+                offset = os.path.getsize(part_path)
+            # If-Range makes the server send the whole file if it changed since the validator
+            headers = {'Range': f'bytes={offset}-', 'If-Range': etag} if offset else {}
+            try:
+                response = self.session.get(url, headers=headers, stream=True, timeout=self.timeout)
+                response.raise_for_status()
+                if offset and response.status_code != 206:
+                    # The server sent the whole file again
+                    offset = 0
+                elif offset:
+                    content_range = response.headers.get('Content-Range', '')
+                    if not content_range.startswith(f'bytes {offset}-'):
+                        os.remove(part_path)
+                        raise IOError(f"Server answered the resume from byte {offset} with range {content_range!r}")
+                    logger.info(f"Resuming {url} from byte {offset}")
+                if not offset and resumable:
+                    self._save_state(state_path, None, etag, ())
+                with open(part_path, 'ab' if offset else 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=65536):
+                        f.write(chunk)
+                os.replace(part_path, destination)
+                if os.path.exists(state_path):
+                    os.remove(state_path)
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                logger.warning(f"Download of {url} interrupted (attempt {attempt}/{self.max_retries}): {e}")
+
+    @staticmethod
+    def _load_state(state_path, size, etag) -> set:
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return set()
+        if state.get('size') != size or state.get('etag') != etag:
+            logger.info("Remote file changed since the interrupted download, starting over")
+            return set()
+        return set(state.get('completed', []))
+
+    @staticmethod
+    def _load_validator(state_path) -> str:
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        # A state with a size belongs to a ranged download, whose part file is preallocated
+        return state.get('etag') if state.get('size') is None else None
+
+    @staticmethod
+    def _save_state(state_path, size, etag, completed):
+        with open(state_path, 'w', encoding='utf-8') as f:
+            json.dump({'size': size, 'etag': etag, 'completed': sorted(completed)}, f)
@@ -1,50 +1,279 @@
+import os
+import hashlib
+import threading
 import feedparser
-import requests
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
 from ..capture import DownloaderInterface
+from .episode_selector import EpisodeSelector
+from .feed_sync_index import FeedSyncIndex
+from .ffmpeg_stream_decoder import decode_file
+from .http_download_engine import HttpDownloadEngine
 import re
 
 logger = logging.getLogger(__name__)
 
 class PodcastDownloader(DownloaderInterface):
-    def __init__(self, output_dir='data/podcasts'):
+    def __init__(self, output_dir='data/podcasts', max_workers=4, sample_rate=16000, engine=None,
+                 selector: EpisodeSelector = None, sync_index: FeedSyncIndex = None):
         """
         Initializes the PodcastDownloader with a specified output directory.
 
         Args:
             output_dir (str): The directory where downloaded podcast episodes will be saved.
+            max_workers (int): Number of episodes downloaded concurrently in batch mode.
+            sample_rate (int): Sample rate of the converted mono WAV files.
+            engine (HttpDownloadEngine): Engine used for the enclosure downloads.
+            selector (EpisodeSelector): Episodes yielded by ``iter_download``; the latest one if omitted.
+            sync_index (FeedSyncIndex): If set, ``iter_download`` only yields episodes not processed yet.
         """
         self.output_dir = output_dir
+        self.max_workers = max_workers
+        self.sample_rate = sample_rate
+        self.engine = engine or HttpDownloadEngine()
+        self.selector = selector
+        self.sync_index = sync_index
+        # Feeds parsed by validate_url, reused once by the following download
+        self._parsed_feeds = {}
+        # Synced episodes waiting for acknowledge, by converted file path
+        self._pending = {}
+        self._pending_lock = threading.Lock()
 
-    def download(self, url: str) -> bool:
+    def download(self, url: str) -> str:
         """
-        Downloads a podcast episode from an RSS feed URL.
+        Downloads the most recent podcast episode from an RSS feed URL.
 
         Args:
             url (str): RSS feed URL containing the podcast episodes.
 
         Returns:
-            bool: True if the download was successful, False otherwise.
+            str: Absolute path to the converted WAV file if successful, None otherwise.
         """
+        paths = self.download_episodes(url, EpisodeSelector.latest_n(1))
+        if paths:
+            return paths[0]
+        logger.warning("Episode not found.")
+        return None
+
+    def download_episodes(self, url: str, selector: EpisodeSelector = None, max_workers: int = None) -> list:
+        """
+        Downloads the selected episodes of an RSS feed concurrently.
+
+        Args:
+            url (str): RSS feed URL containing the podcast episodes.
+            selector (EpisodeSelector): Episodes to download; every episode if omitted.
+            max_workers (int): Overrides the number of concurrent downloads.
+
+        Returns:
+            list: Absolute paths to the converted WAV files, most recent episode first.
+                Episodes that failed to download are left out.
+        """
+        return self.download_entries(self._feed_entries(url), selector, max_workers)
+
+    def _feed_entries(self, url: str) -> list:
         try:
-            feed = feedparser.parse(url)
+            feed = self._parsed_feeds.pop(url, None) or feedparser.parse(url)
             logger.debug(f"Parsed RSS feed with {len(feed.entries)} entries.")
-            for entry in feed.entries:
-                for link in entry.links:
-                    if link.rel == 'enclosure':
-                        audio_url = link.href
-                        response = requests.get(audio_url)
-                        audio_file = f"{self.output_dir}/{entry.title}.mp3"
-                        safe_audio_file = re.sub(r'[^\w\s-]', '', audio_file).replace(' ', '_')
-                        with open(safe_audio_file, 'wb') as f:
-                            f.write(response.content)
-                        logger.info(f"Podcast downloaded: {safe_audio_file}")
-                        return True
-            logger.warning("Episode not found.")
-            return False
+            return feed.entries
         except Exception as e:
             logger.error(f"Error during download: {e}")
-            return False
+            return []
+
+    def iter_download(self, url: str, max_workers: int = None):
+        """
+        Downloads the configured episodes of a feed and yields each converted file as soon as it is ready.
+
+        Args:
+            url (str): RSS feed URL containing the podcast episodes.
+            max_workers (int): Overrides the number of concurrent downloads.
+
+        Yields:
+            str: Path to each converted WAV file, in completion order. Failed episodes are skipped.
+        """
+        if self.sync_index is not None:
+            for _, path in self._iter_sync(url, self.sync_index, self.selector, max_workers):
+                yield path
+            return
+        selector = self.selector or EpisodeSelector.latest_n(1)
+        episodes = selector.select([entry for entry in self._feed_entries(url) if self.enclosure_url(entry)])
+        for _, path in self._iter_downloads(episodes, max_workers):
+            if path:
+                yield path
+
+    def sync(self, url: str, index: FeedSyncIndex, selector: EpisodeSelector = None, max_workers: int = None) -> list:
+        """
+        Downloads only the episodes published since the last sync of a feed.
+
+        The feed is fetched with a conditional request using the validators stored
+        in ``index``; a 304 answer ends the poll without parsing or downloading anything.
+        An episode is marked as processed only when its file is passed to
+        ``acknowledge``, so an episode whose processing fails or is interrupted is
+        downloaded again by the next sync. The validators of a successful fetch are
+        stored once every new episode has been acknowledged, and only if the selector
+        kept all of them; otherwise the next poll fetches the feed again to see the rest.
+
+        Args:
+            url (str): RSS feed URL containing the podcast episodes.
+            index (FeedSyncIndex): Persistent index of validators and processed GUIDs.
+            selector (EpisodeSelector): Optional filter applied to the new episodes.
+            max_workers (int): Overrides the number of concurrent downloads.
+
+        Returns:
+            list: Absolute paths to the converted WAV files of the new episodes.
+        """
+        return [path for _, path in sorted(self._iter_sync(url, index, selector, max_workers))]
+
+    def _iter_sync(self, url, index, selector, max_workers):
+        # Yields (position, path) of the new episodes as their downloads complete
+        etag, modified = index.validators(url)
+        try:
+            feed = feedparser.parse(url, etag=etag, modified=modified)
+        except Exception as e:
+            logger.error(f"Error fetching feed {url}: {e}")
+            return
+        status = feed.get('status')
+        if status == 304:
+            logger.info(f"Feed not modified since last sync: {url}")
+            return
+
+        processed = index.processed(url)
+        new_entries = [entry for entry in feed.entries
+                       if self.enclosure_url(entry) and EpisodeSelector.guid(entry) not in processed]
+        episodes = (selector or EpisodeSelector()).select(new_entries)
+        logger.info(f"{len(new_entries)} new episodes in feed, {len(episodes)} selected.")
+
+        # A failed fetch has no status and no entries; its empty validators must not replace the stored ones
+        validators = (feed.get('etag'), feed.get('modified')) if status is not None and 200 <= status < 300 else None
+        # New episodes left out by the selector must stay visible to the next poll, which a 304 would hide
+        if len(episodes) < len(new_entries):
+            validators = None
+        batch = {'url': url, 'index': index, 'validators': validators, 'remaining': len(episodes), 'failed': False}
+        if not episodes:
+            self._finish_sync(batch)
+            return
+        for position, path in self._iter_downloads(episodes, max_workers):
+            with self._pending_lock:
+                if not path:
+                    # Keep the old validators after a failure so the next poll sees the missing episodes again
+                    batch['failed'] = True
+                    batch['remaining'] -= 1
+                    continue
+                self._pending[path] = (batch, EpisodeSelector.guid(episodes[position]))
+            yield position, path
+
+    def acknowledge(self, audio_path: str):
+        """
+        Marks a synced episode as processed in its feed index.
+
+        Args:
+            audio_path (str): Converted file returned by ``sync`` or ``iter_download``.
+        """
+        with self._pending_lock:
+            pending = self._pending.pop(audio_path, None)
+            if pending is None:
+                return
+            batch, guid = pending
+            batch['remaining'] -= 1
+        batch['index'].mark_processed(batch['url'], [guid])
+        self._finish_sync(batch)
+
+    @staticmethod
+    def _finish_sync(batch):
+        index = batch['index']
+        if batch['remaining'] == 0 and not batch['failed'] and batch['validators'] is not None:
+            index.update_validators(batch['url'], *batch['validators'])
+        index.save()
+
+    def download_entries(self, entries, selector: EpisodeSelector = None, max_workers: int = None) -> list:
+        """
+        Downloads the selected feed entries concurrently.
+
+        Args:
+            entries (list): feedparser entries.
+            selector (EpisodeSelector): Episodes to download; every entry if omitted.
+            max_workers (int): Overrides the number of concurrent downloads.
+
+        Returns:
+            list: Absolute paths to the converted WAV files, in selection order.
+        """
+        episodes = (selector or EpisodeSelector()).select([entry for entry in entries if self.enclosure_url(entry)])
+        return [path for _, path in self._download_all(episodes, max_workers) if path]
+
+    def _iter_downloads(self, episodes, max_workers):
+        # Yields (position, path) pairs as downloads complete; path is None for a failed episode
+        if not episodes:
+            return
+        os.makedirs(self.output_dir, exist_ok=True)
+        workers = min(max_workers or self.max_workers, len(episodes))
+        logger.info(f"Downloading {len(episodes)} episodes with {workers} workers.")
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = {executor.submit(self.download_entry, entry): position for position, entry in enumerate(episodes)}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # Stop queued downloads if the caller stops consuming early
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _download_all(self, episodes, max_workers) -> list:
+        if not episodes:
+            return []
+        os.makedirs(self.output_dir, exist_ok=True)
+        workers = min(max_workers or self.max_workers, len(episodes))
+        logger.info(f"Downloading {len(episodes)} episodes with {workers} workers.")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(zip(episodes, executor.map(self.download_entry, episodes)))
+
+    def download_entry(self, entry) -> str:
+        """
+        Streams one episode to disk and converts it to a mono WAV file.
+
+        Args:
+            entry: A feedparser entry with an audio enclosure.
+
+        Returns:
+            str: Absolute path to the converted WAV file, or None if it failed.
+        """
+        audio_url = self.enclosure_url(entry)
+        try:
+            guid = EpisodeSelector.guid(entry) or audio_url
+            title = re.sub(r'[^\w\s-]', '', entry.get('title') or '').strip().replace(' ', '_') or 'episode'
+            # Feeds repeat titles (rebroadcasts, best-ofs); the GUID keeps concurrent episodes apart
+            safe_base = f"{title}_{hashlib.sha1(guid.encode('utf-8')).hexdigest()[:8]}"
+            _, ext = os.path.splitext(urlparse(audio_url).path)
+            audio_file = os.path.join(self.output_dir, safe_base + (ext or '.mp3'))
+            wav_file = os.path.join(self.output_dir, safe_base + '.wav')
+
+            self.engine.download(audio_url, audio_file)
+            logger.info(f"Podcast downloaded: {audio_file}")
+            if os.path.abspath(audio_file) == os.path.abspath(wav_file):
+                wav_file = os.path.join(self.output_dir, f"{safe_base}_{self.sample_rate}.wav")
+            decode_file(audio_file, wav_file, sample_rate=self.sample_rate)
+            logger.info(f"Podcast converted to WAV: {wav_file}")
+            return os.path.abspath(wav_file)
+        except Exception as e:
+            logger.error(f"Error during download of {audio_url}: {e}")
+            return None
+
+    @staticmethod
+    def enclosure_url(entry) -> str:
+        """
+        Returns the URL of the audio enclosure of a feed entry.
+
+        Args:
+            entry: A feedparser entry.
+
+        Returns:
+            str: The enclosure URL, or None if the entry has no enclosure.
+        """
+        for link in entry.get('links', []):
+            if link.get('rel') == 'enclosure':
+                return link.get('href')
+        return None
+
+    def cache_fingerprint(self) -> str:
+        return f"{type(self).__name__}:mono-{self.sample_rate}"
 
     def validate_url(self, url: str) -> bool:
         """
@@ -60,6 +289,7 @@ class PodcastDownloader(DownloaderInterface):
             feed = feedparser.parse(url)
             if feed.bozo == 0:  # 0 indicates no error in parsing
                 logger.debug(f"Valid RSS feed URL: {url}")
+                self._parsed_feeds[url] = feed
                 return True
             logger.warning(f"Invalid RSS feed URL: {url}")
             return False
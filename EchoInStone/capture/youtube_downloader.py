@@ -1,21 +1,29 @@
-from pytubefix import YouTube
+from pytubefix import YouTube, Playlist, Channel
 import os
 import re
 import logging
-from pydub import AudioSegment
+from urllib.parse import urlparse, parse_qs
 from ..capture import DownloaderInterface
+from .ffmpeg_stream_decoder import decode_file
 
 logger = logging.getLogger(__name__)
 
 class YouTubeDownloader(DownloaderInterface):
-    def __init__(self, output_dir='data/videos'):
+    def __init__(self, output_dir='data/videos', min_bitrate=48000, sample_rate=16000, max_workers=3):
         """
         Initializes the YouTubeDownloader with a specified output directory.
 
         Args:
             output_dir (str): The directory where downloaded files will be saved.
+            min_bitrate (int): Lowest audio bitrate, in bits per second, still considered
+                good enough for speech recognition. The smallest stream at or above it is used.
+            sample_rate (int): Sample rate of the converted mono WAV file.
+            max_workers (int): Number of videos downloaded concurrently from a playlist or channel.
         """
         self.output_dir = output_dir
+        self.min_bitrate = min_bitrate
+        self.sample_rate = sample_rate
+        self.max_workers = max_workers
 
     def download(self, url: str) -> str:
         """
@@ -29,22 +37,19 @@ class YouTubeDownloader(DownloaderInterface):
         """
         try:
             yt = YouTube(url)
-            video_stream = yt.streams.filter(only_audio=True).first()
+            audio_stream = self.select_audio_stream(yt.streams.filter(only_audio=True))
+            logger.info(f"Selected audio stream: {audio_stream.mime_type} {audio_stream.abr} ({audio_stream.audio_codec})")
 
-            # Download the audio file
-            audio_file = video_stream.download(output_path=self.output_dir)
+            # Download the audio container under a clean file name; the video id keeps
+            # videos with the same title apart when a playlist is downloaded concurrently
+            title = re.sub(r'[^\w\s-]', '', yt.title or '').strip().replace(' ', '_')
+            safe_base = f"{title}_{yt.video_id}" if title else yt.video_id
+            audio_file = audio_stream.download(output_path=self.output_dir, filename=f"{safe_base}.{audio_stream.subtype}")
 
-            # Clean up the file name
-            dir_path, base_name = os.path.split(audio_file)
-            base, ext = os.path.splitext(base_name)
-            safe_base = re.sub(r'[^\w\s-]', '', base).replace(' ', '_')
-            new_file = os.path.join(dir_path, safe_base + '.mp3')
-            os.rename(audio_file, new_file)
-
-            # Convert the file to WAV
-            audio = AudioSegment.from_file(new_file)
-            wav_file = os.path.join(dir_path, safe_base + '.wav')
-            audio.export(wav_file, format="wav")
+            # Decode the container straight to a mono WAV file
+            wav_file = os.path.join(self.output_dir, safe_base + '.wav')
+            decode_file(audio_file, wav_file, sample_rate=self.sample_rate)
+            os.remove(audio_file)
 
             logger.info(f"Audio downloaded and converted to {wav_file}")
             return wav_file
@@ -52,6 +57,61 @@ class YouTubeDownloader(DownloaderInterface):
             logger.error(f"Error during download: {e}")
             return None
 
+    def expand(self, url: str) -> list:
+        """
+        Expands a playlist or channel URL into the URLs of its videos.
+
+        Args:
+            url (str): YouTube video, playlist or channel URL.
+
+        Returns:
+            list: The video URLs; ``[url]`` for a single video.
+        """
+        parsed = urlparse(url)
+        if 'list' in parse_qs(parsed.query):
+            video_urls = list(Playlist(url).video_urls)
+        elif re.match(r'^/(channel/|c/|user/|@)', parsed.path):
+            video_urls = list(Channel(url).video_urls)
+        else:
+            return [url]
+        logger.info(f"Expanded {url} into {len(video_urls)} videos.")
+        return video_urls
+
+    def select_audio_stream(self, streams):
+        """
+        Chooses the smallest audio stream that is still good enough for speech recognition.
+
+        Streams at or above ``min_bitrate`` are preferred, lowest bitrate first, with
+        Opus winning ties. If every stream is below the threshold the best one is used.
+
+        Args:
+            streams: Audio-only pytubefix streams.
+
+        Returns:
+            Stream: The selected stream.
+        """
+        candidates = list(streams)
+        if not candidates:
+            raise ValueError("No audio stream available")
+
+        def bitrate(stream):
+            if getattr(stream, 'bitrate', None):
+                return stream.bitrate
+            match = re.match(r'(\d+)', stream.abr or '')
+            return int(match.group(1)) * 1000 if match else 0
+
+        def is_opus(stream):
+            return 'opus' in (stream.audio_codec or '')
+
+        good_enough = [stream for stream in candidates if bitrate(stream) >= self.min_bitrate]
+        if good_enough:
+            return min(good_enough, key=lambda stream: (bitrate(stream), not is_opus(stream)))
+        return max(candidates, key=lambda stream: (bitrate(stream), is_opus(stream)))
+
+    def cache_fingerprint(self) -> str:
+        # The bitrate floor picks the source stream the file is converted from
+        return f"{type(self).__name__}:mono-{self.sample_rate}:min-bitrate-{self.min_bitrate}"
+
     def validate_url(self, url: str) -> bool:
         """
         Validates if a URL is a valid YouTube URL.
@@ -1,19 +1,42 @@
 # processing/__init__.py
 
-from .audio_transcriber_interface import AudioTranscriberInterface
-from .diarizer_interface import DiarizerInterface
-from .aligner_interface import AlignerInterface
-from .whisper_audio_transcriber import WhisperAudioTranscriber
-from .pyannote_diarizer import PyannoteDiarizer
-from .speaker_aligner import SpeakerAligner
-from .audio_processing_orchestrator import AudioProcessingOrchestrator
+# Attributes are imported on first access (PEP 562), so importing the package
+# does not load torch, transformers or pyannote.audio until a model class is used.
+import importlib
 
-__all__ = [
-    'AudioTranscriberInterface',
-    'DiarizerInterface',
-    'AlignerInterface',
-    'WhisperAudioTranscriber',
-    'PyannoteDiarizer',
-    'SpeakerAligner',
-    'AudioProcessingOrchestrator'
-]
+_LAZY_ATTRIBUTES = {
+    'AudioTranscriberInterface': '.audio_transcriber_interface',
+    'DiarizerInterface': '.diarizer_interface',
+    'AlignerInterface': '.aligner_interface',
+    'WhisperAudioTranscriber': '.whisper_audio_transcriber',
+    'AssistedDecodingMonitor': '.assisted_decoding_monitor',
+    'FasterWhisperTranscriber': '.faster_whisper_transcriber',
+    'ShardedTranscriber': '.sharded_transcriber',
+    'PyannoteDiarizer': '.pyannote_diarizer',
+    'EmbeddingCache': '.embedding_cache',
+    'ChunkedDiarizer': '.chunked_diarizer',
+    'SpeakerLinker': '.speaker_linker',
+    'SpeakerIndex': '.speaker_index',
+    'SpeakerAligner': '.speaker_aligner',
+    'SweepLineSpeakerAligner': '.sweep_line_speaker_aligner',
+    'WordSpeakerAligner': '.word_speaker_aligner',
+    'VoiceActivityDetectorInterface': '.voice_activity_detector_interface',
+    'SpeechTimeline': '.speech_timeline',
+    'EnergyVoiceActivityDetector': '.energy_voice_activity_detector',
+    'SegmentPlanner': '.segment_planner',
+    'AudioProcessingOrchestrator': '.audio_processing_orchestrator',
+    'ModelRegistry': '.model_registry',
+    'default_registry': '.model_registry',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -9,6 +9,6 @@ class AlignerInterface(ABC):
         :param transcription: The complete text of the transcription.
         :param timestamps: List of text segments with their corresponding timestamps.
         :param diarization: List of diarization segments with speaker identifiers.
-        :return: List of aligned segments with speaker identifiers and timestamps.
+        :return: Aligned ``(speaker, start, end, text)`` segments, as a SegmentStore.
         """
         pass
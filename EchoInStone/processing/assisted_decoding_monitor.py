@@ -0,0 +1,87 @@
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class AssistedDecodingMonitor:
+    def __init__(self, model, assistant_model, tokenizer):
+        """
+        Initializes counters for speculative (assisted) decoding.
+
+        Forward hooks count the decoder passes of both models while the monitor is
+        active. Every main-model pass verifies the draft tokens proposed since the
+        previous one and adds one token of its own, so the accepted draft tokens are
+        the generated tokens minus the main-model passes. Tokens are counted from the
+        decoded text, so timestamp tokens are left out and the rate is a lower bound.
+
+        Args:
+            model: The main Whisper model.
+            assistant_model: The draft Whisper model.
+            tokenizer: Tokenizer used to count the generated tokens.
+        """
+        self.model = model
+        self.assistant_model = assistant_model
+        self.tokenizer = tokenizer
+        self.target_passes = 0
+        self.draft_passes = 0
+        self.tokens = 0
+        self.elapsed = 0.0
+        self._handles = []
+        self._started = None
+
+    def __enter__(self):
+        self._handles = [
+            self.model.get_decoder().register_forward_hook(self._count_target),
+            self.assistant_model.get_decoder().register_forward_hook(self._count_draft),
+        ]
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.elapsed = time.perf_counter() - self._started
+        for handle in self._handles:
+            handle.remove()
+        self._handles = []
+        return False
+
+    def _count_target(self, module, inputs, output):
+        self.target_passes += 1
+
+    def _count_draft(self, module, inputs, output):
+        self.draft_passes += 1
+
+    def add_text(self, text: str):
+        """
+        Counts the tokens of decoded text.
+
+        Args:
+            text (str): Text produced while the monitor was active.
+        """
+        if text:
+            self.tokens += len(self.tokenizer(text, add_special_tokens=False).input_ids)
+
+    @property
+    def accepted_tokens(self) -> int:
+        """int: Draft tokens kept by the main model."""
+        return max(self.tokens - self.target_passes, 0)
+
+    @property
+    def acceptance_rate(self) -> float:
+        """float: Share of the proposed draft tokens that were accepted, or None before any proposal."""
+        if not self.draft_passes:
+            return None
+        return min(self.accepted_tokens / self.draft_passes, 1.0)
+
+    @property
+    def tokens_per_second(self) -> float:
+        """float: Generated tokens per second of wall-clock time, or None if nothing was timed."""
+        if not self.elapsed:
+            return None
+        return self.tokens / self.elapsed
+
+    def log(self):
+        """Logs the acceptance rate and the decoding throughput."""
+        rate = f"{self.acceptance_rate:.1%}" if self.acceptance_rate is not None else "n/a"
+        speed = f"{self.tokens_per_second:.1f}" if self.tokens_per_second is not None else "n/a"
+        logger.info(f"Assisted decoding: {self.tokens} tokens, {self.draft_passes} drafted, "
+                    f"acceptance rate {rate}, {speed} tokens/s")
@@ -1,10 +1,15 @@
-from ..capture import DownloaderInterface
+from ..capture import DownloaderInterface, AudioBuffer
 from .audio_transcriber_interface import AudioTranscriberInterface
 from .diarizer_interface import DiarizerInterface
-from ..utils import DataSaver
+from ..utils import DataSaver, SegmentStore
 from .aligner_interface import AlignerInterface
+from .voice_activity_detector_interface import VoiceActivityDetectorInterface
+from .segment_planner import SegmentPlanner
 
+import os
+import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -13,27 +18,197 @@ class AudioProcessingOrchestrator:
                        transcriber: AudioTranscriberInterface,
                        diarizer: DiarizerInterface,
                        aligner: AlignerInterface,
-                       saver: DataSaver,):
+                       saver: DataSaver,
+                       vad: VoiceActivityDetectorInterface = None,
+                       segment_planner: SegmentPlanner = None,
+                       concurrent_stages: bool = False,
+                       stage_threads: dict = None):
         self.downloader = downloader
         self.transcriber = transcriber
         self.diarizer = diarizer
         self.aligner = aligner
         self.saver = saver
+        # Optional speech pre-pass; models then only see the speech regions
+        self.vad = vad
+        self.last_speech_timeline = None
+        # If set, speaker turns are transcribed directly and no alignment pass is needed
+        self.segment_planner = segment_planner
+        # Transcription and diarization are independent until alignment and may run side by side;
+        # each stage then gets its own torch thread budget so the models do not oversubscribe the cores
+        self.concurrent_stages = concurrent_stages
+        self.stage_threads = stage_threads
+        self.last_timings = None
 
     def extract_and_transcribe(self, echo_input: str):
         logger.debug("Downloading audio...")
-        audio_path = self.downloader.download(echo_input)
-        if audio_path:
-            logger.debug("Transcribing downloaded audio...")
-            transcription, timestamps = self.transcriber.transcribe(audio_path)
-            logger.debug("Diarizing downloaded audio...")
-            diarization = self.diarizer.diarize(audio_path)
-
-            if logger.isEnabledFor(logging.DEBUG):
-                logger.debug("Writing debug files.")
-                self.saver.save_data("audio_transcription.txt", transcription)
-                self.saver.save_data("audio_timestamps.json", timestamps)
-                self.saver.save_data("audio_diarization.txt", str(diarization))
-
-            return self.aligner.align(transcription, timestamps, diarization)
+        # Decode once and share the samples between the transcriber and the diarizer
+        audio = self.downloader.download_audio(echo_input)
+        if audio is not None:
+            return self.process_audio(audio)
         return None
+
+    def extract_and_transcribe_all(self, echo_input: str):
+        """Processes every item of a playlist, channel or feed as soon as it is downloaded.
+
+        The downloader keeps fetching the remaining items in the background while
+        the current one is transcribed. An item is acknowledged to the downloader
+        once it was processed and the caller asked for the next one, so an item
+        whose processing fails or is interrupted is not recorded as done.
+
+        Args:
+            echo_input (str): URL or source path, possibly a collection.
+
+        Yields:
+            tuple: ``(audio_path, speaker_transcriptions)`` for each item.
+        """
+        for audio_path in self.downloader.iter_download(echo_input):
+            try:
+                audio = AudioBuffer.from_file(audio_path)
+            except Exception as e:
+                logger.error(f"Error decoding {audio_path}: {e}")
+                continue
+            result = self.process_audio(audio)
+            yield audio_path, result
+            if result is not None:
+                self.downloader.acknowledge(audio_path)
+
+    def process_audio(self, audio: AudioBuffer):
+        """Transcribes, diarizes and aligns decoded audio.
+
+        Args:
+            audio (AudioBuffer): The decoded audio.
+
+        Returns:
+            SegmentStore: Aligned segments with speaker identifiers and timestamps.
+        """
+        original = audio
+        timeline = None
+        if self.vad is not None:
+            timeline = self.vad.detect(audio)
+            self.last_speech_timeline = timeline
+            if not len(timeline):
+                logger.warning("No speech detected, skipping transcription and diarization.")
+                return []
+            logger.info(f"Skipping {timeline.skipped_seconds:.1f}s of non-speech audio "
+                        f"({100 * timeline.skipped_seconds / max(timeline.duration, 1e-9):.0f}% of {timeline.duration:.1f}s).")
+            audio = timeline.compact(audio)
+
+        if self.segment_planner is not None:
+            return self.transcribe_speaker_turns(original, audio, timeline)
+
+        (transcription, timestamps), diarization = self.run_stages(audio)
+
+        if timeline is not None:
+            # Back to the timestamps of the original audio
+            timestamps = timeline.remap_timestamps(timestamps)
+            diarization = timeline.remap_diarization(diarization)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Writing debug files.")
+            self.saver.save_data("audio_transcription.txt", transcription)
+            self.saver.save_data("audio_timestamps.json", timestamps)
+            self.saver.save_data("audio_diarization.txt", str(diarization))
+
+        return self.aligner.align(transcription, timestamps, diarization)
+
+    def run_stages(self, audio: AudioBuffer):
+        """Transcribes and diarizes audio, one after the other or concurrently.
+
+        Wall-clock times of both stages and of the whole run are kept in ``last_timings``.
+        In concurrent mode the per-stage torch thread budgets are advisory: they bound
+        each stage's OpenMP threads, but the MKL and pthreadpool settings are process-wide,
+        so for those backends the stage that starts last sets the count for both. The
+        thread count of the process is restored once both stages are done.
+
+        Args:
+            audio (AudioBuffer): The audio to process.
+
+        Returns:
+            tuple: ``((transcription, timestamps), diarization)``.
+        """
+        stages = {
+            'transcription': lambda: self.transcriber.transcribe(audio),
+            'diarization': lambda: self.diarizer.diarize(audio),
+        }
+        timings = {}
+        started = time.perf_counter()
+        if self.concurrent_stages:
+            threads = self.stage_threads or self.default_stage_threads()
+            previous_threads = None
+            if any(threads.values()):
+                # The stages import torch anyway to apply their budgets
+                import torch
+
+                previous_threads = torch.get_num_threads()
+            try:
+                with ThreadPoolExecutor(max_workers=len(stages), thread_name_prefix="stage") as pool:
+                    futures = {name: pool.submit(self._timed_stage, name, stage, timings, threads.get(name))
+                               for name, stage in stages.items()}
+                    results = {name: future.result() for name, future in futures.items()}
+            finally:
+                if previous_threads is not None:
+                    torch.set_num_threads(previous_threads)
+        else:
+            results = {name: self._timed_stage(name, stage, timings) for name, stage in stages.items()}
+        timings['total'] = time.perf_counter() - started
+
+        self.last_timings = timings
+        logger.info(f"Stage timings ({'concurrent' if self.concurrent_stages else 'sequential'}): "
+                    + ", ".join(f"{name} {seconds:.1f}s" for name, seconds in timings.items()))
+        return results['transcription'], results['diarization']
+
+    @staticmethod
+    def default_stage_threads() -> dict:
+        """Splits the CPU cores between the two stages.
+
+        Returns:
+            dict: Number of torch threads of each stage.
+        """
+        cores = os.cpu_count() or 2
+        return {'transcription': max(1, cores - cores // 2), 'diarization': max(1, cores // 2)}
+
+    @staticmethod
+    def _timed_stage(name, stage, timings, threads=None):
+        if threads:
+            import torch
+
+            # Only the OpenMP part of this is per thread; MKL and pthreadpool take the last value set
+            torch.set_num_threads(threads)
+        logger.debug(f"Running {name} stage{f' with {threads} threads' if threads else ''}...")
+        started = time.perf_counter()
+        result = stage()
+        timings[name] = time.perf_counter() - started
+        return result
+
+    def transcribe_speaker_turns(self, original: AudioBuffer, audio: AudioBuffer, timeline=None):
+        """Diarizes first, then transcribes every planned speaker segment.
+
+        Args:
+            original (AudioBuffer): The audio on its original timeline.
+            audio (AudioBuffer): The audio to diarize; the speech-only audio when gating is on.
+            timeline (SpeechTimeline): Speech regions of ``original``, if gating is on.
+
+        Returns:
+            SegmentStore: Segments with speaker identifiers and timestamps, consecutive
+            segments of a speaker merged.
+        """
+        logger.debug("Diarizing downloaded audio...")
+        diarization = self.diarizer.diarize(audio)
+        if timeline is not None:
+            diarization = timeline.remap_diarization(diarization)
+        if diarization is None:
+            logger.warning("No diarization available, cannot transcribe speaker turns.")
+            return None
+
+        segments = self.segment_planner.plan(diarization)
+        logger.debug(f"Transcribing {len(segments)} speaker segments...")
+        speaker_transcriptions = self.transcriber.transcribe_segments(original, segments)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Writing debug files.")
+            self.saver.save_data("audio_diarization.txt", str(diarization))
+            self.saver.save_data("audio_segments.json", speaker_transcriptions)
+
+        if speaker_transcriptions is None:
+            return None
+        return SegmentStore.from_segments(speaker_transcriptions).merge_consecutive()
@@ -1,14 +1,55 @@
 from abc import ABC, abstractmethod
+from typing import Union
+from ..capture.audio_buffer import AudioBuffer
+from ..utils import SegmentStore
 
 class AudioTranscriberInterface(ABC):
     @abstractmethod
-    def transcribe(self, audio_path: str) -> tuple:
-        """Transcribes audio from a given file path.
+    def transcribe(self, audio: Union[str, AudioBuffer]) -> tuple:
+        """Transcribes audio from a given file path or decoded audio buffer.
 
         Args:
-            audio_path (str): Path to the audio file to transcribe.
+            audio (str | AudioBuffer): Path to the audio file, or audio already decoded in memory.
 
         Returns:
             tuple: A tuple containing the transcription text and timestamps.
         """
         pass
+
+    def transcribe_segments(self, audio: Union[str, AudioBuffer], segments) -> SegmentStore:
+        """Transcribes speaker segments one by one.
+
+        Implementations able to batch segments should override this method.
+
+        Args:
+            audio (str | AudioBuffer): Path to the audio file, or audio already decoded in memory.
+            segments (list): ``(start, end, speaker)`` segments in seconds.
+
+        Returns:
+            SegmentStore: ``(speaker, start, end, text)`` segments, or None if transcription fails.
+        """
+        if not isinstance(audio, AudioBuffer):
+            audio = AudioBuffer.from_file(audio)
+        results = SegmentStore(len(segments))
+        for start, end, speaker in segments:
+            piece = audio.samples[int(start * audio.sample_rate):int(end * audio.sample_rate)]
+            transcription, _ = self.transcribe(AudioBuffer(piece, audio.sample_rate, audio.source_path))
+            if transcription is None:
+                return None
+            results.append(speaker, start, end, transcription)
+        return results
+
+    def transcribe_stream(self, audio: Union[str, AudioBuffer]):
+        """Transcribes audio and yields the timestamped chunks.
+
+        This fallback transcribes the whole audio first; implementations able to
+        decode incrementally should override it to yield chunks as they are decoded.
+
+        Args:
+            audio (str | AudioBuffer): Path to the audio file, or audio already decoded in memory.
+
+        Yields:
+            dict: ``{'timestamp': (start, end), 'text': ...}`` chunks in chronological order.
+        """
+        _, timestamps = self.transcribe(audio)
+        yield from timestamps or []
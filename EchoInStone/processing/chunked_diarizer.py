@@ -0,0 +1,111 @@
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union
+from .diarizer_interface import DiarizerInterface
+from .speaker_linker import SpeakerLinker
+from ..capture.audio_buffer import AudioBuffer
+
+logger = logging.getLogger(__name__)
+
+class ChunkedDiarizer(DiarizerInterface):
+    def __init__(self, diarizer, window_s=600.0, min_similarity=0.3, max_workers=1, speaker_index=None):
+        """
+        Wraps a diarizer so that long audio is diarized in fixed windows.
+
+        Each window is diarized on its own and its speakers are linked to global
+        speakers by embedding similarity, so memory and clustering time depend on the
+        window length instead of the file length. Speaker count bounds of the wrapped
+        diarizer apply to every window.
+
+        Args:
+            diarizer (PyannoteDiarizer): Diarizer run on every window; it must support ``return_embeddings``.
+            window_s (float): Length of the windows in seconds.
+            min_similarity (float): Lowest cosine similarity at which speakers of different windows are linked.
+            max_workers (int): Windows in flight at the same time; also the number of windows held in memory.
+                Calls on one shared pyannote pipeline still run one at a time, so extra workers overlap
+                reading the next windows with diarization; wrapped diarizers with their own pipelines run in parallel.
+            speaker_index (SpeakerIndex): Known voices naming the global speakers. Give it here rather
+                than to the wrapped diarizer, which would otherwise match every window too.
+        """
+        self.diarizer = diarizer
+        self.window_s = window_s
+        self.min_similarity = min_similarity
+        self.max_workers = max(1, max_workers)
+        self.speaker_index = speaker_index
+        # Centroid embedding of every global speaker of the last diarization, by label
+        self.last_embeddings = None
+
+    def windows(self, audio: Union[str, AudioBuffer]):
+        """
+        Splits audio into consecutive windows.
+
+        Files are read one window at a time instead of decoded at once.
+
+        Args:
+            audio (str | AudioBuffer): Path to the audio file, or audio already decoded in memory.
+
+        Yields:
+            tuple: ``(offset, window)`` with the window start in seconds and its AudioBuffer.
+        """
+        if isinstance(audio, AudioBuffer):
+            step = max(1, int(self.window_s * audio.sample_rate))
+            for first in range(0, len(audio.samples), step):
+                yield first / audio.sample_rate, AudioBuffer(audio.samples[first:first + step], audio.sample_rate,
+                                                             audio.source_path)
+            return
+        offset = 0.0
+        for block in AudioBuffer.stream_file(audio, block_s=self.window_s):
+            yield offset, AudioBuffer(block, 16000, audio)
+            offset += len(block) / 16000
+
+    def _diarize_windows(self, pool, audio):
+        # Only max_workers windows are submitted ahead of the one being linked
+        pending = deque()
+        for offset, window in self.windows(audio):
+            pending.append((offset, pool.submit(self.diarizer.diarize, window, return_embeddings=True)))
+            if len(pending) >= self.max_workers:
+                yield self._window_result(*pending.popleft())
+        while pending:
+            yield self._window_result(*pending.popleft())
+
+    @staticmethod
+    def _window_result(offset, future):
+        result = future.result()
+        if result is None:
+            raise RuntimeError(f"Diarization of the window at {offset:.1f}s failed")
+        diarization, embeddings = result
+        return offset, diarization, embeddings
+
+    def diarize(self, audio: Union[str, AudioBuffer]):
+        """Perform speaker diarization window by window.
+
+        Args:
+            audio (str | AudioBuffer): Path to the audio file, or audio already decoded in memory.
+
+        Returns:
+            Diarization result with global speaker labels or None if diarization fails.
+        """
+        from pyannote.core import Annotation, Segment
+
+        try:
+            linker = SpeakerLinker(min_similarity=self.min_similarity)
+            merged = Annotation()
+            windows = 0
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                for offset, diarization, embeddings in self._diarize_windows(pool, audio):
+                    labels = linker.link(diarization, embeddings)
+                    for turn, _, label in diarization.itertracks(yield_label=True):
+                        merged[Segment(turn.start + offset, turn.end + offset)] = labels[label]
+                    windows += 1
+            logger.info(f"Diarized {windows} windows of {self.window_s:.0f}s; linked into {len(linker)} speakers.")
+
+            labels = [linker.label_format.format(index) for index in range(len(linker))]
+            # Known voices are recognised from the global centroids, not per window
+            names = self.speaker_index.resolve(labels, linker.centroids) if self.speaker_index is not None else {}
+            self.last_embeddings = {names.get(label, label): centroid for label, centroid in zip(labels, linker.centroids)}
+            # Turns cut by a window edge are joined again
+            return merged.rename_labels(names).support()
+        except Exception as e:
+            logger.error(f"Error during chunked diarization: {e}")
+            return None
@@ -1,12 +1,14 @@
 from abc import ABC, abstractmethod
+from typing import Union
+from ..capture.audio_buffer import AudioBuffer
 
 class DiarizerInterface(ABC):
     @abstractmethod
-    def diarize(self, audio_path: str):
-        """Performs speaker diarization on the given audio file.
+    def diarize(self, audio: Union[str, AudioBuffer]):
+        """Performs speaker diarization on the given audio file or decoded audio buffer.
 
         Args:
-            audio_path (str): Path to the audio file to diarize.
+            audio (str | AudioBuffer): Path to the audio file, or audio already decoded in memory.
 
         Returns:
             Diarization result or None if diarization fails.
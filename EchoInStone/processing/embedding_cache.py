@@ -0,0 +1,118 @@
+import os
+import hashlib
+import logging
+import tempfile
+from typing import Union
+import numpy as np
+from ..capture.audio_buffer import AudioBuffer
+from ..capture.download_cache import hash_file
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingCache:
+    def __init__(self, cache_dir='data/embeddings'):
+        """
+        Initializes an on-disk cache of diarization segmentations and speaker embeddings.
+
+        Segmentation and embedding extraction are most of the diarization cost and
+        do not depend on the clustering settings, so a file diarized again with
+        another speaker count or clustering threshold only redoes the clustering.
+
+        Args:
+            cache_dir (str): Directory holding one ``.npz`` file per audio and model.
+        """
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, audio: Union[str, AudioBuffer], model_version: str) -> str:
+        """
+        Builds the cache key of an audio and a diarization model.
+
+        Args:
+            audio (str | AudioBuffer): Path to the audio file, or audio already decoded in memory.
+            model_version (str): Name and version of the pipeline producing the embeddings.
+
+        Returns:
+            str: Hex digest identifying the entry.
+        """
+        if isinstance(audio, AudioBuffer):
+            digest = hashlib.sha256(audio.samples.tobytes())
+            digest.update(str(audio.sample_rate).encode())
+            audio_hash = digest.hexdigest()
+        else:
+            audio_hash = hash_file(audio)
+        return hashlib.sha256(f"{audio_hash}:{model_version}".encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def load(self, key: str):
+        """
+        Reads the segmentations and embeddings stored under a key.
+
+        Args:
+            key (str): Cache key from ``key``.
+
+        Returns:
+            tuple: ``(segmentations, embeddings)`` as a ``SlidingWindowFeature`` and an
+            array (None if the pipeline stopped before extracting embeddings), or None on a miss.
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            self.misses += 1
+            return None
+        from pyannote.core import SlidingWindow, SlidingWindowFeature
+
+        try:
+            with np.load(path) as stored:
+                window = SlidingWindow(start=float(stored['start']), duration=float(stored['duration']),
+                                       step=float(stored['step']))
+                segmentations = SlidingWindowFeature(stored['segmentations'], window)
+                embeddings = stored['embeddings'] if 'embeddings' in stored else None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable embedding cache entry {path}: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        logger.info(f"Embedding cache hit: {key}")
+        return segmentations, embeddings
+
+    def save(self, key: str, segmentations, embeddings=None):
+        """
+        Stores the segmentations and embeddings of a diarization.
+
+        Args:
+            key (str): Cache key from ``key``.
+            segmentations (SlidingWindowFeature): Local segmentation scores of every chunk.
+            embeddings (np.ndarray): Embeddings of every chunk and local speaker.
+        """
+        arrays = {
+            'segmentations': segmentations.data,
+            'start': segmentations.sliding_window.start,
+            'duration': segmentations.sliding_window.duration,
+            'step': segmentations.sliding_window.step,
+        }
+        if embeddings is not None:
+            arrays['embeddings'] = embeddings
+        # Written next to the final path and renamed, so readers never see a partial file
+        handle, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.part')
+        try:
+            with os.fdopen(handle, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(temp_path, self._path(key))
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        logger.info(f"Stored segmentations and embeddings in the embedding cache: {key}")
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: Number of hits and misses.
+        """
+        return {'hits': self.hits, 'misses': self.misses}
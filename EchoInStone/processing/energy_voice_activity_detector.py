@@ -0,0 +1,152 @@
+import logging
+import numpy as np
+from .voice_activity_detector_interface import VoiceActivityDetectorInterface
+from .speech_timeline import SpeechTimeline
+from ..capture.audio_buffer import AudioBuffer
+
+logger = logging.getLogger(__name__)
+
+class EnergyVoiceActivityDetector(VoiceActivityDetectorInterface):
+    def __init__(self, frame_ms=30, hop_ms=10, energy_threshold_db=12.0, min_energy_db=-55.0,
+                 speech_band=(80, 4000), min_band_ratio=0.6, max_flatness=0.4, min_modulation_db=3.0,
+                 min_speech_s=0.3, min_silence_s=0.6, padding_s=0.2, block_frames=4096):
+        """
+        Initializes a CPU voice-activity detector based on NumPy energy and spectral features.
+
+        A frame is speech when it is loud enough above the noise floor, most of its
+        energy lies in the speech band, its spectrum is not noise-like and its energy
+        fluctuates at syllable rate rather than staying steady like sustained music.
+
+        Args:
+            frame_ms (int): Analysis frame length in milliseconds.
+            hop_ms (int): Step between frames in milliseconds.
+            energy_threshold_db (float): Required level above the estimated noise floor.
+            min_energy_db (float): Absolute level below which a frame is never speech.
+            speech_band (tuple): Frequency band, in Hz, holding most speech energy.
+            min_band_ratio (float): Minimum share of the frame energy inside ``speech_band``.
+            max_flatness (float): Maximum spectral flatness; noise and hiss are close to 1.
+            min_modulation_db (float): Minimum standard deviation of the frame level over
+                about half a second; steady tones and pads stay below it.
+            min_speech_s (float): Speech regions shorter than this are dropped.
+            min_silence_s (float): Gaps shorter than this are bridged.
+            padding_s (float): Margin added on both sides of every speech region.
+            block_frames (int): Number of frames analysed at once, bounding memory use.
+        """
+        self.frame_ms = frame_ms
+        self.hop_ms = hop_ms
+        self.energy_threshold_db = energy_threshold_db
+        self.min_energy_db = min_energy_db
+        self.speech_band = speech_band
+        self.min_band_ratio = min_band_ratio
+        self.max_flatness = max_flatness
+        self.min_modulation_db = min_modulation_db
+        self.min_speech_s = min_speech_s
+        self.min_silence_s = min_silence_s
+        self.padding_s = padding_s
+        self.block_frames = block_frames
+
+    def detect(self, audio: AudioBuffer) -> SpeechTimeline:
+        """Finds the regions of the audio that contain speech.
+
+        Args:
+            audio (AudioBuffer): The decoded audio.
+
+        Returns:
+            SpeechTimeline: The speech regions, in seconds on the original timeline.
+        """
+        frame_len = max(1, int(audio.sample_rate * self.frame_ms / 1000))
+        hop = max(1, int(audio.sample_rate * self.hop_ms / 1000))
+        if len(audio.samples) < frame_len:
+            return SpeechTimeline([], audio.duration)
+
+        energy_db, band_ratio, flatness = self.frame_features(audio.samples, audio.sample_rate, frame_len, hop)
+        speech = self.classify(energy_db, band_ratio, flatness, hop / audio.sample_rate)
+        regions = self.to_regions(speech, hop / audio.sample_rate, frame_len / audio.sample_rate)
+
+        timeline = SpeechTimeline(regions, audio.duration)
+        logger.info(f"Voice activity: {timeline.speech_seconds:.1f}s of speech in {len(timeline)} regions, "
+                    f"{timeline.skipped_seconds:.1f}s of {audio.duration:.1f}s skipped.")
+        return timeline
+
+    def frame_features(self, samples, sample_rate: int, frame_len: int, hop: int) -> tuple:
+        """
+        Computes the per-frame level, speech-band energy ratio and spectral flatness.
+
+        Args:
+            samples (np.ndarray): Mono float32 samples.
+            sample_rate (int): Sample rate in Hz.
+            frame_len (int): Frame length in samples.
+            hop (int): Step between frames in samples.
+
+        Returns:
+            tuple: ``(energy_db, band_ratio, flatness)`` arrays with one value per frame.
+        """
+        frames = np.lib.stride_tricks.sliding_window_view(samples, frame_len)[::hop]
+        window = np.hanning(frame_len).astype(np.float32)
+        freqs = np.fft.rfftfreq(frame_len, 1.0 / sample_rate)
+        in_band = (freqs >= self.speech_band[0]) & (freqs <= self.speech_band[1])
+        eps = 1e-10
+
+        energy_db = np.empty(len(frames), dtype=np.float32)
+        band_ratio = np.empty(len(frames), dtype=np.float32)
+        flatness = np.empty(len(frames), dtype=np.float32)
+        # Blocks keep the FFT working set small on hour-long episodes
+        for first in range(0, len(frames), self.block_frames):
+            block = frames[first:first + self.block_frames]
+            energy_db[first:first + len(block)] = 10 * np.log10(np.mean(np.square(block), axis=1) + eps)
+            power = np.square(np.abs(np.fft.rfft(block * window, axis=1))) + eps
+            total = power.sum(axis=1)
+            band_ratio[first:first + len(block)] = power[:, in_band].sum(axis=1) / total
+            flatness[first:first + len(block)] = np.exp(np.mean(np.log(power), axis=1)) / (total / power.shape[1])
+        return energy_db, band_ratio, flatness
+
+    def classify(self, energy_db, band_ratio, flatness, hop_s: float):
+        """
+        Labels every frame as speech or not.
+
+        Args:
+            energy_db (np.ndarray): Frame levels in dB.
+            band_ratio (np.ndarray): Share of the frame energy in the speech band.
+            flatness (np.ndarray): Spectral flatness of the frames.
+            hop_s (float): Step between frames in seconds.
+
+        Returns:
+            np.ndarray: Boolean speech mask, one value per frame.
+        """
+        noise_floor = np.percentile(energy_db, 10)
+        threshold = max(noise_floor + self.energy_threshold_db, self.min_energy_db)
+        loud = energy_db > threshold
+
+        # Level fluctuation over ~0.5 s: speech rises and falls with syllables
+        width = max(1, int(round(0.5 / hop_s)))
+        kernel = np.ones(width) / width
+        mean = np.convolve(energy_db, kernel, mode='same')
+        mean_sq = np.convolve(np.square(energy_db), kernel, mode='same')
+        modulation = np.sqrt(np.maximum(mean_sq - np.square(mean), 0.0))
+
+        return loud & (band_ratio >= self.min_band_ratio) & (flatness <= self.max_flatness) & (modulation >= self.min_modulation_db)
+
+    def to_regions(self, speech, hop_s: float, frame_s: float) -> list:
+        """
+        Turns a frame mask into padded speech regions.
+
+        Args:
+            speech (np.ndarray): Boolean speech mask, one value per frame.
+            hop_s (float): Step between frames in seconds.
+            frame_s (float): Frame length in seconds.
+
+        Returns:
+            list: ``(start, end)`` speech regions in seconds.
+        """
+        edges = np.diff(np.concatenate(([0], speech.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1) * hop_s
+        ends = np.flatnonzero(edges == -1) * hop_s - hop_s + frame_s
+
+        regions = []
+        for start, end in zip(starts, ends):
+            if regions and start - regions[-1][1] < self.min_silence_s:
+                regions[-1] = (regions[-1][0], end)
+            else:
+                regions.append((start, end))
+        return [(float(start - self.padding_s), float(end + self.padding_s))
+                for start, end in regions if end - start >= self.min_speech_s]
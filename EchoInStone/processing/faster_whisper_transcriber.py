@@ -0,0 +1,110 @@
+import os
+import time
+import logging
+from typing import Union
+from .audio_transcriber_interface import AudioTranscriberInterface
+from ..capture.audio_buffer import AudioBuffer
+from .model_registry import ModelRegistry, default_registry
+from EchoInStone.utils import timer
+
+# Optional dependency: install with `poetry install -E ctranslate2`
+try:
+    from faster_whisper import WhisperModel, BatchedInferencePipeline
+except ImportError:
+    WhisperModel = None
+    BatchedInferencePipeline = None
+
+logger = logging.getLogger(__name__)
+
+class FasterWhisperTranscriber(AudioTranscriberInterface):
+    def __init__(self, model_name="large-v3-turbo", compute_type="int8", batch_size=8, beam_size=5,
+                 cpu_threads=0, language=None, registry: ModelRegistry = None, word_timestamps=False):
+        """Initialize a Whisper transcriber running on the CTranslate2 runtime.
+
+        The model is a CTranslate2 conversion of Whisper, loaded through faster-whisper.
+        On CPU, int8 weights and the runtime's fused kernels are several times faster
+        than the transformers pipeline.
+
+        Args:
+            model_name (str): faster-whisper model size (e.g. ``"large-v3-turbo"``), Hugging Face
+                repository or path to a converted model directory.
+            compute_type (str): CTranslate2 weight type, e.g. ``"int8"``, ``"int8_float32"``, ``"float32"``.
+            batch_size (int): Number of 30 s windows decoded together; 1 decodes sequentially.
+            beam_size (int): Beam width of the decoder.
+            cpu_threads (int): Threads used by the runtime; 0 uses every core.
+            language (str): Language code, or None to detect it.
+            registry (ModelRegistry): Registry sharing loaded models; the process-wide one by default.
+                The model is loaded on the first transcription, not here.
+            word_timestamps (bool): Emit one timestamped chunk per word instead of per segment.
+        """
+        if WhisperModel is None:
+            raise ImportError("faster-whisper is required for the ctranslate2 backend: pip install faster-whisper")
+        self.batch_size = batch_size
+        self.beam_size = beam_size
+        self.language = language
+        self.word_timestamps = word_timestamps
+        self.last_real_time_factor = None
+
+        self.device = "cpu"
+        self.model_name = model_name
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads or os.cpu_count() or 0
+        self.registry = registry if registry is not None else default_registry
+        self.model_key = ("ctranslate2", model_name, self.device, compute_type, self.cpu_threads)
+
+    def _load_model(self):
+        try:
+            model = WhisperModel(self.model_name, device=self.device, compute_type=self.compute_type,
+                                 cpu_threads=self.cpu_threads)
+            logger.info(f"CTranslate2 Whisper model {self.model_name} loaded ({self.compute_type}).")
+            return model
+        except Exception as e:
+            logger.error(f"Error loading the CTranslate2 transcription model: {e}")
+            raise
+
+    @property
+    def model(self):
+        """The CTranslate2 Whisper model, loaded on first use and shared through the registry."""
+        return self.registry.get(self.model_key, self._load_model)
+
+    @timer
+    def transcribe(self, audio: Union[str, AudioBuffer]) -> tuple:
+        """Transcribe audio from the given file path or decoded audio buffer.
+
+        Args:
+            audio (str | AudioBuffer): Path to the audio file, or audio already decoded in memory.
+
+        Returns:
+            tuple: A tuple containing the transcription text and timestamps, in the
+            same ``{'timestamp': (start, end), 'text': ...}`` chunk form as the transformers backend.
+        """
+        try:
+            if not isinstance(audio, AudioBuffer):
+                audio = AudioBuffer.from_file(audio)
+            model = self.model
+            started = time.perf_counter()
+            if self.batch_size > 1:
+                batched = BatchedInferencePipeline(model=model)
+                segments, info = batched.transcribe(audio.samples, batch_size=self.batch_size, beam_size=self.beam_size,
+                                                    language=self.language, word_timestamps=self.word_timestamps)
+            else:
+                segments, info = model.transcribe(audio.samples, beam_size=self.beam_size, language=self.language,
+                                                  word_timestamps=self.word_timestamps)
+            # Segments are generated lazily; decoding happens while iterating
+            if self.word_timestamps:
+                timestamps = [{'timestamp': (word.start, word.end), 'text': word.word}
+                              for segment in segments for word in segment.words or []]
+            else:
+                timestamps = [{'timestamp': (segment.start, segment.end), 'text': segment.text} for segment in segments]
+            elapsed = time.perf_counter() - started
+
+            self.last_real_time_factor = elapsed / audio.duration if audio.duration > 0 else None
+            if self.last_real_time_factor is not None:
+                logger.info(f"Transcription (ctranslate2) real-time factor: {self.last_real_time_factor:.3f} "
+                            f"({elapsed:.1f}s for {audio.duration:.1f}s of audio, language {info.language})")
+            transcription = "".join(chunk['text'] for chunk in timestamps)
+            logger.info(f"Successfully transcribed: {audio}")
+            return transcription, timestamps
+        except Exception as e:
+            logger.error(f"Error during transcription: {e}")
+            return None, None
@@ -0,0 +1,171 @@
+import gc
+import sys
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+class ModelRegistry:
+    def __init__(self, idle_timeout: float = None):
+        """
+        Initializes a process-wide cache of loaded models.
+
+        Models are loaded on first use and shared by every transcriber and diarizer
+        asking for the same key, so long-running or batch jobs load each model once.
+
+        Args:
+            idle_timeout (float): Seconds after which a model nobody asked for is
+                released to free memory; None keeps models until ``clear``.
+        """
+        self.idle_timeout = idle_timeout
+        self.loads = 0
+        self.hits = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._sweeper = None
+        self._stop = threading.Event()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key, loader):
+        """
+        Returns the model stored under a key, loading it on first use.
+
+        Concurrent callers asking for the same key wait for a single load;
+        different keys load in parallel.
+
+        Args:
+            key (tuple): Identity of the model, e.g. ``(kind, name, device, dtype)``.
+            loader (callable): Builds the model when it is not loaded yet.
+
+        Returns:
+            The loaded model.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry['last_used'] = time.monotonic()
+                self.hits += 1
+                return entry['model']
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry['last_used'] = time.monotonic()
+                    self.hits += 1
+                    return entry['model']
+
+            logger.info(f"Loading model {key}...")
+            started = time.perf_counter()
+            model = loader()
+            logger.info(f"Model {key} loaded in {time.perf_counter() - started:.1f}s.")
+
+            with self._lock:
+                self._entries[key] = {'model': model, 'last_used': time.monotonic()}
+                self.loads += 1
+        self._start_sweeper()
+        return model
+
+    def evict(self, key) -> bool:
+        """
+        Releases a model.
+
+        Args:
+            key (tuple): Identity of the model.
+
+        Returns:
+            bool: True if the model was loaded.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        del entry
+        logger.info(f"Released model {key}.")
+        self._free_memory()
+        return True
+
+    def evict_idle(self, now: float = None) -> list:
+        """
+        Releases the models unused for longer than ``idle_timeout``.
+
+        Args:
+            now (float): Current ``time.monotonic()`` value, for tests.
+
+        Returns:
+            list: Keys of the released models.
+        """
+        if self.idle_timeout is None:
+            return []
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            idle = [key for key, entry in self._entries.items() if now - entry['last_used'] >= self.idle_timeout]
+            for key in idle:
+                del self._entries[key]
+        if idle:
+            logger.info(f"Released {len(idle)} idle models: {idle}")
+            self._free_memory()
+        return idle
+
+    def clear(self):
+        """Releases every model and stops the idle sweeper."""
+        self._stop.set()
+        sweeper = self._sweeper
+        if sweeper is not None and sweeper is not threading.current_thread():
+            sweeper.join()
+        with self._lock:
+            self._entries.clear()
+        self._free_memory()
+
+    def stats(self) -> dict:
+        """
+        Returns the registry counters.
+
+        Returns:
+            dict: Number of loads, cache hits and loaded models.
+        """
+        with self._lock:
+            return {'loads': self.loads, 'hits': self.hits, 'models': len(self._entries)}
+
+    def _start_sweeper(self):
+        if self.idle_timeout is None:
+            return
+        with self._lock:
+            if self._sweeper is not None:
+                return
+            self._stop.clear()
+            self._sweeper = threading.Thread(target=self._sweep, name="model-registry-sweeper", daemon=True)
+            self._sweeper.start()
+
+    def _sweep(self):
+        while True:
+            timeout = self.idle_timeout
+            stopped = timeout is None or self._stop.wait(max(1.0, min(timeout / 2, 60.0)))
+            if not stopped:
+                self.evict_idle()
+            with self._lock:
+                # Decided under the lock so a concurrent load starts a new sweeper if needed
+                if stopped or not self._entries:
+                    self._sweeper = None
+                    return
+
+    @staticmethod
+    def _free_memory():
+        gc.collect()
+        # Only touch torch if a model already imported it
+        torch = sys.modules.get('torch')
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+# Shared by every model class unless another registry is passed in
+default_registry = ModelRegistry()
@@ -1,8 +1,13 @@
-from pyannote.audio import Pipeline
-from pyannote.audio.pipelines.utils.hook import ProgressHook
-import torch
 import logging
+import threading
+import weakref
+import numpy as np
+from contextlib import contextmanager, nullcontext
+from typing import Union
 from .diarizer_interface import DiarizerInterface
+from ..capture.audio_buffer import AudioBuffer
+from .model_registry import ModelRegistry, default_registry
+from .embedding_cache import EmbeddingCache
 
 # Import HF Token 
 try:
@@ -12,44 +17,189 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# A pipeline is shared through the registry and is not thread-safe; a diarization
+# also changes its clustering parameters and feature methods while it runs
+_pipeline_locks = weakref.WeakKeyDictionary()
+_pipeline_locks_guard = threading.Lock()
+
+def _pipeline_lock(pipeline) -> threading.Lock:
+    with _pipeline_locks_guard:
+        lock = _pipeline_locks.get(pipeline)
+        if lock is None:
+            lock = _pipeline_locks[pipeline] = threading.Lock()
+        return lock
+
 class PyannoteDiarizer(DiarizerInterface):
-    def __init__(self):
+    def __init__(self, model_name="pyannote/speaker-diarization-3.1", registry: ModelRegistry = None,
+                 embedding_cache: EmbeddingCache = None, num_speakers=None, min_speakers=None, max_speakers=None,
+                 clustering=None, speaker_index=None):
         """Initialize the PyannoteDiarizer with the pretrained model.
 
-        Loads the speaker diarization model and sets up the device for computation.
+        Sets up the device for computation. The pipeline itself is loaded on the
+        first diarization and shared with other diarizers through the registry.
+
+        Args:
+            model_name (str): The pretrained pipeline to use.
+            registry (ModelRegistry): Registry sharing loaded models; the process-wide one by default.
+            embedding_cache (EmbeddingCache): Stores segmentations and embeddings so that a file
+                diarized again with other speaker counts or clustering settings is only re-clustered.
+            num_speakers (int): Known number of speakers.
+            min_speakers (int): Lower bound on the number of speakers.
+            max_speakers (int): Upper bound on the number of speakers.
+            clustering (dict): Clustering hyperparameters overriding the pretrained ones, e.g. ``{"threshold": 0.6}``.
+            speaker_index (SpeakerIndex): Known voices; recognised speakers are labelled with their names.
         """
+        # torch and pyannote.audio are imported here rather than at module level so that
+        # importing the processing package stays cheap
+        import torch
+
+        self.model_name = model_name
+        self.registry = registry if registry is not None else default_registry
+        self.device = torch.device("mps" if torch.backends.mps.is_available() else "cuda" if torch.cuda.is_available() else "cpu")
+        self.model_key = ("pyannote", model_name, str(self.device))
+        self.embedding_cache = embedding_cache
+        self.num_speakers = num_speakers
+        self.min_speakers = min_speakers
+        self.max_speakers = max_speakers
+        self.clustering = clustering
+        self.speaker_index = speaker_index
+        # Embedding of every speaker of the last diarization, by label, for enrollment
+        self.last_embeddings = None
+        # Set to use a ready-made pipeline instead of the shared one
+        self._pipeline = None
+
+    def _load_pipeline(self):
+        from pyannote.audio import Pipeline
+
+        pipeline = Pipeline.from_pretrained(
+            self.model_name,
+            use_auth_token=HUGGING_FACE_TOKEN
+        )
+        # Move the pipeline to GPU (if available)
+        pipeline.to(self.device)
+        logger.info(f"Diarization pipeline loaded and set to use {self.device}.")
+        return pipeline
+
+    @property
+    def pipeline(self):
+        """The diarization pipeline, or None if it could not be loaded."""
+        if self._pipeline is not None:
+            return self._pipeline
         try:
-            self.pipeline = Pipeline.from_pretrained(
-                "pyannote/speaker-diarization-3.1",
-                use_auth_token=HUGGING_FACE_TOKEN
-            )
-            # Move the pipeline to GPU (if available)
-            device = torch.device("mps" if torch.backends.mps.is_available() else "cuda" if torch.cuda.is_available() else "cpu")
-            self.pipeline.to(device)
-            logger.info(f"Diarization pipeline loaded and set to use {device}.")
+            return self.registry.get(self.model_key, self._load_pipeline)
         except Exception as e:
             logger.error(f"Error loading the diarization model: {e}")
-            self.pipeline = None
+            return None
+
+    @pipeline.setter
+    def pipeline(self, value):
+        self._pipeline = value
 
-    def diarize(self, audio_path: str):
-        """Perform speaker diarization on the given audio file.
+    def diarize(self, audio: Union[str, AudioBuffer], num_speakers=None, min_speakers=None, max_speakers=None,
+                clustering=None, return_embeddings=False):
+        """Perform speaker diarization on the given audio file or decoded audio buffer.
+
+        Speaker counts and clustering settings default to the ones given at construction.
 
         Args:
-            audio_path (str): Path to the audio file to diarize.
+            audio (str | AudioBuffer): Path to the audio file, or audio already decoded in memory.
+            num_speakers (int): Known number of speakers.
+            min_speakers (int): Lower bound on the number of speakers.
+            max_speakers (int): Upper bound on the number of speakers.
+            clustering (dict): Clustering hyperparameters overriding the pretrained ones.
+            return_embeddings (bool): Also return one centroid embedding per speaker.
 
         Returns:
-            Diarization result or None if diarization fails.
+            Diarization result or None if diarization fails; with ``return_embeddings``, a
+            ``(diarization, embeddings)`` tuple whose rows follow ``diarization.labels()``.
         """
-        if self.pipeline is None:
+        pipeline = self.pipeline
+        if pipeline is None:
             logger.warning("Diarization model is not available.")
             return None
+        from pyannote.audio.pipelines.utils.hook import ProgressHook
 
         try:
             # Perform diarization with progress tracking
-            with ProgressHook() as hook:
-                diarization = self.pipeline(audio_path, hook=hook)
-                logger.info(f"Diarization successful for file: {audio_path}")
+            if isinstance(audio, AudioBuffer):
+                # In-memory waveform skips pyannote's own file read and resample
+                audio_input = audio.to_pyannote_input()
+            else:
+                audio_input = audio
+            options = {
+                'num_speakers': num_speakers if num_speakers is not None else self.num_speakers,
+                'min_speakers': min_speakers if min_speakers is not None else self.min_speakers,
+                'max_speakers': max_speakers if max_speakers is not None else self.max_speakers,
+            }
+            options = {name: value for name, value in options.items() if value is not None}
+            with_embeddings = return_embeddings or self.speaker_index is not None
+            if with_embeddings:
+                options['return_embeddings'] = True
+            clustering = clustering if clustering is not None else self.clustering
+            features = self._cached_features(pipeline, audio) if self.embedding_cache is not None else nullcontext()
+            # One call at a time per pipeline, so no caller sees another one's settings or features
+            with _pipeline_lock(pipeline), ProgressHook() as hook, self._clustering_settings(pipeline, clustering), features:
+                diarization = pipeline(audio_input, hook=hook, **options)
+            logger.info(f"Diarization successful for file: {audio}")
+            if not with_embeddings:
                 return diarization
+
+            diarization, embeddings = diarization
+            self.last_embeddings = dict(zip(diarization.labels(), embeddings))
+            if self.speaker_index is not None:
+                names = self.speaker_index.resolve(diarization.labels(), embeddings)
+                diarization = diarization.rename_labels(names)
+                self.last_embeddings = {names.get(label, label): embedding
+                                        for label, embedding in self.last_embeddings.items()}
+            if return_embeddings:
+                return diarization, np.array([self.last_embeddings[label] for label in diarization.labels()])
+            return diarization
         except Exception as e:
             logger.error(f"Error during diarization: {e}")
             return None
+
+    @staticmethod
+    @contextmanager
+    def _clustering_settings(pipeline, clustering):
+        if not clustering:
+            yield
+            return
+        previous = pipeline.parameters(instantiated=True)
+        pipeline.instantiate({**previous, 'clustering': {**previous.get('clustering', {}), **clustering}})
+        try:
+            yield
+        finally:
+            # The pipeline is shared, so the pretrained settings are put back before its lock is released
+            pipeline.instantiate(previous)
+
+    @contextmanager
+    def _cached_features(self, pipeline, audio):
+        from pyannote.audio import __version__ as pyannote_version
+
+        key = self.embedding_cache.key(audio, f"{self.model_name}:{pyannote_version}")
+        cached = self.embedding_cache.load(key)
+        computed = {}
+        get_segmentations, get_embeddings = pipeline.get_segmentations, pipeline.get_embeddings
+
+        def segmentations(file, **kwargs):
+            if cached is not None:
+                return cached[0]
+            computed['segmentations'] = get_segmentations(file, **kwargs)
+            return computed['segmentations']
+
+        def embeddings(file, binary_segmentations, **kwargs):
+            if cached is not None and cached[1] is not None:
+                return cached[1]
+            computed['embeddings'] = get_embeddings(file, binary_segmentations, **kwargs)
+            return computed['embeddings']
+
+        # Instance attributes shadow the pipeline methods for this call only
+        pipeline.get_segmentations, pipeline.get_embeddings = segmentations, embeddings
+        try:
+            yield
+        finally:
+            del pipeline.get_segmentations
+            del pipeline.get_embeddings
+        if computed:
+            self.embedding_cache.save(key, computed.get('segmentations', cached[0] if cached else None),
+                                      computed.get('embeddings'))
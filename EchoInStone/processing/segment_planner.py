@@ -0,0 +1,62 @@
+import math
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SegmentPlanner:
+    def __init__(self, target_s=20.0, max_s=28.0, min_s=0.2, merge_gap_s=0.5):
+        """
+        Initializes a planner turning diarization turns into transcription segments.
+
+        Consecutive turns of the same speaker are merged up to ``target_s`` and turns
+        longer than ``max_s`` are split, so every segment fits in one Whisper window
+        and carries exactly one speaker.
+
+        Args:
+            target_s (float): Length merged turns grow to, and length of the pieces of split turns.
+            max_s (float): Longest segment sent to the model; Whisper windows are 30 s.
+            min_s (float): Turns shorter than this are dropped.
+            merge_gap_s (float): Largest silence between two turns of a speaker that are merged.
+        """
+        self.target_s = target_s
+        self.max_s = max_s
+        self.min_s = min_s
+        self.merge_gap_s = merge_gap_s
+
+    def plan(self, diarization) -> list:
+        """
+        Builds the transcription segments of a diarization.
+
+        Args:
+            diarization (Annotation): Speaker turns.
+
+        Returns:
+            list: ``(start, end, speaker)`` segments in chronological order.
+        """
+        if diarization is None:
+            return []
+        turns = sorted((turn.start, turn.end, speaker) for turn, _, speaker in diarization.itertracks(yield_label=True))
+
+        merged = []
+        for start, end, speaker in turns:
+            if end - start < self.min_s:
+                continue
+            if merged:
+                last_start, last_end, last_speaker = merged[-1]
+                if (last_speaker == speaker and start - last_end <= self.merge_gap_s
+                        and max(end, last_end) - last_start <= self.target_s):
+                    merged[-1] = (last_start, max(end, last_end), speaker)
+                    continue
+            merged.append((start, end, speaker))
+
+        segments = []
+        for start, end, speaker in merged:
+            if end - start <= self.max_s:
+                segments.append((start, end, speaker))
+                continue
+            pieces = math.ceil((end - start) / self.target_s)
+            step = (end - start) / pieces
+            segments.extend((start + i * step, start + (i + 1) * step, speaker) for i in range(pieces))
+
+        logger.debug(f"Planned {len(segments)} transcription segments from {len(turns)} speaker turns.")
+        return segments
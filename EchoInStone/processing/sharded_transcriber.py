@@ -0,0 +1,182 @@
+import os
+import time
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Union
+import numpy as np
+from .audio_transcriber_interface import AudioTranscriberInterface
+from ..capture.audio_buffer import AudioBuffer
+
+logger = logging.getLogger(__name__)
+
+# Transcriber of the current worker process, built once by _init_worker
+_worker_transcriber = None
+
+def _init_worker(threads: int, transcriber_class, options: dict):
+    global _worker_transcriber
+    import torch
+
+    torch.set_num_threads(threads)
+    _worker_transcriber = transcriber_class(**options)
+
+def _transcribe_shard(samples, sample_rate: int, offset: float) -> list:
+    _, chunks = _worker_transcriber.transcribe(AudioBuffer(samples, sample_rate))
+    if chunks is None:
+        raise RuntimeError(f"Transcription of the shard at {offset:.1f}s failed")
+    duration = len(samples) / sample_rate
+    shifted = []
+    for chunk in chunks:
+        start, end = chunk['timestamp']
+        start = 0.0 if start is None else start
+        end = duration if end is None else end
+        shifted.append({'timestamp': (offset + start, offset + end), 'text': chunk['text']})
+    return shifted
+
+class ShardedTranscriber(AudioTranscriberInterface):
+    def __init__(self, shards=4, threads_per_shard=None, transcriber_class=None, transcriber_options=None,
+                 min_shard_s=60.0, search_s=15.0, overlap_s=1.0):
+        """
+        Initializes a transcriber splitting one recording across worker processes.
+
+        The audio is cut at the quietest points near equal shard boundaries and each
+        shard is transcribed by its own process with a fixed number of torch threads,
+        which scales better on many-core CPUs than intra-op threading in one process.
+        Every worker loads its own copy of the model.
+
+        Args:
+            shards (int): Number of worker processes and of shards per recording.
+            threads_per_shard (int): Torch threads of each worker; defaults to the CPU
+                count divided by ``shards``.
+            transcriber_class: Transcriber built in each worker; ``WhisperAudioTranscriber`` by default.
+            transcriber_options (dict): Keyword arguments of ``transcriber_class``.
+            min_shard_s (float): Shortest shard; shorter recordings use fewer shards.
+            search_s (float): Distance around each boundary searched for silence.
+            overlap_s (float): Audio added on both sides of a shard so that words at
+                the cut are decoded whole; chunks are kept by the shard holding their middle.
+        """
+        if transcriber_class is None:
+            from .whisper_audio_transcriber import WhisperAudioTranscriber
+            transcriber_class = WhisperAudioTranscriber
+        self.shards = max(1, shards)
+        self.threads_per_shard = threads_per_shard or max(1, (os.cpu_count() or 1) // self.shards)
+        self.transcriber_class = transcriber_class
+        self.transcriber_options = transcriber_options or {}
+        self.min_shard_s = min_shard_s
+        self.search_s = search_s
+        self.overlap_s = overlap_s
+        self.last_real_time_factor = None
+        self._pool = None
+
+    def _executor(self):
+        if self._pool is None:
+            # Spawned workers do not inherit torch thread pools or locks from the parent
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.shards,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.threads_per_shard, self.transcriber_class, self.transcriber_options),
+            )
+            logger.info(f"Started {self.shards} transcription workers with {self.threads_per_shard} threads each.")
+        return self._pool
+
+    def close(self):
+        """Stops the worker processes and releases their models."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def split(self, audio: AudioBuffer) -> list:
+        """
+        Splits the audio into shards ending at silence.
+
+        Args:
+            audio (AudioBuffer): The decoded audio.
+
+        Returns:
+            list: ``(start, end)`` spans in seconds covering the whole audio.
+        """
+        shards = min(self.shards, max(1, int(audio.duration // self.min_shard_s)))
+        cuts = [0.0]
+        for index in range(1, shards):
+            target = audio.duration * index / shards
+            cuts.append(max(self._quietest_point(audio, target), cuts[-1]))
+        cuts.append(audio.duration)
+        return [(start, end) for start, end in zip(cuts, cuts[1:]) if end > start]
+
+    def _quietest_point(self, audio: AudioBuffer, target: float) -> float:
+        # 50 ms frames smoothed over half a second, searched only around the target
+        frame = max(1, audio.sample_rate // 20)
+        first = max(0, int((target - self.search_s) * audio.sample_rate))
+        last = min(len(audio.samples), int((target + self.search_s) * audio.sample_rate))
+        count = (last - first) // frame
+        if count < 1:
+            return target
+        frames = audio.samples[first:first + count * frame].reshape(count, frame)
+        energy = np.mean(np.square(frames), axis=1)
+        smoothed = np.convolve(energy, np.ones(10) / 10, mode='same')
+        # Ties go to the frame closest to the target
+        distance = np.abs(np.arange(count) - (target * audio.sample_rate - first) / frame)
+        best = np.lexsort((distance, np.round(smoothed, 12)))[0]
+        return (first + (best + 0.5) * frame) / audio.sample_rate
+
+    def transcribe(self, audio: Union[str, AudioBuffer]) -> tuple:
+        """Transcribe audio by shards in parallel worker processes.
+
+        Args:
+            audio (str | AudioBuffer): Path to the audio file, or audio already decoded in memory.
+
+        Returns:
+            tuple: A tuple containing the transcription text and timestamps on the timeline of the whole audio.
+        """
+        try:
+            if not isinstance(audio, AudioBuffer):
+                audio = AudioBuffer.from_file(audio)
+            spans = self.split(audio)
+            pool = self._executor()
+            started = time.perf_counter()
+
+            futures = []
+            for start, end in spans:
+                first = max(0, int((start - self.overlap_s) * audio.sample_rate))
+                last = min(len(audio.samples), int((end + self.overlap_s) * audio.sample_rate))
+                futures.append(pool.submit(_transcribe_shard, audio.samples[first:last], audio.sample_rate,
+                                           first / audio.sample_rate))
+            timestamps = []
+            for (start, end), future in zip(spans, futures):
+                timestamps.extend(self.keep_own_chunks(future.result(), start, end))
+            elapsed = time.perf_counter() - started
+
+            self.last_real_time_factor = elapsed / audio.duration if audio.duration > 0 else None
+            if self.last_real_time_factor is not None:
+                logger.info(f"Transcription ({len(spans)} shards) real-time factor: {self.last_real_time_factor:.3f} "
+                            f"({elapsed:.1f}s for {audio.duration:.1f}s of audio)")
+            transcription = "".join(chunk['text'] for chunk in timestamps)
+            logger.info(f"Successfully transcribed: {audio}")
+            return transcription, timestamps
+        except Exception as e:
+            logger.error(f"Error during sharded transcription: {e}")
+            return None, None
+
+    @staticmethod
+    def keep_own_chunks(chunks: list, start: float, end: float) -> list:
+        """
+        Keeps the chunks of a shard whose middle lies inside the shard.
+
+        Chunks in the overlap are decoded by both neighbouring shards; each one is
+        kept only by the shard it belongs to.
+
+        Args:
+            chunks (list): Chunks of the shard on the global timeline.
+            start (float): Start of the shard in seconds.
+            end (float): End of the shard in seconds.
+
+        Returns:
+            list: The chunks to keep.
+        """
+        kept = []
+        for chunk in chunks:
+            chunk_start, chunk_end = chunk['timestamp']
+            if start <= (chunk_start + chunk_end) / 2 < end:
+                kept.append(chunk)
+        return kept
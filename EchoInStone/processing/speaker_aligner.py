@@ -1,4 +1,5 @@
 from .aligner_interface import AlignerInterface
+from ..utils import SegmentStore
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,10 +14,10 @@ class SpeakerAligner(AlignerInterface):
             diarization (object): Diarization object containing speaker segments.
 
         Returns:
-            list: List of aligned segments with speaker identifiers and timestamps.
+            SegmentStore: Aligned segments with speaker identifiers and timestamps.
         """
         logger.debug("Combining transcription and diarization...")
-        speaker_transcriptions = []
+        speaker_transcriptions = SegmentStore()
 
         # Find the end time of the last segment in diarization
         last_diarization_end = self.get_last_segment(diarization).end
@@ -35,11 +36,10 @@ class SpeakerAligner(AlignerInterface):
             best_match = self.find_best_match(diarization, chunk_start, chunk_end)
             if best_match:
                 speaker = best_match[2]  # Extract the speaker label
-                speaker_transcriptions.append((speaker, chunk_start, chunk_end, segment_text))
+                speaker_transcriptions.append(speaker, chunk_start, chunk_end, segment_text)
 
         # Merge consecutive segments of the same speaker
-        speaker_transcriptions = self.merge_consecutive_segments(speaker_transcriptions)
-        return speaker_transcriptions
+        return speaker_transcriptions.merge_consecutive()
 
     def find_best_match(self, diarization, start_time, end_time):
         """Finds the best matching speaker segment for a given time range.
@@ -0,0 +1,181 @@
+import os
+import logging
+import tempfile
+import numpy as np
+from .speaker_linker import normalize_rows
+
+logger = logging.getLogger(__name__)
+
+class SpeakerIndex:
+    def __init__(self, path: str = None, min_similarity=0.5):
+        """
+        Initializes a persistent index of known voices.
+
+        Each enrolled speaker is one unit-length centroid embedding, stored as a row
+        of a float32 matrix, so matching a diarization against thousands of voices
+        is a single matrix product.
+
+        Args:
+            path (str): ``.npz`` file the index is loaded from, if it exists, and saved to.
+            min_similarity (float): Lowest cosine similarity at which a speaker is recognised.
+        """
+        self.path = path
+        self.min_similarity = min_similarity
+        self.names = []
+        self._positions = {}
+        self._embeddings = np.zeros((0, 0), dtype=np.float32)
+        self._counts = np.zeros(0, dtype=np.float32)
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._positions
+
+    @property
+    def embeddings(self) -> np.ndarray:
+        """np.ndarray: ``(len(self), dim)`` matrix of unit centroid embeddings."""
+        return self._embeddings[:len(self.names)]
+
+    def _load(self, path: str):
+        with np.load(path) as stored:
+            self.names = [str(name) for name in stored['names']]
+            self._embeddings = stored['embeddings'].astype(np.float32)
+            self._counts = stored['counts'].astype(np.float32)
+        self._positions = {name: position for position, name in enumerate(self.names)}
+        logger.info(f"Loaded {len(self.names)} known speakers from {path}")
+
+    def save(self, path: str = None):
+        """
+        Writes the index to disk.
+
+        Args:
+            path (str): Destination; the path given at construction by default.
+        """
+        path = path or self.path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # Written next to the final path and renamed, so readers never see a partial file
+        handle, temp_path = tempfile.mkstemp(dir=directory, suffix='.part')
+        try:
+            with os.fdopen(handle, 'wb') as f:
+                np.savez(f, names=np.array(self.names, dtype=str), embeddings=self.embeddings,
+                         counts=self._counts[:len(self.names)])
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        logger.info(f"Saved {len(self.names)} known speakers to {path}")
+
+    def enroll(self, name: str, embedding, weight: float = 1.0):
+        """
+        Adds a voice to the index, or refines the centroid of a known one.
+
+        Args:
+            name (str): Name of the speaker.
+            embedding: Speaker embedding, e.g. from ``PyannoteDiarizer.last_embeddings``.
+            weight (float): Weight of this embedding against the ones enrolled before.
+        """
+        vector = normalize_rows(np.asarray(embedding)[np.newaxis])[0]
+        if np.isnan(vector).any():
+            logger.warning(f"Ignoring an empty embedding for speaker {name}.")
+            return
+        if not len(self.names) and self._embeddings.shape[1] != len(vector):
+            self._embeddings = np.zeros((0, len(vector)), dtype=np.float32)
+
+        position = self._positions.get(name)
+        if position is None:
+            position = len(self.names)
+            if position == len(self._embeddings):
+                # Capacity doubles so that enrolling many voices stays linear
+                capacity = max(16, 2 * position)
+                self._embeddings = np.resize(self._embeddings, (capacity, len(vector)))
+                self._counts = np.resize(self._counts, capacity)
+            self._embeddings[position] = vector
+            self._counts[position] = weight
+            self.names.append(name)
+            self._positions[name] = position
+        else:
+            merged = self._counts[position] * self._embeddings[position] + weight * vector
+            self._embeddings[position] = normalize_rows(merged[np.newaxis])[0]
+            self._counts[position] += weight
+
+    def remove(self, name: str) -> bool:
+        """
+        Forgets a speaker.
+
+        Args:
+            name (str): Name of the speaker.
+
+        Returns:
+            bool: True if the speaker was enrolled.
+        """
+        position = self._positions.pop(name, None)
+        if position is None:
+            return False
+        last = len(self.names) - 1
+        # The last row takes the freed position so the matrix stays dense
+        self._embeddings[position] = self._embeddings[last]
+        self._counts[position] = self._counts[last]
+        self.names[position] = self.names[last]
+        self.names.pop()
+        if position != last:
+            self._positions[self.names[position]] = position
+        return True
+
+    def match(self, embeddings) -> tuple:
+        """
+        Finds the most similar known speaker of every embedding.
+
+        Args:
+            embeddings: ``(n, dim)`` array of embeddings.
+
+        Returns:
+            tuple: ``(names, similarities)``; a name is None when no known speaker
+            reaches ``min_similarity``.
+        """
+        embeddings = np.atleast_2d(embeddings)
+        if not len(self.names) or not len(embeddings):
+            return [None] * len(embeddings), np.full(len(embeddings), np.nan)
+        similarity = np.nan_to_num(normalize_rows(embeddings), nan=0.0) @ self.embeddings.T
+        best = np.argmax(similarity, axis=1)
+        scores = similarity[np.arange(len(embeddings)), best]
+        names = [self.names[j] if score >= self.min_similarity else None for j, score in zip(best, scores)]
+        return names, scores
+
+    def resolve(self, labels: list, embeddings) -> dict:
+        """
+        Names the speakers of a diarization.
+
+        Every known speaker names at most one label; when two labels match the same
+        speaker, the more similar one gets the name.
+
+        Args:
+            labels (list): Speaker labels, e.g. ``diarization.labels()``.
+            embeddings: ``(len(labels), dim)`` embeddings in the same order.
+
+        Returns:
+            dict: Name of every recognised label; unrecognised labels are left out.
+        """
+        if not labels or not len(self.names):
+            return {}
+        local = normalize_rows(np.asarray(embeddings)[:len(labels)])
+        valid = ~np.isnan(local).any(axis=1)
+        similarity = np.full((len(local), len(self.names)), -np.inf, dtype=np.float32)
+        similarity[valid] = local[valid] @ self.embeddings.T
+        resolved, taken = {}, set()
+        for flat in np.argsort(-similarity, axis=None):
+            i, j = divmod(int(flat), len(self.names))
+            if similarity[i, j] < self.min_similarity:
+                break
+            if labels[i] in resolved or j in taken:
+                continue
+            resolved[labels[i]] = self.names[j]
+            taken.add(j)
+            if len(resolved) == len(labels):
+                break
+        logger.info(f"Recognised {len(resolved)} of {len(labels)} speakers: {resolved}")
+        return resolved
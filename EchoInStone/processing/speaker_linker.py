@@ -0,0 +1,92 @@
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+def normalize_rows(embeddings) -> np.ndarray:
+    """
+    Scales embeddings to unit length so that dot products are cosine similarities.
+
+    Args:
+        embeddings: ``(n, dim)`` array of embeddings.
+
+    Returns:
+        np.ndarray: float32 array of unit rows; rows that are zero or not finite become NaN.
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        normalized = embeddings / norms
+    normalized[~(np.isfinite(norms[:, 0]) & (norms[:, 0] > 0))] = np.nan
+    return normalized
+
+class SpeakerLinker:
+    def __init__(self, min_similarity=0.3, label_format="SPEAKER_{:02d}"):
+        """
+        Initializes the linking of local speakers of independent windows into global speakers.
+
+        Every global speaker keeps a centroid embedding, the duration-weighted mean of
+        the embeddings linked to it. The local speakers of a window are matched one to
+        one with the most similar centroids, most similar pairs first.
+
+        Args:
+            min_similarity (float): Lowest cosine similarity at which a local speaker is
+                linked to a global one; less similar speakers become new global speakers.
+                pyannote's own clustering merges at about 0.3.
+            label_format (str): Format of the global labels, given the speaker index.
+        """
+        self.min_similarity = min_similarity
+        self.label_format = label_format
+        self.centroids = np.zeros((0, 0), dtype=np.float32)
+        self.weights = np.zeros(0, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.weights)
+
+    def link(self, diarization, embeddings) -> dict:
+        """
+        Maps the local speakers of one window to global speakers.
+
+        Args:
+            diarization (Annotation): Diarization of the window.
+            embeddings: ``(num_speakers, dim)`` centroid embeddings in ``diarization.labels()`` order.
+
+        Returns:
+            dict: Global label of every local label.
+        """
+        labels = diarization.labels()
+        if not labels:
+            return {}
+        local = normalize_rows(embeddings)[:len(labels)]
+        durations = np.array([diarization.label_duration(label) for label in labels])
+        valid = ~np.isnan(local).any(axis=1)
+        if not len(self):
+            self.centroids = np.zeros((0, local.shape[1]), dtype=np.float32)
+
+        assigned = {}
+        if len(self) and valid.any():
+            similarity = np.full((len(labels), len(self)), -np.inf, dtype=np.float32)
+            similarity[valid] = local[valid] @ np.nan_to_num(self.centroids).T
+            taken = set()
+            for flat in np.argsort(-similarity, axis=None):
+                i, j = divmod(int(flat), len(self))
+                if similarity[i, j] < self.min_similarity:
+                    break
+                if i in assigned or j in taken:
+                    continue
+                assigned[i] = j
+                taken.add(j)
+
+        for i in range(len(labels)):
+            if i not in assigned:
+                assigned[i] = len(self)
+                self.centroids = np.vstack([self.centroids, np.zeros((1, self.centroids.shape[1]), dtype=np.float32)])
+                self.weights = np.append(self.weights, 0.0)
+            j = assigned[i]
+            if valid[i]:
+                merged = self.weights[j] * self.centroids[j] + durations[i] * local[i]
+                self.centroids[j] = normalize_rows(merged[np.newaxis])[0]
+                self.weights[j] += durations[i]
+
+        logger.debug(f"Linked {len(labels)} local speakers; {len(self)} global speakers so far.")
+        return {labels[i]: self.label_format.format(j) for i, j in assigned.items()}
@@ -0,0 +1,149 @@
+import logging
+import numpy as np
+from ..capture.audio_buffer import AudioBuffer
+
+logger = logging.getLogger(__name__)
+
+class SpeechTimeline:
+    def __init__(self, regions, duration: float):
+        """
+        Initializes the speech regions of an audio file.
+
+        The timeline maps between the original audio and the compacted audio made
+        of the speech regions only, so that models run on speech while their output
+        keeps the timestamps of the original file.
+
+        Args:
+            regions (list): ``(start, end)`` speech regions in seconds; overlapping regions are merged.
+            duration (float): Duration of the original audio in seconds.
+        """
+        self.duration = duration
+        merged = []
+        for start, end in sorted(regions):
+            start, end = max(0.0, float(start)), min(float(duration), float(end))
+            if end <= start:
+                continue
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        self.regions = merged
+
+        self._starts = np.array([start for start, _ in merged], dtype=np.float64)
+        self._lengths = np.array([end - start for start, end in merged], dtype=np.float64)
+        # Start of every region on the compacted timeline
+        self._offsets = np.concatenate(([0.0], np.cumsum(self._lengths)[:-1])) if merged else np.zeros(0)
+
+    def __len__(self):
+        return len(self.regions)
+
+    def __iter__(self):
+        return iter(self.regions)
+
+    def __repr__(self):
+        return f"SpeechTimeline(regions={len(self.regions)}, speech={self.speech_seconds:.2f}s, skipped={self.skipped_seconds:.2f}s)"
+
+    @property
+    def speech_seconds(self) -> float:
+        """float: Total duration of the speech regions."""
+        return float(self._lengths.sum())
+
+    @property
+    def skipped_seconds(self) -> float:
+        """float: Duration of the audio left out of the speech regions."""
+        return max(0.0, self.duration - self.speech_seconds)
+
+    def compact(self, audio: AudioBuffer) -> AudioBuffer:
+        """
+        Builds an audio buffer holding only the speech regions, back to back.
+
+        Args:
+            audio (AudioBuffer): The original audio.
+
+        Returns:
+            AudioBuffer: The compacted audio.
+        """
+        rate = audio.sample_rate
+        pieces = [audio.samples[int(round(start * rate)):int(round(end * rate))] for start, end in self.regions]
+        samples = np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.float32)
+        return AudioBuffer(samples, sample_rate=rate, source_path=audio.source_path)
+
+    def to_original(self, time: float, is_end: bool = False) -> float:
+        """
+        Maps a time on the compacted audio back to the original audio.
+
+        Args:
+            time (float): Time in seconds on the compacted audio.
+            is_end (bool): Whether the time ends a segment; a time falling exactly on the
+                junction of two regions then maps to the end of the earlier region.
+
+        Returns:
+            float: Time in seconds on the original audio.
+        """
+        if not self.regions:
+            return time
+        index = int(np.searchsorted(self._offsets, time, side='left' if is_end else 'right')) - 1
+        index = min(max(index, 0), len(self.regions) - 1)
+        return float(min(self._starts[index] + (time - self._offsets[index]), self.duration))
+
+    def to_original_spans(self, start: float, end: float) -> list:
+        """
+        Maps a segment of the compacted audio to the original audio.
+
+        A segment that crosses the junction of two speech regions is split so that
+        no part of it covers the skipped audio in between.
+
+        Args:
+            start (float): Segment start in seconds on the compacted audio.
+            end (float): Segment end in seconds on the compacted audio.
+
+        Returns:
+            list: ``(start, end)`` pieces in seconds on the original audio.
+        """
+        spans = []
+        for region_start, offset, length in zip(self._starts, self._offsets, self._lengths):
+            piece_start = max(start, offset)
+            piece_end = min(end, offset + length)
+            if piece_start < piece_end:
+                spans.append((float(region_start + piece_start - offset), float(region_start + piece_end - offset)))
+        return spans
+
+    def remap_timestamps(self, timestamps) -> list:
+        """
+        Maps transcription chunks from the compacted audio to the original audio.
+
+        Args:
+            timestamps (list): Chunks with a ``timestamp`` ``(start, end)`` pair; ``end`` may be None.
+
+        Returns:
+            list: Copies of the chunks with original timestamps.
+        """
+        if timestamps is None:
+            return None
+        remapped = []
+        for chunk in timestamps:
+            start, end = chunk['timestamp']
+            new_start = self.to_original(start) if start is not None else None
+            new_end = self.to_original(end, is_end=True) if end is not None else None
+            remapped.append({**chunk, 'timestamp': (new_start, new_end)})
+        return remapped
+
+    def remap_diarization(self, diarization):
+        """
+        Maps a diarization from the compacted audio to the original audio.
+
+        Args:
+            diarization (Annotation): Speaker turns on the compacted audio.
+
+        Returns:
+            Annotation: Speaker turns on the original audio, split at skipped regions.
+        """
+        if diarization is None:
+            return None
+        from pyannote.core import Annotation, Segment
+
+        remapped = Annotation(uri=diarization.uri)
+        for turn, track, speaker in diarization.itertracks(yield_label=True):
+            for index, (start, end) in enumerate(self.to_original_spans(turn.start, turn.end)):
+                remapped[Segment(start, end), track if index == 0 else f"{track}_{index}"] = speaker
+        return remapped
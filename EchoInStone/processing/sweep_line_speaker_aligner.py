@@ -0,0 +1,149 @@
+import logging
+import numpy as np
+from .speaker_aligner import SpeakerAligner
+from ..utils import SegmentStore
+
+logger = logging.getLogger(__name__)
+
+def turn_arrays(diarization) -> tuple:
+    """
+    Extracts the speaker turns of a diarization into arrays, in ``itertracks`` order.
+
+    Args:
+        diarization (Annotation): Speaker turns.
+
+    Returns:
+        tuple: ``(starts, ends, label_ids, labels)``; float64 start and end times,
+        int32 indices into the ``labels`` list.
+    """
+    labels, label_ids = [], {}
+    starts, ends, ids = [], [], []
+    for turn, _, speaker in diarization.itertracks(yield_label=True):
+        if speaker not in label_ids:
+            label_ids[speaker] = len(labels)
+            labels.append(speaker)
+        starts.append(turn.start)
+        ends.append(turn.end)
+        ids.append(label_ids[speaker])
+    return (np.array(starts, dtype=np.float64), np.array(ends, dtype=np.float64),
+            np.array(ids, dtype=np.int32), labels)
+
+def candidate_pairs(starts, ends, turn_starts, turn_ends) -> tuple:
+    """
+    Lists the (interval, turn) pairs that can overlap, grouping turns by length.
+
+    Turns are split into classes of lengths within a factor of two, each kept in start
+    order. Within a class, a turn can only overlap an interval if it starts before the
+    interval's end and less than the class's longest turn before its start, which is a
+    contiguous range found by binary search. A long turn therefore only widens the
+    search of its own class, and the number of pairs stays proportional to the number
+    of intervals and turns rather than to their product.
+
+    Args:
+        starts: Start times of the intervals.
+        ends: End times of the intervals.
+        turn_starts: Start times of the turns, in non-decreasing order.
+        turn_ends: End times of the turns.
+
+    Returns:
+        tuple: ``(intervals, turns)`` index arrays, one entry per candidate pair.
+    """
+    starts = np.asarray(starts, dtype=np.float64)
+    ends = np.asarray(ends, dtype=np.float64)
+    turn_starts = np.asarray(turn_starts, dtype=np.float64)
+    turn_ends = np.asarray(turn_ends, dtype=np.float64)
+    lengths = turn_ends - turn_starts
+    # Turns without a duration overlap nothing
+    kept = np.flatnonzero(lengths > 0)
+    exponents = np.frexp(lengths[kept])[1]
+
+    intervals, turns = [], []
+    for exponent in np.unique(exponents):
+        members = kept[exponents == exponent]
+        class_starts = turn_starts[members]
+        first = np.searchsorted(class_starts, starts - lengths[members].max(), side='right')
+        last = np.searchsorted(class_starts, ends, side='left')
+        counts = np.maximum(last - first, 0)
+        total = int(counts.sum())
+        if not total:
+            continue
+        # One row per (interval, candidate turn) pair, grouped by interval
+        group_start = np.cumsum(counts) - counts
+        intervals.append(np.repeat(np.arange(len(starts)), counts))
+        turns.append(members[np.repeat(first, counts) + np.arange(total) - np.repeat(group_start, counts)])
+    if not intervals:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(intervals), np.concatenate(turns)
+
+def assign_turns(starts, ends, turn_starts, turn_ends) -> np.ndarray:
+    """
+    Finds the turn overlapping each interval the most.
+
+    Turns must be sorted by start, as ``turn_arrays`` returns them. Only the pairs
+    returned by ``candidate_pairs`` are compared, so overlapping or very long turns
+    do not make every interval meet every turn. Ties go to the earlier turn, as in
+    ``SpeakerAligner.find_best_match``.
+
+    Args:
+        starts: Start times of the intervals.
+        ends: End times of the intervals.
+        turn_starts: Start times of the turns, in non-decreasing order.
+        turn_ends: End times of the turns.
+
+    Returns:
+        np.ndarray: Index of the best turn of each interval, -1 where no turn overlaps it.
+    """
+    starts = np.asarray(starts, dtype=np.float64)
+    ends = np.asarray(ends, dtype=np.float64)
+    best = np.full(len(starts), -1, dtype=np.int64)
+    if not len(starts) or not len(turn_starts):
+        return best
+
+    interval, turn = candidate_pairs(starts, ends, turn_starts, turn_ends)
+    overlap = np.minimum(ends[interval], turn_ends[turn]) - np.maximum(starts[interval], turn_starts[turn])
+    positive = overlap > 0
+    interval, turn, overlap = interval[positive], turn[positive], overlap[positive]
+    if not len(interval):
+        return best
+
+    # Sorted by interval, then largest overlap, then earliest turn: the first pair of an interval wins
+    order = np.lexsort((turn, -overlap, interval))
+    winning_intervals, first_pair = np.unique(interval[order], return_index=True)
+    best[winning_intervals] = turn[order][first_pair]
+    return best
+
+class SweepLineSpeakerAligner(SpeakerAligner):
+    def align(self, transcription, timestamps, diarization):
+        """Aligns the transcription with timestamps and speaker diarization.
+
+        Gives the same result as ``SpeakerAligner.align`` in O((chunks + turns) log turns),
+        instead of comparing every chunk with every turn; long or overlapping turns
+        only add the pairs they actually can overlap.
+
+        Args:
+            transcription (str): The complete text of the transcription.
+            timestamps (list | SegmentStore): Text segments with their corresponding timestamps.
+            diarization (object): Diarization object containing speaker segments.
+
+        Returns:
+            SegmentStore: Aligned segments with speaker identifiers and timestamps.
+        """
+        logger.debug("Combining transcription and diarization...")
+        turn_starts, turn_ends, label_ids, labels = turn_arrays(diarization)
+        if not len(turn_starts) or not timestamps:
+            return SegmentStore()
+
+        # Segments are sorted by start then end, so the last one has the largest start
+        last_start = turn_starts[-1]
+        last_diarization_end = float(turn_ends[turn_starts == last_start].max())
+        chunks = SegmentStore.from_chunks(timestamps)
+        chunk_ends = np.where(np.isnan(chunks.ends), last_diarization_end, chunks.ends)
+
+        best = assign_turns(chunks.starts, chunk_ends, turn_starts, turn_ends)
+        assigned = best >= 0
+        # Chunks without a speaker are dropped before merging, as in SpeakerAligner
+        segments = chunks.select(assigned)
+        segments.ends[:] = chunk_ends[assigned]
+        store_ids = np.array([segments.label_id(label) for label in labels], dtype=np.int32)
+        segments.speaker_ids[:] = store_ids[label_ids[best[assigned]]]
+        return segments.merge_consecutive()
@@ -0,0 +1,102 @@
+import re
+import argparse
+import logging
+from ..capture.audio_buffer import AudioBuffer
+from .model_registry import ModelRegistry
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_SPEECH = "tests/resources/sample_speech.wav"
+
+def normalize_words(text: str) -> list:
+    """
+    Splits a transcription into lower-case words without punctuation.
+
+    Args:
+        text (str): Transcription text.
+
+    Returns:
+        list: The normalized words.
+    """
+    return re.sub(r"[^\w\s']", " ", (text or "").lower()).split()
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """
+    Computes the word error rate of a hypothesis against a reference transcription.
+
+    Args:
+        reference (str): Reference text.
+        hypothesis (str): Text to score.
+
+    Returns:
+        float: Substitutions, deletions and insertions divided by the reference length.
+    """
+    ref, hyp = normalize_words(reference), normalize_words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    # Single-row Levenshtein distance over words
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1] / len(ref)
+
+def compare_cpu_profile(audio_path: str = SAMPLE_SPEECH, model_name: str = "openai/whisper-large-v3-turbo",
+                        chunking: str = "short", compile_encoder: bool = False, transcriber_class=None) -> dict:
+    """
+    Transcribes a file with the fp32 model and with the CPU profile and compares the results.
+
+    The models are loaded one after the other so that only one is in memory at a time.
+
+    Args:
+        audio_path (str): Speech sample to transcribe.
+        model_name (str): Whisper model to compare.
+        chunking (str): Chunking strategy used by both runs.
+        compile_encoder (bool): Whether the CPU profile also compiles the encoder.
+        transcriber_class: Transcriber class to instantiate; ``WhisperAudioTranscriber`` by default.
+
+    Returns:
+        dict: ``wer`` of the profile against fp32, both texts and both real-time factors.
+    """
+    if transcriber_class is None:
+        from .whisper_audio_transcriber import WhisperAudioTranscriber
+        transcriber_class = WhisperAudioTranscriber
+
+    audio = AudioBuffer.from_file(audio_path)
+    runs = {}
+    for name, options in (("fp32", {}), ("cpu_profile", {"cpu_profile": True, "compile_encoder": compile_encoder})):
+        # A private registry, cleared after each run, keeps the two models out of the shared one
+        registry = ModelRegistry()
+        transcriber = transcriber_class(model_name=model_name, chunking=chunking, registry=registry, **options)
+        text, _ = transcriber.transcribe(audio)
+        runs[name] = (text, transcriber.last_real_time_factor)
+        del transcriber
+        registry.clear()
+
+    report = {
+        "wer": word_error_rate(runs["fp32"][0], runs["cpu_profile"][0]),
+        "fp32_text": runs["fp32"][0],
+        "cpu_profile_text": runs["cpu_profile"][0],
+        "fp32_rtf": runs["fp32"][1],
+        "cpu_profile_rtf": runs["cpu_profile"][1],
+    }
+    logger.info(f"CPU profile WER against fp32: {report['wer']:.2%} "
+                f"(real-time factor {report['fp32_rtf']} -> {report['cpu_profile_rtf']})")
+    return report
+
+if __name__ == "__main__":
+    from ..utils import configure_logging
+
+    configure_logging(logging.INFO)
+    parser = argparse.ArgumentParser(description="Compare the Whisper CPU profile against fp32")
+    parser.add_argument("--audio", type=str, default=SAMPLE_SPEECH, help="Speech sample to transcribe")
+    parser.add_argument("--model", type=str, default="openai/whisper-large-v3-turbo", help="Whisper model to compare")
+    parser.add_argument("--chunking", choices=["short", "batched", "sequential"], default="short", help="Chunking strategy")
+    parser.add_argument("--compile_encoder", action="store_true", help="Also compile the encoder in the CPU profile")
+    parser.add_argument("--max_wer", type=float, default=0.05, help="Highest acceptable word error rate against fp32")
+    args = parser.parse_args()
+
+    result = compare_cpu_profile(args.audio, args.model, args.chunking, args.compile_encoder)
+    raise SystemExit(0 if result["wer"] <= args.max_wer else 1)
@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+from ..capture.audio_buffer import AudioBuffer
+
+class VoiceActivityDetectorInterface(ABC):
+    @abstractmethod
+    def detect(self, audio: AudioBuffer):
+        """Finds the regions of the audio that contain speech.
+
+        Args:
+            audio (AudioBuffer): The decoded audio.
+
+        Returns:
+            SpeechTimeline: The speech regions, in seconds on the original timeline.
+        """
+        pass
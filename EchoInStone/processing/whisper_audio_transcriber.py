@@ -1,18 +1,68 @@
-import torch
+import time
 import logging
-from transformers import AutoModelForSpeechSeq2Seq, AutoProcessor, pipeline
+import numpy as np
+from contextlib import nullcontext
+from typing import Union
 from .audio_transcriber_interface import AudioTranscriberInterface
-from EchoInStone.utils import timer, log_time
+from ..capture.audio_buffer import AudioBuffer
+from .model_registry import ModelRegistry, default_registry
+from .assisted_decoding_monitor import AssistedDecodingMonitor
+from EchoInStone.utils import timer, log_time, SegmentStore
 
 logger = logging.getLogger(__name__)
 
+# Pipeline options of each chunking strategy
+CHUNKING_STRATEGIES = {
+    # 5 s windows with 1 s strides, decoded one at a time
+    "short": {"chunk_length_s": 5, "stride_length_s": (1, 1)},
+    # Full 30 s windows with the pipeline's default stride, decoded batch_size at a time
+    "batched": {"chunk_length_s": 30},
+    # No chunking: Whisper's own sequential long-form decoding, each window seeded by the previous text
+    "sequential": {},
+}
+
 class WhisperAudioTranscriber(AudioTranscriberInterface):
-    def __init__(self, model_name="openai/whisper-large-v3-turbo"):
+    def __init__(self, model_name="openai/whisper-large-v3-turbo", batch_size=8, segment_padding_s=0.2, chunking="short",
+                 cpu_profile=False, compile_encoder=False, registry: ModelRegistry = None, assistant_model_name=None,
+                 word_timestamps=False):
         """Initialize the WhisperAudioTranscriber with the specified model.
 
         Args:
             model_name (str): The name of the model to use for transcription.
+            batch_size (int): Number of windows or speaker segments decoded together.
+            segment_padding_s (float): Audio context added on both sides of every speaker segment.
+            chunking (str): Long-audio strategy, one of ``CHUNKING_STRATEGIES``:
+                ``"short"`` (5 s windows), ``"batched"`` (30 s windows decoded in batches)
+                or ``"sequential"`` (long-form 30 s decoding).
+            cpu_profile (bool): On CPU, use SDPA attention, int8 dynamic quantization of the
+                linear layers and ``torch.inference_mode``. Ignored on GPU.
+            compile_encoder (bool): With ``cpu_profile``, also ``torch.compile`` the encoder.
+            registry (ModelRegistry): Registry sharing loaded models; the process-wide one by default.
+                The model is loaded on the first transcription, not here.
+            assistant_model_name (str): Smaller Whisper checkpoint drafting tokens for assisted
+                (speculative) decoding. It must share the main model's tokenizer and feature
+                extractor, e.g. ``openai/whisper-large-v3-turbo`` for ``openai/whisper-large-v3``.
+                Decoding is then greedy and the output identical to the main model's greedy output.
+            word_timestamps (bool): Emit one timestamped chunk per word instead of per sentence,
+                for word-level speaker assignment with ``WordSpeakerAligner``.
         """
+        if chunking not in CHUNKING_STRATEGIES:
+            raise ValueError(f"Unknown chunking strategy {chunking!r}, expected one of {sorted(CHUNKING_STRATEGIES)}")
+        if assistant_model_name and chunking == "batched":
+            raise ValueError("Assisted decoding works one window at a time; use short or sequential chunking")
+        self.batch_size = batch_size
+        self.segment_padding_s = segment_padding_s
+        self.chunking = chunking
+        self.assistant_model_name = assistant_model_name
+        # Word timestamps come from the cross-attention alignment heads
+        self.return_timestamps = "word" if word_timestamps else True
+        self.last_real_time_factor = None
+        self.last_decoding_monitor = None
+
+        # torch and transformers are imported here rather than at module level so that
+        # importing the processing package stays cheap
+        import torch
+
         # Configure the device for computation
         if torch.cuda.is_available():
             self.device = "cuda:0"
@@ -24,57 +74,321 @@ class WhisperAudioTranscriber(AudioTranscriberInterface):
             self.device = "cpu"
             self.torch_dtype = torch.float32
 
-        logger.info(f"Using device: {self.device} with dtype: {self.torch_dtype}")
+        self.cpu_profile = cpu_profile and self.device == "cpu"
+        if cpu_profile and not self.cpu_profile:
+            logger.warning(f"CPU profile requested but running on {self.device}, ignoring it.")
+        logger.info(f"Using device: {self.device} with dtype: {self.torch_dtype}"
+                    + (" (CPU profile: sdpa, int8 dynamic quantization)" if self.cpu_profile else ""))
+
+        self.model_name = model_name
+        self.compile_encoder = compile_encoder
+        self.registry = registry if registry is not None else default_registry
+        variant = ("int8+compiled" if compile_encoder else "int8") if self.cpu_profile else "default"
+        self.model_key = ("whisper", model_name, self.device, str(self.torch_dtype), variant)
+        self.assistant_key = ("whisper-assistant", assistant_model_name, self.device, str(self.torch_dtype)) if assistant_model_name else None
+        # Set to use a ready-made pipeline instead of the shared model
+        self._pipe = None
+
+    def _load_model(self) -> tuple:
+        from transformers import AutoModelForSpeechSeq2Seq, AutoProcessor
 
-        # Load the model and processor
         try:
-            self.model = AutoModelForSpeechSeq2Seq.from_pretrained(
-                model_name,
+            model = AutoModelForSpeechSeq2Seq.from_pretrained(
+                self.model_name,
                 torch_dtype=self.torch_dtype,
                 low_cpu_mem_usage=True,
                 use_safetensors=True,
+                **({"attn_implementation": "sdpa"} if self.cpu_profile else {}),
             )
-            self.model.to(self.device)
+            model.to(self.device)
+            if self.cpu_profile:
+                model = self.apply_cpu_profile(model, self.compile_encoder)
+
+            processor = AutoProcessor.from_pretrained(self.model_name)
+            return model, processor
+        except Exception as e:
+            logger.error(f"Error loading the transcription model: {e}")
+            raise
 
-            self.processor = AutoProcessor.from_pretrained(model_name)
+    def _load_assistant(self):
+        from transformers import AutoModelForSpeechSeq2Seq
 
-            # Configure the pipeline for automatic speech recognition
-            self.pipe = pipeline(
-                "automatic-speech-recognition",
-                model=self.model,
-                tokenizer=self.processor.tokenizer,
-                feature_extractor=self.processor.feature_extractor,
+        try:
+            assistant = AutoModelForSpeechSeq2Seq.from_pretrained(
+                self.assistant_model_name,
                 torch_dtype=self.torch_dtype,
-                device=self.device,
-                #model_kwargs={"attn_implementation": "sdpa"},
-                return_timestamps=True,  # or "word"
-                #batch_size=24,
-                generate_kwargs={"max_new_tokens": 400},
-                chunk_length_s=5,
-                stride_length_s=(1, 1),
+                low_cpu_mem_usage=True,
+                use_safetensors=True,
             )
-            logger.info("Transcription model and pipeline loaded successfully.")
+            assistant.to(self.device)
+            return assistant
         except Exception as e:
-            logger.error(f"Error loading the transcription model: {e}")
+            logger.error(f"Error loading the draft model: {e}")
             raise
 
+    @property
+    def assistant_model(self):
+        """The draft model of assisted decoding, or None if it is not enabled."""
+        if self.assistant_key is None:
+            return None
+        return self.registry.get(self.assistant_key, self._load_assistant)
+
+    def generate_kwargs(self) -> dict:
+        """Return the generation options passed to the pipeline.
+
+        Returns:
+            dict: Keyword arguments for ``model.generate``.
+        """
+        options = {"max_new_tokens": 400}
+        if self.assistant_key is not None:
+            # Greedy verification keeps the output identical to the main model alone
+            options.update(assistant_model=self.assistant_model, num_beams=1, do_sample=False)
+        return options
+
+    @property
+    def model(self):
+        """The Whisper model, loaded on first use and shared through the registry."""
+        return self.registry.get(self.model_key, self._load_model)[0]
+
+    @property
+    def processor(self):
+        """The Whisper processor, loaded together with the model."""
+        return self.registry.get(self.model_key, self._load_model)[1]
+
+    @property
+    def pipe(self):
+        """The ASR pipeline around the shared model.
+
+        The pipeline is rebuilt on access instead of being kept, so that the
+        registry can release an idle model; building it around a loaded model is cheap.
+        """
+        if self._pipe is not None:
+            return self._pipe
+        from transformers import pipeline
+
+        model, processor = self.registry.get(self.model_key, self._load_model)
+        # Configure the pipeline for automatic speech recognition
+        return pipeline(
+            "automatic-speech-recognition",
+            model=model,
+            tokenizer=processor.tokenizer,
+            feature_extractor=processor.feature_extractor,
+            torch_dtype=self.torch_dtype,
+            device=self.device,
+            return_timestamps=self.return_timestamps,
+            generate_kwargs=self.generate_kwargs(),
+            **self.pipeline_options(),
+        )
+
+    @pipe.setter
+    def pipe(self, value):
+        self._pipe = value
+
+    @staticmethod
+    def apply_cpu_profile(model, compile_encoder=False):
+        """Quantize the linear layers of a model to int8 and optionally compile its encoder.
+
+        Args:
+            model: The Whisper model, on CPU.
+            compile_encoder (bool): Whether to ``torch.compile`` the encoder.
+
+        Returns:
+            The quantized model, or the model in full precision if this torch release
+            no longer provides ``torch.ao.quantization``.
+        """
+        import torch
+
+        model.eval()
+        try:
+            # Weights are stored in int8, activations are quantized on the fly
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        except (ImportError, AttributeError) as e:
+            # torch.ao.quantization is deprecated and due to be removed in torch 2.10
+            logger.warning(f"int8 dynamic quantization is not available in torch {torch.__version__}, "
+                           f"keeping the CPU profile without it: {e}")
+        if compile_encoder:
+            try:
+                model.get_encoder().compile()
+                logger.info("Whisper encoder compiled.")
+            except Exception as e:
+                logger.warning(f"Could not compile the encoder, running it eagerly: {e}")
+        return model
+
+    def _inference(self):
+        if not self.cpu_profile:
+            return nullcontext()
+        import torch
+
+        # inference_mode also skips the version counters that no_grad still maintains
+        return torch.inference_mode()
+
+    def pipeline_options(self) -> dict:
+        """Return the pipeline options of the selected chunking strategy.
+
+        Returns:
+            dict: Keyword arguments for the ASR pipeline.
+        """
+        options = dict(CHUNKING_STRATEGIES[self.chunking])
+        if self.chunking == "batched":
+            options["batch_size"] = self.batch_size
+        return options
+
+    def _decoding_monitor(self):
+        if self.assistant_key is None:
+            return nullcontext()
+        return AssistedDecodingMonitor(self.model, self.assistant_model, self.processor.tokenizer)
+
+    def _log_decoding(self, monitor, texts):
+        if monitor is None:
+            return
+        for text in texts:
+            monitor.add_text(text)
+        monitor.log()
+        self.last_decoding_monitor = monitor
+
+    def _log_real_time_factor(self, label: str, elapsed: float, audio_seconds: float):
+        self.last_real_time_factor = elapsed / audio_seconds if audio_seconds > 0 else None
+        if self.last_real_time_factor is not None:
+            logger.info(f"{label} real-time factor: {self.last_real_time_factor:.3f} "
+                        f"({elapsed:.1f}s for {audio_seconds:.1f}s of audio)")
+
     @timer
-    def transcribe(self, audio_path: str) -> tuple:
-        """Transcribe audio from the given file path.
+    def transcribe(self, audio: Union[str, AudioBuffer]) -> tuple:
+        """Transcribe audio from the given file path or decoded audio buffer.
 
         Args:
-            audio_path (str): Path to the audio file to transcribe.
+            audio (str | AudioBuffer): Path to the audio file, or audio already decoded in memory.
 
         Returns:
             tuple: A tuple containing the transcription text and timestamps.
         """
         try:
-            # Perform transcription with timestamps
-            result = self.pipe(audio_path)
+            if not isinstance(audio, AudioBuffer):
+                audio = AudioBuffer.from_file(audio)
+            started = time.perf_counter()
+            with self._decoding_monitor() as monitor, self._inference():
+                # Raw samples skip the pipeline's own ffmpeg decode and resample
+                result = self.pipe(audio.to_pipeline_input())
+            self._log_real_time_factor(f"Transcription ({self.chunking} chunking)", time.perf_counter() - started, audio.duration)
             transcription = result['text']
+            self._log_decoding(monitor, [transcription])
             timestamps = result['chunks']
-            logger.info(f"Successfully transcribed: {audio_path}")
+            logger.info(f"Successfully transcribed: {audio}")
             return transcription, timestamps
         except Exception as e:
             logger.error(f"Error during transcription: {e}")
             return None, None
+
+    def transcribe_stream(self, audio: Union[str, AudioBuffer], window_s: float = 30.0):
+        """Transcribe audio window by window, yielding chunks as each window is decoded.
+
+        Files are read incrementally, so at most two windows of samples are held in
+        memory. The last chunk of a window may be cut by the window edge; it is not
+        yielded and its audio is decoded again at the start of the next window.
+
+        Args:
+            audio (str | AudioBuffer): Path to the audio file, or audio already decoded in memory.
+            window_s (float): Length of the decoded windows; Whisper windows are 30 s.
+
+        Yields:
+            dict: ``{'timestamp': (start, end), 'text': ...}`` chunks on the timeline of the whole audio.
+        """
+        if isinstance(audio, AudioBuffer):
+            sample_rate = audio.sample_rate
+            step = max(1, int(window_s * sample_rate))
+            blocks = (audio.samples[first:first + step] for first in range(0, len(audio.samples), step))
+        else:
+            sample_rate = 16000
+            blocks = AudioBuffer.stream_file(audio, block_s=window_s, sample_rate=sample_rate)
+        window_samples = max(1, int(window_s * sample_rate))
+
+        pending = np.zeros(0, dtype=np.float32)
+        offset = 0.0
+        decoded_seconds = 0.0
+        started = time.perf_counter()
+        try:
+            pipe = self.pipe
+            for block in blocks:
+                pending = np.concatenate([pending, block])
+                while len(pending) >= window_samples:
+                    chunks, consumed = self._decode_window(pipe, pending[:window_samples], sample_rate, offset, final=False)
+                    decoded_seconds += window_samples / sample_rate
+                    pending = pending[consumed:]
+                    offset += consumed / sample_rate
+                    yield from chunks
+            if len(pending):
+                chunks, _ = self._decode_window(pipe, pending, sample_rate, offset, final=True)
+                decoded_seconds += len(pending) / sample_rate
+                yield from chunks
+        except Exception as e:
+            logger.error(f"Error during streaming transcription: {e}")
+            return
+        self._log_real_time_factor("Streaming transcription", time.perf_counter() - started, offset + len(pending) / sample_rate)
+        logger.info(f"Streamed transcription of {audio} ({decoded_seconds:.1f}s of audio decoded).")
+
+    def _decode_window(self, pipe, samples, sample_rate, offset, final):
+        with self._inference():
+            result = pipe({"raw": samples, "sampling_rate": sample_rate}, chunk_length_s=0,
+                          return_timestamps=self.return_timestamps)
+        chunks = result.get('chunks') or []
+        duration = len(samples) / sample_rate
+        consumed = len(samples)
+        if not final and len(chunks) > 1:
+            cut = chunks[-1]['timestamp'][0]
+            if cut is not None and 0 < cut < duration:
+                chunks = chunks[:-1]
+                consumed = int(cut * sample_rate)
+
+        shifted = []
+        for chunk in chunks:
+            start, end = chunk['timestamp']
+            start = 0.0 if start is None else start
+            end = duration if end is None else end
+            shifted.append({'timestamp': (offset + start, offset + end), 'text': chunk['text']})
+        return shifted, consumed
+
+    @timer
+    def transcribe_segments(self, audio: Union[str, AudioBuffer], segments) -> SegmentStore:
+        """Transcribe speaker segments in batches, one text per segment.
+
+        Each segment is a single Whisper window, so the pipeline runs without
+        chunking or stride overlap and the speaker of every text is known up front.
+
+        Args:
+            audio (str | AudioBuffer): Path to the audio file, or audio already decoded in memory.
+            segments (list): ``(start, end, speaker)`` segments in seconds, each at most 30 s long.
+
+        Returns:
+            SegmentStore: ``(speaker, start, end, text)`` segments in segment order, or None if transcription fails.
+        """
+        try:
+            if not isinstance(audio, AudioBuffer):
+                audio = AudioBuffer.from_file(audio)
+            rate = audio.sample_rate
+            padding = int(self.segment_padding_s * rate)
+            # Longest first, so each batch decodes segments of similar length
+            order = sorted(range(len(segments)), key=lambda i: segments[i][1] - segments[i][0], reverse=True)
+            inputs = []
+            for i in order:
+                start, end, _ = segments[i]
+                first = max(0, int(start * rate) - padding)
+                last = min(len(audio.samples), int(end * rate) + padding)
+                inputs.append({"raw": audio.samples[first:last], "sampling_rate": rate})
+
+            # Assisted generation drafts for one sequence at a time
+            batch_size = 1 if self.assistant_key is not None else self.batch_size
+            started = time.perf_counter()
+            with self._decoding_monitor() as monitor, self._inference():
+                outputs = self.pipe(inputs, batch_size=batch_size, chunk_length_s=0, return_timestamps=False) if inputs else []
+            self._log_real_time_factor("Segment transcription", time.perf_counter() - started,
+                                       sum(end - start for start, end, _ in segments))
+            self._log_decoding(monitor, [output['text'] for output in outputs])
+
+            texts = [None] * len(segments)
+            for i, output in zip(order, outputs):
+                texts[i] = output['text']
+            logger.info(f"Transcribed {len(segments)} speaker segments in batches of {batch_size}.")
+            return SegmentStore.from_segments((speaker, start, end, text) for (start, end, speaker), text in zip(segments, texts))
+        except Exception as e:
+            logger.error(f"Error during segment transcription: {e}")
+            return None
@@ -0,0 +1,53 @@
+import logging
+import numpy as np
+from .aligner_interface import AlignerInterface
+from .sweep_line_speaker_aligner import turn_arrays, assign_turns
+from ..utils import SegmentStore
+
+logger = logging.getLogger(__name__)
+
+class WordSpeakerAligner(AlignerInterface):
+    def align(self, transcription, timestamps, diarization):
+        """Assigns every word to a speaker and groups consecutive words of a speaker.
+
+        Meant for word-level timestamps: a sentence spanning a speaker change is split
+        at the change instead of going entirely to one speaker. All words are matched
+        with the diarization turns in one vectorized pass. Words overlapping no turn,
+        such as words in a pause or with a zero duration, take the speaker of the
+        previous word.
+
+        Args:
+            transcription (str): The complete text of the transcription.
+            timestamps (list | SegmentStore): Word chunks with their corresponding timestamps.
+            diarization (object): Diarization object containing speaker segments.
+
+        Returns:
+            SegmentStore: Aligned segments with speaker identifiers and timestamps.
+        """
+        logger.debug("Assigning words to speakers...")
+        turn_starts, turn_ends, label_ids, labels = turn_arrays(diarization)
+        if not len(turn_starts) or not timestamps:
+            return SegmentStore()
+
+        last_diarization_end = float(turn_ends[turn_starts == turn_starts[-1]].max())
+        words = SegmentStore.from_chunks(timestamps)
+        if words is timestamps:
+            # Speakers and end times are written below; the caller's store is left as it is
+            words = words.copy()
+        ends = words.ends
+        ends[np.isnan(ends)] = last_diarization_end
+
+        best = assign_turns(words.starts, ends, turn_starts, turn_ends)
+        assigned = best >= 0
+        if not assigned.any():
+            return SegmentStore()
+        # Forward-fill from the previous assigned word; leading words take the first assigned one
+        source = np.maximum.accumulate(np.where(assigned, np.arange(len(words)), -1))
+        source[source < 0] = np.argmax(assigned)
+        store_ids = np.array([words.label_id(label) for label in labels], dtype=np.int32)
+        words.speaker_ids[:] = store_ids[label_ids[best[source]]]
+
+        # Consecutive words of a speaker become one segment, their texts joined without copying
+        segments = words.merge_consecutive()
+        logger.debug(f"Assigned {len(words)} words to {len(segments)} speaker segments.")
+        return segments
@@ -1,10 +1,22 @@
-from .logging_config import configure_logging
-from .timer import timer, log_time
-from .data_saver import DataSaver
-
-__all__ = [
-    'configure_logging',
-    'timer',
-    'log_time',
-    'DataSaver'
-]
+# Attributes are imported on first access (PEP 562)
+import importlib
+
+_LAZY_ATTRIBUTES = {
+    'configure_logging': '.logging_config',
+    'timer': '.timer',
+    'log_time': '.timer',
+    'DataSaver': '.data_saver',
+    'SegmentStore': '.segment_store',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
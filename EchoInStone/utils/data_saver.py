@@ -1,6 +1,8 @@
 import os
 import json
 import logging
+import textwrap
+from .segment_store import SegmentStore
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +22,7 @@ class DataSaver:
 
         Args:
             filename (str): The name of the file to save the data.
-            data: The data to be saved. Can be a dictionary, list, or string.
+            data: The data to be saved. Can be a dictionary, list, SegmentStore, or string.
         """
         # Create the output directory if it doesn't exist
         os.makedirs(self.output_dir, exist_ok=True)
@@ -30,10 +32,25 @@ class DataSaver:
 
         try:
             with open(file_path, 'w', encoding='utf-8') as file:
-                if isinstance(data, (list, dict)):
+                if isinstance(data, SegmentStore):
+                    self._write_segments(file, data)
+                elif isinstance(data, (list, dict)):
                     json.dump(data, file, ensure_ascii=False, indent=4)
                 else:
                     file.write(str(data))
             logger.info(f"Data saved to {file_path}")
         except Exception as e:
             logger.error(f"Error saving data: {e}")
+
+    @staticmethod
+    def _write_segments(file, segments: SegmentStore):
+        # Same JSON as a list of tuples, written row by row instead of building the list first
+        if not len(segments):
+            file.write("[]")
+            return
+        file.write("[\n")
+        for index, segment in enumerate(segments):
+            if index:
+                file.write(",\n")
+            file.write(textwrap.indent(json.dumps(list(segment), ensure_ascii=False, indent=4), "    "))
+        file.write("\n]")
@@ -0,0 +1,385 @@
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class SegmentStore:
+    def __init__(self, capacity: int = 0):
+        """
+        Initializes an empty columnar store of timestamped text segments.
+
+        Segments are kept as columns instead of one tuple or dict each: float64 start
+        and end times, an int32 index into a shared speaker label table, and the UTF-8
+        text of every segment back to back in one buffer with an offset array. Rows
+        read back as ``(speaker, start, end, text)`` tuples, so the store can replace
+        the lists of tuples produced by the aligners. A missing end time is stored as
+        NaN and a missing speaker as -1; both read back as None.
+
+        Slices and merged stores share the arrays, the text buffer and the label
+        table of the store they come from, and copy them on their first write.
+
+        Args:
+            capacity (int): Number of segments to reserve room for.
+        """
+        self.labels = []
+        self._label_ids = {}
+        self._count = 0
+        self._starts = np.zeros(capacity, dtype=np.float64)
+        self._ends = np.zeros(capacity, dtype=np.float64)
+        self._speakers = np.zeros(capacity, dtype=np.int32)
+        # Text of segment i is _text[_offsets[i]:_offsets[i + 1]]
+        self._offsets = np.zeros(capacity + 1, dtype=np.int64)
+        self._text = bytearray()
+        self._shared = False
+        self._shared_labels = False
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        """
+        Builds a store from transcription chunks.
+
+        Args:
+            chunks (list): ``{'timestamp': (start, end), 'text': ...}`` chunks; ``end`` may be None.
+                A store is returned as is.
+
+        Returns:
+            SegmentStore: One segment without speaker per chunk.
+        """
+        if isinstance(chunks, SegmentStore):
+            return chunks
+        chunks = list(chunks or [])
+        count = len(chunks)
+        store = cls(count)
+        store._starts[:] = np.fromiter((chunk['timestamp'][0] for chunk in chunks), dtype=np.float64, count=count)
+        store._ends[:] = np.fromiter((np.nan if chunk['timestamp'][1] is None else chunk['timestamp'][1]
+                                      for chunk in chunks), dtype=np.float64, count=count)
+        store._speakers[:] = -1
+        store._set_texts([chunk['text'] for chunk in chunks])
+        return store
+
+    @classmethod
+    def from_segments(cls, segments):
+        """
+        Builds a store from aligned segments.
+
+        Args:
+            segments (list): ``(speaker, start, end, text)`` tuples. A store is returned as is.
+
+        Returns:
+            SegmentStore: The segments in the same order.
+        """
+        if isinstance(segments, SegmentStore):
+            return segments
+        segments = list(segments or [])
+        count = len(segments)
+        store = cls(count)
+        store._starts[:] = np.fromiter((segment[1] for segment in segments), dtype=np.float64, count=count)
+        store._ends[:] = np.fromiter((np.nan if segment[2] is None else segment[2] for segment in segments),
+                                     dtype=np.float64, count=count)
+        store._speakers[:] = np.fromiter((store.label_id(segment[0]) for segment in segments), dtype=np.int32, count=count)
+        store._set_texts([segment[3] for segment in segments])
+        return store
+
+    def _set_texts(self, texts):
+        encoded = [text.encode('utf-8') for text in texts]
+        self._offsets[1:len(encoded) + 1] = np.cumsum([len(data) for data in encoded], dtype=np.int64)
+        self._text = bytearray(b"".join(encoded))
+        self._count = len(encoded)
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self._row(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            first, last, step = index.indices(self._count)
+            if step != 1:
+                raise ValueError("SegmentStore slices must be contiguous")
+            return self._view(first, max(first, last))
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("segment index out of range")
+        return self._row(index)
+
+    def __eq__(self, other):
+        if not isinstance(other, (SegmentStore, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(row == tuple(segment) for row, segment in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"SegmentStore(segments={self._count}, speakers={len(self.labels)}, text_bytes={self.text_bytes})"
+
+    @property
+    def starts(self) -> np.ndarray:
+        """np.ndarray: Start times in seconds; a view, not a copy."""
+        return self._starts[:self._count]
+
+    @property
+    def ends(self) -> np.ndarray:
+        """np.ndarray: End times in seconds, NaN where unknown; a view, not a copy."""
+        return self._ends[:self._count]
+
+    @property
+    def speaker_ids(self) -> np.ndarray:
+        """np.ndarray: Index of every speaker in ``labels``, -1 where unknown; a view, not a copy."""
+        return self._speakers[:self._count]
+
+    @property
+    def text_bytes(self) -> int:
+        """int: Size of the UTF-8 text of the segments."""
+        return int(self._offsets[self._count] - self._offsets[0])
+
+    @property
+    def nbytes(self) -> int:
+        """int: Memory held by the columns and the text of the segments."""
+        return (self.starts.nbytes + self.ends.nbytes + self.speaker_ids.nbytes
+                + self._offsets[:self._count + 1].nbytes + self.text_bytes)
+
+    def label_id(self, label) -> int:
+        """
+        Finds the index of a speaker label, adding it to the label table if needed.
+
+        Args:
+            label (str): Speaker label; None for no speaker.
+
+        Returns:
+            int: Index in ``labels``, or -1 for None.
+        """
+        if label is None:
+            return -1
+        index = self._label_ids.get(label)
+        if index is None:
+            self._own_labels()
+            index = len(self.labels)
+            self._label_ids[label] = index
+            self.labels.append(label)
+        return index
+
+    def text(self, index: int) -> str:
+        """
+        Decodes the text of one segment.
+
+        Args:
+            index (int): Position of the segment.
+
+        Returns:
+            str: Text of the segment.
+        """
+        return self._text[self._offsets[index]:self._offsets[index + 1]].decode('utf-8')
+
+    def _row(self, index):
+        speaker = self._speakers[index]
+        end = self._ends[index]
+        return (self.labels[speaker] if speaker >= 0 else None, float(self._starts[index]),
+                None if np.isnan(end) else float(end), self.text(index))
+
+    def _view(self, first, last):
+        view = SegmentStore.__new__(SegmentStore)
+        view.labels = self.labels
+        view._label_ids = self._label_ids
+        view._count = last - first
+        view._starts = self._starts[first:last]
+        view._ends = self._ends[first:last]
+        view._speakers = self._speakers[first:last]
+        view._offsets = self._offsets[first:last + 1]
+        view._text = self._text
+        view._shared = True
+        view._shared_labels = True
+        return view
+
+    def _own_labels(self):
+        """Copies a shared label table before adding to it."""
+        if self._shared_labels:
+            self.labels = list(self.labels)
+            self._label_ids = dict(self._label_ids)
+            self._shared_labels = False
+
+    def _own(self, extra):
+        """Copies shared columns, text and labels before writing, and makes room for ``extra`` segments."""
+        self._own_labels()
+        if self._shared:
+            first, last = self._offsets[0], self._offsets[self._count]
+            self._text = bytearray(self._text[first:last])
+            self._offsets = self._offsets[:self._count + 1] - first
+            self._starts = self._starts[:self._count].copy()
+            self._ends = self._ends[:self._count].copy()
+            self._speakers = self._speakers[:self._count].copy()
+            self._shared = False
+        needed = self._count + extra
+        if needed > len(self._starts):
+            # Capacity doubles so that appends stay amortized O(1)
+            capacity = max(16, 2 * len(self._starts), needed)
+            self._starts = np.resize(self._starts, capacity)
+            self._ends = np.resize(self._ends, capacity)
+            self._speakers = np.resize(self._speakers, capacity)
+            self._offsets = np.resize(self._offsets, capacity + 1)
+
+    def append(self, speaker, start: float, end: float, text: str):
+        """
+        Adds a segment at the end of the store.
+
+        Args:
+            speaker (str): Speaker label, or None.
+            start (float): Start time in seconds.
+            end (float): End time in seconds, or None.
+            text (str): Text of the segment.
+        """
+        self._own(1)
+        index = self._count
+        data = text.encode('utf-8')
+        self._starts[index] = start
+        self._ends[index] = np.nan if end is None else end
+        self._speakers[index] = self.label_id(speaker)
+        self._text += data
+        self._offsets[index + 1] = self._offsets[index] + len(data)
+        self._count += 1
+
+    def extend(self, segments):
+        """
+        Adds several segments at the end of the store.
+
+        The columns of another store are copied in one pass, with its speaker
+        labels mapped to this store's label table.
+
+        Args:
+            segments: A SegmentStore or ``(speaker, start, end, text)`` tuples.
+        """
+        if not isinstance(segments, SegmentStore):
+            for segment in segments:
+                self.append(*segment)
+            return
+        other = segments
+        count = len(other)
+        # The other store may be a view of this one; read its columns before reallocating
+        starts, ends, speakers = other.starts.copy(), other.ends.copy(), other.speaker_ids.copy()
+        offsets = other._offsets[:count + 1] - other._offsets[0]
+        text = bytes(other._text[other._offsets[0]:other._offsets[count]])
+        mapping = np.array([self.label_id(label) for label in other.labels] + [-1], dtype=np.int32)
+
+        self._own(count)
+        first = self._count
+        self._starts[first:first + count] = starts
+        self._ends[first:first + count] = ends
+        # -1 indexes the trailing -1 of the mapping
+        self._speakers[first:first + count] = mapping[speakers]
+        self._offsets[first + 1:first + count + 1] = self._offsets[first] + offsets[1:]
+        self._text += text
+        self._count += count
+
+    def copy(self) -> "SegmentStore":
+        """
+        Copies the store.
+
+        Returns:
+            SegmentStore: A store with its own columns, text and label table.
+        """
+        store = self._view(0, self._count)
+        store._own(0)
+        return store
+
+    def select(self, keep) -> "SegmentStore":
+        """
+        Copies a subset of the segments.
+
+        Args:
+            keep: Boolean mask over the segments, or their positions in order.
+
+        Returns:
+            SegmentStore: A new store with the selected segments.
+        """
+        keep = np.asarray(keep)
+        positions = np.flatnonzero(keep) if keep.dtype == bool else keep.astype(np.int64)
+        count = len(positions)
+        store = SegmentStore(count)
+        store.labels = list(self.labels)
+        store._label_ids = dict(self._label_ids)
+        store._starts[:] = self._starts[positions]
+        store._ends[:] = self._ends[positions]
+        store._speakers[:] = self._speakers[positions]
+
+        lengths = self._offsets[positions + 1] - self._offsets[positions]
+        store._offsets[1:] = np.cumsum(lengths)
+        total = int(store._offsets[count])
+        if total:
+            # Byte positions of every selected text, gathered in one indexing pass
+            sources = np.repeat(self._offsets[positions] - store._offsets[:count], lengths) + np.arange(total)
+            store._text = bytearray(np.frombuffer(self._text, dtype=np.uint8)[sources].tobytes())
+        store._count = count
+        return store
+
+    def merge_consecutive(self) -> "SegmentStore":
+        """
+        Merges consecutive segments of the same speaker.
+
+        A merged segment spans from the start of its first segment to the end of its
+        last one. Its text is the texts joined in order, which already lie next to
+        each other in the text buffer, so the result shares it without copying.
+
+        Returns:
+            SegmentStore: The merged segments.
+        """
+        if not self._count:
+            return self._view(0, 0)
+        speakers = self.speaker_ids
+        changes = np.flatnonzero(speakers[1:] != speakers[:-1]) + 1
+        firsts = np.concatenate(([0], changes))
+        lasts = np.concatenate((changes, [self._count])) - 1
+
+        merged = SegmentStore.__new__(SegmentStore)
+        merged.labels = self.labels
+        merged._label_ids = self._label_ids
+        merged._count = len(firsts)
+        merged._starts = self._starts[firsts]
+        merged._ends = self._ends[lasts]
+        merged._speakers = self._speakers[firsts]
+        merged._offsets = self._offsets[np.concatenate((firsts, [self._count]))]
+        merged._text = self._text
+        merged._shared = True
+        merged._shared_labels = True
+        return merged
+
+    def between(self, start: float, end: float) -> "SegmentStore":
+        """
+        Finds the segments overlapping a time range.
+
+        Segments must be sorted by start time, as transcripts are. The result is a
+        view sharing the columns and the text of this store. Unknown end times
+        count as open-ended.
+
+        Args:
+            start (float): Start of the range in seconds.
+            end (float): End of the range in seconds.
+
+        Returns:
+            SegmentStore: The contiguous run of segments starting before ``end`` and
+            ending after ``start``.
+        """
+        # Running maximum of the end times, so that one binary search finds the first overlap
+        reach = np.maximum.accumulate(np.where(np.isnan(self.ends), np.inf, self.ends))
+        first = int(np.searchsorted(reach, start, side='right'))
+        last = int(np.searchsorted(self.starts, end, side='left'))
+        return self._view(first, max(first, last))
+
+    def to_list(self) -> list:
+        """
+        Converts the store to tuples.
+
+        Returns:
+            list: ``(speaker, start, end, text)`` tuples.
+        """
+        return list(self)
+
+    def to_chunks(self) -> list:
+        """
+        Converts the store to transcription chunks.
+
+        Returns:
+            list: ``{'timestamp': (start, end), 'text': ...}`` chunks.
+        """
+        return [{'timestamp': (start, end), 'text': text} for _, start, end, text in self]
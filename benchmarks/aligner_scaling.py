@@ -0,0 +1,79 @@
+"""Scaling benchmark of the speaker aligners.
+
+Times the sweep-line assignment on turn arrays up to 10^6 turns, the full
+``SweepLineSpeakerAligner.align`` on pyannote annotations, and the reference
+``SpeakerAligner`` on the sizes it can handle, checking that both give the same output.
+
+    poetry run python benchmarks/aligner_scaling.py --max_turns 1000000
+"""
+import time
+import argparse
+import numpy as np
+from pyannote.core import Annotation, Segment
+from EchoInStone.processing.speaker_aligner import SpeakerAligner
+from EchoInStone.processing.sweep_line_speaker_aligner import SweepLineSpeakerAligner, assign_turns
+
+
+def synthetic_turns(turns: int, seed: int = 0) -> tuple:
+    """Back-to-back turns of 0.5-6 s with occasional overlapping speech."""
+    rng = np.random.default_rng(seed)
+    lengths = rng.uniform(0.5, 6.0, turns)
+    starts = np.concatenate([[0.0], np.cumsum(lengths)[:-1]])
+    ends = starts + lengths + np.where(rng.random(turns) < 0.1, rng.uniform(0.0, 1.5, turns), 0.0)
+    labels = rng.integers(0, 4, turns)
+    return np.round(starts, 3), np.round(ends, 3), labels
+
+
+def whisper_chunks(duration: float, chunk_s: float = 5.0) -> list:
+    """Contiguous chunks as produced with ``chunk_length_s=5``."""
+    return [{'timestamp': (float(start), float(start) + chunk_s), 'text': " word"}
+            for start in np.arange(0.0, duration, chunk_s)]
+
+
+def to_annotation(starts, ends, labels) -> Annotation:
+    annotation = Annotation()
+    for index, (start, end, label) in enumerate(zip(starts.tolist(), ends.tolist(), labels.tolist())):
+        annotation[Segment(start, end), index] = f"SPEAKER_{label:02d}"
+    return annotation
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def main(max_turns: int, annotation_max: int, reference_max: int):
+    print(f"{'turns':>9} {'chunks':>8} {'assign_turns':>13} {'sweep align':>12} {'reference':>10} {'identical':>9}")
+    turns = 1000
+    while turns <= max_turns:
+        starts, ends, labels = synthetic_turns(turns)
+        chunks = whisper_chunks(float(ends.max()))
+        chunk_starts = np.array([chunk['timestamp'][0] for chunk in chunks])
+        chunk_ends = np.array([chunk['timestamp'][1] for chunk in chunks])
+        _, assign_time = timed(assign_turns, chunk_starts, chunk_ends, starts, ends)
+
+        sweep_time = reference_time = identical = None
+        if turns <= annotation_max:
+            diarization = to_annotation(starts, ends, labels)
+            sweep_result, sweep_time = timed(SweepLineSpeakerAligner().align, "", chunks, diarization)
+            if turns <= reference_max:
+                reference_result, reference_time = timed(SpeakerAligner().align, "", chunks, diarization)
+                identical = sweep_result == reference_result
+
+        def cell(value, width):
+            return f"{value:>{width}.3f}" if isinstance(value, float) else f"{'-' if value is None else value!s:>{width}}"
+        print(f"{turns:>9} {len(chunks):>8} {cell(assign_time, 13)} {cell(sweep_time, 12)} "
+              f"{cell(reference_time, 10)} {cell(identical, 9)}")
+        turns *= 10
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark speaker alignment against the number of diarization turns")
+    parser.add_argument("--max_turns", type=int, default=1000000, help="Largest number of turns")
+    parser.add_argument("--annotation_max", type=int, default=100000,
+                        help="Largest size for which a pyannote Annotation is built and fully aligned")
+    parser.add_argument("--reference_max", type=int, default=10000,
+                        help="Largest size for which the quadratic reference aligner is run")
+    args = parser.parse_args()
+    main(args.max_turns, args.annotation_max, args.reference_max)
@@ -73,53 +73,39 @@ def invalid_audio_url():
 @when('I download the audio file')
 def download_audio_file():
     global result
-    with patch('EchoInStone.capture.audio_downloader.requests') as mock_requests, \
+    with patch.object(downloader.engine, 'download') as mock_download, \
          patch('EchoInStone.capture.audio_downloader.AudioSegment') as mock_audio:
         
-        # Setup successful response
-        mock_response = MagicMock()
-        mock_response.iter_content.return_value = [b'fake', b'audio', b'data']
-        mock_response.raise_for_status.return_value = None
-        mock_requests.get.return_value = mock_response
-        
         # Setup audio conversion
         mock_audio_instance = MagicMock()
         mock_audio.from_file.return_value = mock_audio_instance
         
-        with patch('builtins.open', create=True) as mock_open:
-            result = downloader.download(url)
+        result = downloader.download(url)
 
 
 @when('I download the audio file with proper headers')
 def download_with_headers():
     global result
-    with patch('EchoInStone.capture.audio_downloader.requests') as mock_requests, \
+    with patch.object(downloader.engine, 'download') as mock_download, \
          patch('EchoInStone.capture.audio_downloader.AudioSegment') as mock_audio:
         
-        # Setup successful response
-        mock_response = MagicMock()
-        mock_response.iter_content.return_value = [b'fake', b'audio', b'data']
-        mock_response.raise_for_status.return_value = None
-        mock_requests.get.return_value = mock_response
-        
         # Setup audio conversion
         mock_audio_instance = MagicMock()
         mock_audio.from_file.return_value = mock_audio_instance
         
-        with patch('builtins.open', create=True) as mock_open:
-            result = downloader.download(url)
+        result = downloader.download(url)
             
         # Store the mock for later verification
-        global mock_requests_global
-        mock_requests_global = mock_requests
+        global mock_download_global
+        mock_download_global = mock_download
 
 
 @when('I attempt to download the audio file')
 def attempt_download_unreachable():
     global result
-    with patch('EchoInStone.capture.audio_downloader.requests') as mock_requests:
+    with patch.object(downloader.engine, 'download') as mock_download:
         # Simulate network error
-        mock_requests.get.side_effect = Exception("Network unreachable")
+        mock_download.side_effect = Exception("Network unreachable")
         result = downloader.download(url)
 
 
@@ -139,15 +125,13 @@ def validate_url():
     global result
     if url.startswith('https://example.com/valid'):
         # Mock successful validation
-        with patch('EchoInStone.capture.audio_downloader.requests') as mock_requests:
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_requests.head.return_value = mock_response
+        with patch.object(downloader.engine, 'head') as mock_head:
+            mock_head.return_value.status_code = 200
             result = downloader.validate_url(url)
     else:
         # Mock failed validation
-        with patch('EchoInStone.capture.audio_downloader.requests') as mock_requests:
-            mock_requests.head.side_effect = Exception("Network error")
+        with patch.object(downloader.engine, 'head') as mock_head:
+            mock_head.side_effect = Exception("Network error")
             result = downloader.validate_url(url)
 
 
@@ -165,12 +149,12 @@ def verify_wav_conversion():
 
 @then('the download should succeed with correct User-Agent')
 def verify_user_agent():
-    # Verify that the request was made with proper User-Agent header
-    mock_requests_global.get.assert_called_once()
-    args, kwargs = mock_requests_global.get.call_args
-    assert 'headers' in kwargs
-    assert 'User-Agent' in kwargs['headers']
-    assert 'Mozilla' in kwargs['headers']['User-Agent']
+    # Verify that the request was made through the engine session, which carries the User-Agent header
+    mock_download_global.assert_called_once()
+    args, kwargs = mock_download_global.call_args
+    assert args[0] == url
+    assert 'User-Agent' in downloader.engine.session.headers
+    assert 'Mozilla' in downloader.engine.session.headers['User-Agent']
 
 
 @then('the file should be saved in the output directory')
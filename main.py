@@ -1,9 +1,12 @@
 import argparse
+import os
 from EchoInStone.utils import configure_logging
 import logging
 
 from EchoInStone.capture.downloader_factory import get_downloader
-from EchoInStone.processing import AudioProcessingOrchestrator, WhisperAudioTranscriber, PyannoteDiarizer, SpeakerAligner
+from EchoInStone.capture.download_cache import DownloadCache
+from EchoInStone.capture.episode_selector import EpisodeSelector
+from EchoInStone.capture.feed_sync_index import FeedSyncIndex
 from EchoInStone.utils import DataSaver
 from EchoInStone.utils import timer, log_time
 
@@ -20,24 +23,10 @@ logger = logging.getLogger(__name__)
 # Test MP3 File = 'https://media.radiofrance-podcast.net/podcast09/25425-13.02.2025-ITEMA_24028677-2025C53905E0006-NET_MFC_D378B90D-D570-44E9-AB5A-F0CC63B05A14-21.mp3'
 
 
-@timer
-def main(echo_input, output_dir, transcription_output):
+def save_results(data_saver, transcription_output, speaker_transcriptions):
     """
-    Main function to orchestrate the audio processing pipeline.
+    Saves and displays the aligned transcription of one audio file.
     """
-    # Initialize components
-    downloader = get_downloader(echo_input, output_dir)
-    transcriber = WhisperAudioTranscriber()
-    diarizer = PyannoteDiarizer()
-    aligner = SpeakerAligner()
-    data_saver = DataSaver(output_dir=output_dir)
-
-    # Create an instance of AudioProcessingOrchestrator
-    orchestrator = AudioProcessingOrchestrator(downloader, transcriber, diarizer, aligner, data_saver)
-
-    # Process the input URL
-    logger.info("Starting transcription process...")
-    speaker_transcriptions = orchestrator.extract_and_transcribe(echo_input)
     if speaker_transcriptions:
         # Save the results to a file
         data_saver.save_data(transcription_output, speaker_transcriptions)
@@ -50,12 +39,193 @@ def main(echo_input, output_dir, transcription_output):
     else:
         logger.warning("No transcriptions were generated.")
 
+
+def enroll_speakers(speaker_index, embeddings, assignments):
+    """
+    Adds speakers of the last diarization to the speaker index and saves it.
+
+    Args:
+        speaker_index (SpeakerIndex): Index of known voices.
+        embeddings (dict): Embedding of every speaker label of the last diarization.
+        assignments (list): ``LABEL=NAME`` strings.
+    """
+    for assignment in assignments:
+        label, _, name = assignment.partition("=")
+        if not name or not embeddings or label not in embeddings:
+            logger.warning(f"Cannot enroll {assignment!r}: expected LABEL=NAME with a label of the last diarization.")
+            continue
+        speaker_index.enroll(name, embeddings[label])
+        logger.info(f"Enrolled {label} as {name}.")
+    speaker_index.save()
+
+@timer
+def main(echo_input, output_dir, transcription_output, stream_decode=False, cache_dir=None, cache_size_mb=10240,
+         batch=False, episodes=None, sync_index=None, vad=False,
+         speaker_segments=False, asr_batch_size=8, chunking="short",
+         cpu_profile=False, compile_encoder=False,
+         backend="transformers", compute_type="int8", model_idle_timeout=None,
+         whisper_model="openai/whisper-large-v3-turbo", assistant_model=None, shards=1, threads_per_shard=None,
+         embedding_cache_dir=None, num_speakers=None, min_speakers=None, max_speakers=None,
+         clustering_threshold=None, diarization_window=None, diarization_workers=1,
+         speaker_index=None, enroll=None, concurrent_stages=False, transcription_threads=None,
+         diarization_threads=None, word_timestamps=False):
+    """
+    Main function to orchestrate the audio processing pipeline.
+    """
+    # Initialize components; an unsupported input fails here, before any model library is imported
+    cache = DownloadCache(cache_dir, max_bytes=cache_size_mb * 1024 * 1024) if cache_dir else None
+    selector = EpisodeSelector.latest_n(episodes) if episodes else None
+    feed_index = FeedSyncIndex(sync_index) if sync_index else None
+    downloader = get_downloader(echo_input, output_dir, stream_decode=stream_decode, cache=cache,
+                                selector=selector, sync_index=feed_index)
+
+    from EchoInStone.processing import (AudioProcessingOrchestrator, WhisperAudioTranscriber, PyannoteDiarizer,
+                                        SweepLineSpeakerAligner, EnergyVoiceActivityDetector, SegmentPlanner, EmbeddingCache,
+                                        ChunkedDiarizer, SpeakerIndex, WordSpeakerAligner, default_registry)
+
+    # Models are loaded on first use and kept in the process-wide registry across calls
+    if model_idle_timeout is not None:
+        default_registry.idle_timeout = model_idle_timeout
+
+    if backend == "ctranslate2":
+        from EchoInStone.processing import FasterWhisperTranscriber
+        transcriber = FasterWhisperTranscriber(compute_type=compute_type, batch_size=asr_batch_size,
+                                               word_timestamps=word_timestamps)
+    else:
+        whisper_options = dict(model_name=whisper_model, batch_size=asr_batch_size, chunking=chunking,
+                               cpu_profile=cpu_profile, compile_encoder=compile_encoder,
+                               assistant_model_name=assistant_model, word_timestamps=word_timestamps)
+        if shards > 1:
+            # Each worker process loads its own model with a fixed thread count
+            from EchoInStone.processing import ShardedTranscriber
+            transcriber = ShardedTranscriber(shards=shards, threads_per_shard=threads_per_shard,
+                                             transcriber_options=whisper_options)
+        else:
+            transcriber = WhisperAudioTranscriber(**whisper_options)
+    embedding_cache = EmbeddingCache(embedding_cache_dir) if embedding_cache_dir else None
+    known_speakers = SpeakerIndex(speaker_index) if speaker_index else None
+    # With windows, known voices are matched once against the linked speakers instead of in every window
+    diarizer = PyannoteDiarizer(embedding_cache=embedding_cache, speaker_index=None if diarization_window else known_speakers,
+                                num_speakers=num_speakers, min_speakers=min_speakers, max_speakers=max_speakers,
+                                clustering={"threshold": clustering_threshold} if clustering_threshold is not None else None)
+    if diarization_window:
+        # Fixed windows keep diarization memory independent of the file length
+        diarizer = ChunkedDiarizer(diarizer, window_s=diarization_window, max_workers=diarization_workers,
+                                   speaker_index=known_speakers)
+    if word_timestamps:
+        # Words are assigned one by one, so sentences are split where the speaker changes
+        aligner = WordSpeakerAligner()
+    else:
+        # Same output as SpeakerAligner without comparing every chunk with every turn
+        aligner = SweepLineSpeakerAligner()
+    data_saver = DataSaver(output_dir=output_dir)
+    voice_activity_detector = EnergyVoiceActivityDetector() if vad else None
+    segment_planner = SegmentPlanner() if speaker_segments else None
+
+    stage_threads = None
+    if transcription_threads or diarization_threads:
+        stage_threads = AudioProcessingOrchestrator.default_stage_threads()
+        stage_threads.update({name: threads for name, threads in
+                              (("transcription", transcription_threads), ("diarization", diarization_threads)) if threads})
+
+    # Create an instance of AudioProcessingOrchestrator
+    orchestrator = AudioProcessingOrchestrator(downloader, transcriber, diarizer, aligner, data_saver,
+                                               vad=voice_activity_detector, segment_planner=segment_planner,
+                                               concurrent_stages=concurrent_stages, stage_threads=stage_threads)
+
+    # Process the input URL
+    logger.info("Starting transcription process...")
+    if batch:
+        # Each playlist video or feed episode is transcribed as soon as it is downloaded
+        processed = 0
+        for audio_path, speaker_transcriptions in orchestrator.extract_and_transcribe_all(echo_input):
+            audio_base = os.path.splitext(os.path.basename(audio_path))[0]
+            save_results(data_saver, f"{audio_base}_{transcription_output}", speaker_transcriptions)
+            processed += 1
+        logger.info(f"Processed {processed} audio files.")
+    else:
+        speaker_transcriptions = orchestrator.extract_and_transcribe(echo_input)
+        save_results(data_saver, transcription_output, speaker_transcriptions)
+
+    if known_speakers is not None and enroll:
+        # Labels refer to the speakers of the last processed file
+        enroll_speakers(known_speakers, diarizer.last_embeddings, enroll)
+
+    if hasattr(transcriber, "close"):
+        transcriber.close()
+    if cache is not None:
+        logger.info(f"Download cache stats: {cache.stats()}")
+    if embedding_cache is not None:
+        logger.info(f"Embedding cache stats: {embedding_cache.stats()}")
+    logger.info(f"Model registry stats: {default_registry.stats()}")
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="EchoInStone Audio Processing CLI")
     parser.add_argument("echo_input", type=str, help="URL of the audio input (YouTube, podcast, or direct audio file)")
     parser.add_argument("--output_dir", type=str, default="results", help="Directory to save the output files")
     parser.add_argument("--transcription_output", type=str, default="speaker_transcriptions.json", help="Filename for the transcription output")
+    parser.add_argument("--stream_decode", action="store_true", help="Decode direct audio files to 16 kHz mono WAV while they download")
+    parser.add_argument("--cache_dir", type=str, default=None, help="Directory of the converted-audio cache (disabled if omitted)")
+    parser.add_argument("--cache_size_mb", type=int, default=10240, help="Disk budget of the converted-audio cache in megabytes")
+    parser.add_argument("--batch", action="store_true", help="Process every video of a YouTube playlist/channel or several podcast episodes")
+    parser.add_argument("--episodes", type=int, default=None, help="In batch mode, number of most recent podcast episodes to process")
+    parser.add_argument("--sync_index", type=str, default=None, help="In batch mode, feed index file used to process only new podcast episodes")
+
+    parser.add_argument("--vad", action="store_true", help="Skip music, jingles and silence before transcription and diarization")
+    parser.add_argument("--speaker_segments", action="store_true", help="Diarize first and transcribe each speaker turn in batches")
+    parser.add_argument("--asr_batch_size", type=int, default=8, help="Number of windows or segments decoded together by Whisper")
+    parser.add_argument("--chunking", choices=["short", "batched", "sequential"], default="short",
+                        help="Whisper long-audio strategy: 5 s windows, batched 30 s windows or sequential long-form decoding")
+    parser.add_argument("--cpu_profile", action="store_true", help="On CPU, run Whisper with SDPA attention, int8 dynamic quantization and inference mode")
+    parser.add_argument("--compile_encoder", action="store_true", help="With --cpu_profile, also torch.compile the Whisper encoder")
+    parser.add_argument("--backend", choices=["transformers", "ctranslate2"], default="transformers",
+                        help="Whisper runtime: transformers pipeline or CTranslate2 (faster-whisper, CPU)")
+    parser.add_argument("--compute_type", type=str, default="int8", help="Weight type of the CTranslate2 backend")
+    parser.add_argument("--model_idle_timeout", type=float, default=None, help="Seconds after which unused models are released from memory")
+    parser.add_argument("--whisper_model", type=str, default="openai/whisper-large-v3-turbo",
+                        help="Whisper checkpoint of the transformers backend")
+    parser.add_argument("--assistant_model", type=str, default=None,
+                        help="Smaller Whisper checkpoint drafting tokens for assisted decoding (same tokenizer as the main model)")
+    parser.add_argument("--shards", type=int, default=1,
+                        help="Split each recording at silence and transcribe the shards in this many worker processes")
+    parser.add_argument("--threads_per_shard", type=int, default=None,
+                        help="Torch threads of each shard worker; defaults to the CPU count divided by --shards")
+    parser.add_argument("--embedding_cache_dir", type=str, default=None,
+                        help="Directory storing diarization segmentations and embeddings, so re-runs only redo clustering")
+    parser.add_argument("--num_speakers", type=int, default=None, help="Known number of speakers")
+    parser.add_argument("--min_speakers", type=int, default=None, help="Lower bound on the number of speakers")
+    parser.add_argument("--max_speakers", type=int, default=None, help="Upper bound on the number of speakers")
+    parser.add_argument("--clustering_threshold", type=float, default=None,
+                        help="Speaker clustering threshold overriding the pretrained one")
+    parser.add_argument("--diarization_window", type=float, default=None,
+                        help="Diarize in windows of this many seconds and link speakers across windows")
+    parser.add_argument("--diarization_workers", type=int, default=1, help="Number of diarization windows processed at once")
+    parser.add_argument("--speaker_index", type=str, default=None,
+                        help="Index file of known voices; recognised speakers are labelled with their names")
+    parser.add_argument("--enroll", action="append", default=None, metavar="LABEL=NAME",
+                        help="With --speaker_index, add a speaker of the processed file to the index, e.g. SPEAKER_00=Alice")
+    parser.add_argument("--concurrent_stages", action="store_true",
+                        help="Run transcription and diarization at the same time, each with its own thread budget")
+    parser.add_argument("--transcription_threads", type=int, default=None,
+                        help="With --concurrent_stages, torch threads of the transcription stage")
+    parser.add_argument("--diarization_threads", type=int, default=None,
+                        help="With --concurrent_stages, torch threads of the diarization stage")
+    parser.add_argument("--word_timestamps", action="store_true",
+                        help="Timestamp every word and assign each word to a speaker, splitting sentences at speaker changes")
 
     args = parser.parse_args()
 
-    main(args.echo_input, args.output_dir, args.transcription_output)
\ No newline at end of file
+    main(args.echo_input, args.output_dir, args.transcription_output, stream_decode=args.stream_decode,
+         cache_dir=args.cache_dir, cache_size_mb=args.cache_size_mb,
+         batch=args.batch, episodes=args.episodes, sync_index=args.sync_index, vad=args.vad,
+         speaker_segments=args.speaker_segments, asr_batch_size=args.asr_batch_size,
+         chunking=args.chunking, cpu_profile=args.cpu_profile, compile_encoder=args.compile_encoder,
+         backend=args.backend, compute_type=args.compute_type,
+         model_idle_timeout=args.model_idle_timeout, whisper_model=args.whisper_model, assistant_model=args.assistant_model,
+         shards=args.shards, threads_per_shard=args.threads_per_shard,
+         embedding_cache_dir=args.embedding_cache_dir, num_speakers=args.num_speakers,
+         min_speakers=args.min_speakers, max_speakers=args.max_speakers,
+         clustering_threshold=args.clustering_threshold, diarization_window=args.diarization_window,
+         diarization_workers=args.diarization_workers, speaker_index=args.speaker_index, enroll=args.enroll,
+         concurrent_stages=args.concurrent_stages, transcription_threads=args.transcription_threads,
+         diarization_threads=args.diarization_threads, word_timestamps=args.word_timestamps)
\ No newline at end of file
@@ -0,0 +1,53 @@
+import pytest
+import torch
+from types import SimpleNamespace
+from unittest.mock import patch
+from EchoInStone.processing.assisted_decoding_monitor import AssistedDecodingMonitor
+
+
+class TinySeq2Seq(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.decoder = torch.nn.Linear(2, 2)
+
+    def get_decoder(self):
+        return self.decoder
+
+
+class TestAssistedDecodingMonitor:
+
+    def setup_method(self):
+        """Setup two tiny models and a whitespace tokenizer"""
+        self.model = TinySeq2Seq()
+        self.assistant = TinySeq2Seq()
+        self.tokenizer = lambda text, add_special_tokens=False: SimpleNamespace(input_ids=text.split())
+
+    def test_decoder_passes_are_counted(self):
+        """Test that the rate follows from the passes of both decoders"""
+        monitor = AssistedDecodingMonitor(self.model, self.assistant, self.tokenizer)
+        inputs = torch.zeros(1, 2)
+
+        with patch('EchoInStone.processing.assisted_decoding_monitor.time.perf_counter', side_effect=[1.0, 3.0]):
+            with monitor:
+                for _ in range(8):
+                    self.assistant.decoder(inputs)
+                for _ in range(2):
+                    self.model.decoder(inputs)
+        monitor.add_text("one two three four five six seven eight")
+
+        assert (monitor.target_passes, monitor.draft_passes, monitor.tokens) == (2, 8, 8)
+        assert monitor.accepted_tokens == 6
+        assert monitor.acceptance_rate == pytest.approx(0.75)
+        assert monitor.tokens_per_second == pytest.approx(4.0)
+
+    def test_hooks_are_removed_on_exit(self):
+        """Test that passes after the monitor closes are not counted"""
+        monitor = AssistedDecodingMonitor(self.model, self.assistant, self.tokenizer)
+        with monitor:
+            pass
+        self.model.decoder(torch.zeros(1, 2))
+        self.assistant.decoder(torch.zeros(1, 2))
+
+        assert (monitor.target_passes, monitor.draft_passes) == (0, 0)
+        assert monitor.acceptance_rate is None
+        monitor.log()
@@ -0,0 +1,117 @@
+import pytest
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import wave
+import numpy as np
+from unittest.mock import patch
+from EchoInStone.capture.audio_buffer import AudioBuffer
+
+
+def write_wav(path, samples, sample_rate=16000, channels=1):
+    """Write int16 samples to a PCM WAV file"""
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(np.asarray(samples, dtype='<i2').tobytes())
+
+
+class TestAudioBuffer:
+
+    def setup_method(self):
+        """Setup test environment before each test"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        """Cleanup test environment after each test"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_mono_wav_at_target_rate_is_read_without_ffmpeg(self):
+        """Test that a 16 kHz mono PCM WAV is read directly"""
+        path = os.path.join(self.temp_dir, "mono.wav")
+        write_wav(path, [0, 16384, -16384, 32767] * 4000)
+
+        with patch('EchoInStone.capture.audio_buffer.subprocess') as mock_subprocess:
+            audio = AudioBuffer.from_file(path)
+            mock_subprocess.run.assert_not_called()
+
+        assert audio.samples.dtype == np.float32
+        assert audio.sample_rate == 16000
+        assert audio.duration == pytest.approx(1.0)
+        assert audio.samples[1] == pytest.approx(0.5)
+        assert audio.samples[2] == pytest.approx(-0.5)
+
+    def test_other_formats_are_resampled_by_ffmpeg(self):
+        """Test that audio at another rate is decoded through ffmpeg"""
+        path = os.path.join(self.temp_dir, "stereo.wav")
+        write_wav(path, [0] * 8, sample_rate=44100, channels=2)
+
+        with patch('EchoInStone.capture.audio_buffer.shutil.which', return_value='/usr/bin/ffmpeg'), \
+             patch('EchoInStone.capture.audio_buffer.subprocess.run') as mock_run:
+            mock_run.return_value.returncode = 0
+            mock_run.return_value.stdout = np.array([0.25, -0.25], dtype='<f4').tobytes()
+            audio = AudioBuffer.from_file(path)
+
+        command = mock_run.call_args.args[0]
+        assert command[command.index("-ar") + 1] == "16000"
+        assert command[command.index("-ac") + 1] == "1"
+        np.testing.assert_array_equal(audio.samples, [0.25, -0.25])
+
+    def test_wav_is_streamed_in_blocks(self):
+        """Test that a 16 kHz mono PCM WAV is read one block at a time"""
+        path = os.path.join(self.temp_dir, "long.wav")
+        write_wav(path, [16384] * 16000 * 5)
+
+        blocks = list(AudioBuffer.stream_file(path, block_s=2.0))
+
+        assert [len(block) for block in blocks] == [32000, 32000, 16000]
+        assert blocks[0].dtype == np.float32
+        assert blocks[-1][0] == pytest.approx(0.5)
+
+    @pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+    def test_sample_speech_is_streamed_through_ffmpeg(self):
+        """Test that streamed blocks of the 48 kHz sample add up to the decoded file"""
+        blocks = list(AudioBuffer.stream_file("tests/resources/sample_speech.wav", block_s=5.0))
+
+        assert all(len(block) == 80000 for block in blocks[:-1])
+        np.testing.assert_array_equal(np.concatenate(blocks), AudioBuffer.from_file("tests/resources/sample_speech.wav").samples)
+
+    def test_streaming_errors_carry_the_ffmpeg_message(self):
+        """Test that a failed streaming decode reports what ffmpeg wrote to stderr"""
+        path = os.path.join(self.temp_dir, "broken.mp3")
+        with open(path, "wb") as f:
+            f.write(b"not audio")
+        failing = [sys.executable, "-c", "import sys; sys.stderr.write('Invalid data found when processing input'); sys.exit(1)"]
+        popen = subprocess.Popen
+
+        with patch('EchoInStone.capture.audio_buffer.shutil.which', return_value='/usr/bin/ffmpeg'), \
+             patch('EchoInStone.capture.audio_buffer.subprocess.Popen', side_effect=lambda command, **kwargs: popen(failing, **kwargs)):
+            with pytest.raises(RuntimeError, match="status 1: Invalid data found when processing input"):
+                list(AudioBuffer.stream_file(path))
+
+    @pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+    def test_sample_speech_is_resampled_to_16k(self):
+        """Test decoding the 48 kHz sample resource to 16 kHz"""
+        audio = AudioBuffer.from_file("tests/resources/sample_speech.wav")
+
+        assert audio.sample_rate == 16000
+        assert audio.duration == pytest.approx(585816 / 48000, abs=0.01)
+
+    def test_pipeline_and_pyannote_inputs_share_samples(self):
+        """Test the transformers and pyannote input forms"""
+        torch = pytest.importorskip("torch")
+        audio = AudioBuffer(np.linspace(-1, 1, 160), sample_rate=16000)
+
+        pipeline_input = audio.to_pipeline_input()
+        assert pipeline_input["raw"] is audio.samples
+        assert pipeline_input["sampling_rate"] == 16000
+
+        pyannote_input = audio.to_pyannote_input()
+        assert pyannote_input["sample_rate"] == 16000
+        assert tuple(pyannote_input["waveform"].shape) == (1, 160)
+        assert pyannote_input["waveform"].dtype == torch.float32
+        assert np.shares_memory(pyannote_input["waveform"].numpy(), audio.samples)
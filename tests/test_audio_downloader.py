@@ -2,8 +2,11 @@ import pytest
 import os
 import tempfile
 import shutil
-from unittest.mock import patch, MagicMock, mock_open
+import subprocess
+import sys
+from unittest.mock import patch, MagicMock
 from EchoInStone.capture.audio_downloader import AudioDownloader
+from EchoInStone.capture.ffmpeg_stream_decoder import FFmpegStreamDecoder
 
 
 class TestAudioDownloader:
@@ -47,48 +50,38 @@ class TestAudioDownloader:
             if os.path.exists(source_dir):
                 shutil.rmtree(source_dir)
     
-    @patch('EchoInStone.capture.audio_downloader.requests')
     @patch('EchoInStone.capture.audio_downloader.AudioSegment')
-    def test_url_download_and_conversion(self, mock_audio, mock_requests):
+    def test_url_download_and_conversion(self, mock_audio):
         """Test downloading and converting an audio file from URL"""
         # Setup mocks
-        mock_response = MagicMock()
-        mock_response.iter_content.return_value = [b'fake', b'mp3', b'content']
-        mock_response.raise_for_status.return_value = None
-        mock_requests.get.return_value = mock_response
+        self.downloader.engine = MagicMock()
         
         mock_audio_instance = MagicMock()
         mock_audio.from_file.return_value = mock_audio_instance
         
         test_url = "https://example.com/test.mp3"
         
-        # Mock file writing
-        with patch('builtins.open', mock_open()) as mock_file:
-            result = self.downloader.download(test_url)
-            
-            # Verify URL was requested with proper headers
-            mock_requests.get.assert_called_once()
-            args, kwargs = mock_requests.get.call_args
-            assert args[0] == test_url
-            assert kwargs['stream'] == True
-            assert 'User-Agent' in kwargs['headers']
-            
-            # Verify file was written
-            mock_file.assert_called()
-            
-            # Verify audio conversion
-            mock_audio.from_file.assert_called_once()
-            mock_audio_instance.export.assert_called_once()
-            
-            # Verify result
-            assert result is not None
-            assert result.endswith('.wav')
+        result = self.downloader.download(test_url)
+        
+        # Verify the URL was fetched by the download engine
+        self.downloader.engine.download.assert_called_once()
+        args, kwargs = self.downloader.engine.download.call_args
+        assert args[0] == test_url
+        assert args[1] == os.path.join(self.temp_dir, "test.mp3")
+        
+        # Verify audio conversion
+        mock_audio.from_file.assert_called_once()
+        mock_audio_instance.export.assert_called_once()
+        
+        # Verify result
+        assert result is not None
+        assert result.endswith('.wav')
     
-    @patch('EchoInStone.capture.audio_downloader.requests')
-    def test_url_download_with_request_error(self, mock_requests):
+    def test_url_download_with_request_error(self):
         """Test handling of HTTP errors during URL download"""
         # Setup mock to raise an exception
-        mock_requests.get.side_effect = Exception("Network error")
+        self.downloader.engine = MagicMock()
+        self.downloader.engine.download.side_effect = Exception("Network error")
         
         test_url = "https://example.com/test.mp3"
         result = self.downloader.download(test_url)
@@ -113,43 +106,118 @@ class TestAudioDownloader:
         result = self.downloader.validate_url(test_file)
         assert result == False
     
-    @patch('EchoInStone.capture.audio_downloader.requests')
-    def test_validate_url_valid_http_url(self, mock_requests):
+    def test_validate_url_valid_http_url(self):
         """Test validation of valid HTTP URL"""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_requests.head.return_value = mock_response
+        self.downloader.engine = MagicMock()
+        self.downloader.engine.head.return_value.status_code = 200
         
         test_url = "https://example.com/test.mp3"
         result = self.downloader.validate_url(test_url)
         
-        # Verify request was made with proper headers
-        mock_requests.head.assert_called_once()
-        args, kwargs = mock_requests.head.call_args
-        assert args[0] == test_url
-        assert 'User-Agent' in kwargs['headers']
-        assert kwargs['timeout'] == 10
+        # Verify the HEAD request went through the shared engine
+        self.downloader.engine.head.assert_called_once_with(test_url)
         
         assert result == True
     
-    @patch('EchoInStone.capture.audio_downloader.requests')
-    def test_validate_url_invalid_http_url(self, mock_requests):
+    def test_validate_url_invalid_http_url(self):
         """Test validation of invalid HTTP URL"""
-        mock_response = MagicMock()
-        mock_response.status_code = 404
-        mock_requests.head.return_value = mock_response
+        self.downloader.engine = MagicMock()
+        self.downloader.engine.head.return_value.status_code = 404
         
         test_url = "https://example.com/nonexistent.mp3"
         result = self.downloader.validate_url(test_url)
         
         assert result == False
     
-    @patch('EchoInStone.capture.audio_downloader.requests')
-    def test_validate_url_network_error(self, mock_requests):
+    def test_validate_url_network_error(self):
         """Test validation with network error"""
-        mock_requests.head.side_effect = Exception("Network error")
+        self.downloader.engine = MagicMock()
+        self.downloader.engine.head.side_effect = Exception("Network error")
         
         test_url = "https://example.com/test.mp3"
         result = self.downloader.validate_url(test_url)
         
-        assert result == False
\ No newline at end of file
+        assert result == False
+
+
+class TestAudioDownloaderStreamDecode:
+
+    def setup_method(self):
+        """Setup test environment before each test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.downloader = AudioDownloader(output_dir=self.temp_dir, stream_decode=True)
+
+    def teardown_method(self):
+        """Cleanup test environment after each test"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    @patch('EchoInStone.capture.audio_downloader.FFmpegStreamDecoder')
+    @patch('EchoInStone.capture.audio_downloader.AudioSegment')
+    def test_url_chunks_are_piped_into_decoder(self, mock_audio, mock_decoder_cls):
+        """Test that streamed chunks go straight to ffmpeg without pydub or a saved copy"""
+        self.downloader.engine = MagicMock()
+        mock_response = self.downloader.engine.get.return_value
+        mock_response.iter_content.return_value = [b'fake', b'mp3', b'content']
+        mock_decoder = mock_decoder_cls.return_value.__enter__.return_value
+
+        result = self.downloader.download("https://example.com/episode.mp3")
+
+        assert result == os.path.abspath(os.path.join(self.temp_dir, "episode.wav"))
+        args, kwargs = mock_decoder_cls.call_args
+        assert args[0].endswith("episode.wav")
+        assert kwargs['sample_rate'] == 16000
+        assert [c.args[0] for c in mock_decoder.write.call_args_list] == [b'fake', b'mp3', b'content']
+        mock_audio.from_file.assert_not_called()
+        assert not os.path.exists(os.path.join(self.temp_dir, "episode.mp3"))
+
+    @patch('EchoInStone.capture.audio_downloader.decode_file')
+    def test_local_file_is_decoded_in_place(self, mock_decode_file):
+        """Test that local files are decoded from their source path without copying"""
+        source_dir = tempfile.mkdtemp()
+        test_file = os.path.join(source_dir, "input.m4a")
+        with open(test_file, 'wb') as f:
+            f.write(b'fake m4a content')
+
+        try:
+            result = self.downloader.download(test_file)
+
+            mock_decode_file.assert_called_once()
+            args, kwargs = mock_decode_file.call_args
+            assert args[0] == test_file
+            assert args[1].endswith("input.wav")
+            assert result.endswith("input.wav")
+            assert not os.path.exists(os.path.join(self.temp_dir, "input.m4a"))
+        finally:
+            shutil.rmtree(source_dir)
+
+    @patch('EchoInStone.capture.audio_downloader.FFmpegStreamDecoder')
+    def test_decoder_failure_returns_none(self, mock_decoder_cls):
+        """Test that an ffmpeg failure is handled gracefully"""
+        self.downloader.engine = MagicMock()
+        self.downloader.engine.get.return_value.iter_content.return_value = [b'fake']
+        mock_decoder_cls.return_value.__enter__.side_effect = RuntimeError("ffmpeg is required")
+
+        result = self.downloader.download("https://example.com/episode.mp3")
+
+        assert result is None
+
+    def test_rejected_stream_reports_the_ffmpeg_error(self, caplog):
+        """Test that ffmpeg's message is reported when it stops reading mid-stream"""
+        failing = [sys.executable, "-c", "import sys; sys.stderr.write('Invalid data found when processing input'); sys.exit(1)"]
+        popen = subprocess.Popen
+        self.downloader.engine = MagicMock()
+        self.downloader.engine.get.return_value.iter_content.return_value = [b'x' * 65536] * 64
+        output_path = os.path.join(self.temp_dir, "episode.wav")
+
+        with patch('EchoInStone.capture.ffmpeg_stream_decoder.shutil.which', return_value='/usr/bin/ffmpeg'), \
+             patch('EchoInStone.capture.ffmpeg_stream_decoder.subprocess.Popen', side_effect=lambda command, **kwargs: popen(failing, **kwargs)):
+            with pytest.raises(RuntimeError, match="status 1: Invalid data found when processing input"):
+                with FFmpegStreamDecoder(output_path) as decoder:
+                    for chunk in [b'x' * 65536] * 64:
+                        decoder.write(chunk)
+            result = self.downloader.download("https://example.com/episode.mp3")
+
+        assert result is None
+        assert "Invalid data found when processing input" in caplog.text
+        assert not os.path.exists(output_path)
@@ -0,0 +1,173 @@
+import time
+import pytest
+import numpy as np
+from unittest.mock import patch, MagicMock
+from EchoInStone.capture.audio_buffer import AudioBuffer
+from EchoInStone.processing.audio_processing_orchestrator import AudioProcessingOrchestrator
+
+
+class TestAudioProcessingOrchestrator:
+
+    def setup_method(self):
+        """Setup mocked pipeline components before each test"""
+        self.audio = AudioBuffer(np.zeros(16000), sample_rate=16000, source_path="episode.wav")
+        self.downloader = MagicMock()
+        self.downloader.download_audio.return_value = self.audio
+        self.transcriber = MagicMock()
+        self.transcriber.transcribe.return_value = ("hello", [{'timestamp': (0.0, 1.0), 'text': "hello"}])
+        self.diarizer = MagicMock()
+        self.aligner = MagicMock()
+        self.aligner.align.return_value = [("SPEAKER_00", 0.0, 1.0, "hello")]
+        self.saver = MagicMock()
+        self.orchestrator = AudioProcessingOrchestrator(
+            self.downloader, self.transcriber, self.diarizer, self.aligner, self.saver
+        )
+
+    def test_audio_is_decoded_once_and_shared(self):
+        """Test that the transcriber and the diarizer receive the same decoded buffer"""
+        result = self.orchestrator.extract_and_transcribe("https://example.com/episode.mp3")
+
+        self.downloader.download_audio.assert_called_once_with("https://example.com/episode.mp3")
+        self.transcriber.transcribe.assert_called_once_with(self.audio)
+        self.diarizer.diarize.assert_called_once_with(self.audio)
+        assert result == [("SPEAKER_00", 0.0, 1.0, "hello")]
+
+    def test_failed_download_returns_none(self):
+        """Test that nothing is processed when the download fails"""
+        self.downloader.download_audio.return_value = None
+
+        assert self.orchestrator.extract_and_transcribe("https://example.com/missing.mp3") is None
+        self.transcriber.transcribe.assert_not_called()
+        self.diarizer.diarize.assert_not_called()
+
+    def test_collection_items_are_processed_as_they_arrive(self):
+        """Test that every downloaded item is decoded and processed in turn"""
+        self.downloader.iter_download.return_value = iter(["first.wav", "second.wav"])
+
+        with patch('EchoInStone.processing.audio_processing_orchestrator.AudioBuffer') as mock_buffer:
+            mock_buffer.from_file.side_effect = lambda path: AudioBuffer(np.zeros(160), source_path=path)
+            results = list(self.orchestrator.extract_and_transcribe_all("https://www.youtube.com/playlist?list=PL1"))
+
+        assert [path for path, _ in results] == ["first.wav", "second.wav"]
+        assert all(aligned == [("SPEAKER_00", 0.0, 1.0, "hello")] for _, aligned in results)
+        assert self.transcriber.transcribe.call_count == 2
+
+    def test_items_are_acknowledged_after_processing(self):
+        """Test that only processed items the caller has handled are acknowledged"""
+        self.downloader.iter_download.return_value = iter(["first.wav", "second.wav"])
+        self.aligner.align.side_effect = [None, [("SPEAKER_00", 0.0, 1.0, "hello")]]
+
+        with patch('EchoInStone.processing.audio_processing_orchestrator.AudioBuffer') as mock_buffer:
+            mock_buffer.from_file.side_effect = lambda path: AudioBuffer(np.zeros(160), source_path=path)
+            items = self.orchestrator.extract_and_transcribe_all("https://example.com/feed.xml")
+            next(items)
+            assert next(items)[0] == "second.wav"
+            self.downloader.acknowledge.assert_not_called()
+            list(items)
+
+        self.downloader.acknowledge.assert_called_once_with("second.wav")
+
+    def test_voice_activity_gating(self):
+        """Test that models only see speech and their output is mapped back"""
+        from EchoInStone.processing.speech_timeline import SpeechTimeline
+        vad = MagicMock()
+        vad.detect.return_value = SpeechTimeline([(0.25, 0.75)], duration=1.0)
+        self.transcriber.transcribe.return_value = ("hello", [{'timestamp': (0.0, 0.5), 'text': "hello"}])
+        self.diarizer.diarize.return_value = None
+        orchestrator = AudioProcessingOrchestrator(
+            self.downloader, self.transcriber, self.diarizer, self.aligner, self.saver, vad=vad
+        )
+
+        orchestrator.extract_and_transcribe("https://example.com/episode.mp3")
+
+        compacted = self.transcriber.transcribe.call_args[0][0]
+        assert compacted.duration == pytest.approx(0.5)
+        assert self.diarizer.diarize.call_args[0][0] is compacted
+        _, timestamps, _ = self.aligner.align.call_args[0]
+        assert timestamps == [{'timestamp': (0.25, 0.75), 'text': "hello"}]
+        assert orchestrator.last_speech_timeline.skipped_seconds == pytest.approx(0.5)
+
+    def test_no_speech_skips_the_models(self):
+        """Test that audio without speech is not transcribed"""
+        from EchoInStone.processing.speech_timeline import SpeechTimeline
+        vad = MagicMock()
+        vad.detect.return_value = SpeechTimeline([], duration=1.0)
+        orchestrator = AudioProcessingOrchestrator(
+            self.downloader, self.transcriber, self.diarizer, self.aligner, self.saver, vad=vad
+        )
+
+        assert orchestrator.extract_and_transcribe("https://example.com/jingle.mp3") == []
+        self.transcriber.transcribe.assert_not_called()
+
+    def test_speaker_turns_are_transcribed_without_alignment(self):
+        """Test that segment mode plans diarization turns and skips the aligner"""
+        planner = MagicMock()
+        planner.plan.return_value = [(0.0, 0.4, "A"), (0.4, 0.6, "A"), (0.6, 1.0, "B")]
+        self.transcriber.transcribe_segments.return_value = [
+            ("A", 0.0, 0.4, " Hello"), ("A", 0.4, 0.6, " there."), ("B", 0.6, 1.0, " Hi."),
+        ]
+        orchestrator = AudioProcessingOrchestrator(
+            self.downloader, self.transcriber, self.diarizer, self.aligner, self.saver, segment_planner=planner
+        )
+
+        result = orchestrator.extract_and_transcribe("https://example.com/episode.mp3")
+
+        planner.plan.assert_called_once_with(self.diarizer.diarize.return_value)
+        self.transcriber.transcribe_segments.assert_called_once_with(self.audio, planner.plan.return_value)
+        self.transcriber.transcribe.assert_not_called()
+        self.aligner.align.assert_not_called()
+        assert result == [("A", 0.0, 0.6, " Hello there."), ("B", 0.6, 1.0, " Hi.")]
+
+
+class TestConcurrentStages:
+
+    def setup_method(self):
+        """Setup slow mocked models and a concurrent orchestrator"""
+        self.audio = AudioBuffer(np.zeros(16000), sample_rate=16000)
+        self.transcriber = MagicMock()
+        self.transcriber.transcribe.side_effect = lambda audio: (time.sleep(0.3), ("hello", []))[1]
+        self.diarizer = MagicMock()
+        self.diarizer.diarize.side_effect = lambda audio: (time.sleep(0.3), "diarization")[1]
+        self.aligner = MagicMock()
+        self.aligner.align.return_value = [("SPEAKER_00", 0.0, 1.0, "hello")]
+        self.orchestrator = AudioProcessingOrchestrator(
+            MagicMock(), self.transcriber, self.diarizer, self.aligner, MagicMock(),
+            concurrent_stages=True, stage_threads={'transcription': 3, 'diarization': 1}
+        )
+
+    def test_stages_overlap_and_are_timed(self):
+        """Test that the run takes about as long as the longer stage"""
+        with patch('torch.get_num_threads', return_value=8), patch('torch.set_num_threads') as mock_threads:
+            result = self.orchestrator.process_audio(self.audio)
+
+        self.aligner.align.assert_called_once_with("hello", [], "diarization")
+        assert result == [("SPEAKER_00", 0.0, 1.0, "hello")]
+        timings = self.orchestrator.last_timings
+        assert set(timings) == {'transcription', 'diarization', 'total'}
+        assert timings['transcription'] >= 0.3 and timings['diarization'] >= 0.3
+        assert timings['total'] < timings['transcription'] + timings['diarization']
+        assert {call.args[0] for call in mock_threads.call_args_list[:2]} == {3, 1}
+        assert mock_threads.call_args_list[-1].args == (8,)
+
+    def test_thread_count_is_restored_after_a_failed_stage(self):
+        """Test that the process thread count is put back even if a stage raises"""
+        self.diarizer.diarize.side_effect = RuntimeError("out of memory")
+
+        with patch('torch.get_num_threads', return_value=8), patch('torch.set_num_threads') as mock_threads:
+            with pytest.raises(RuntimeError):
+                self.orchestrator.run_stages(self.audio)
+
+        assert mock_threads.call_args_list[-1].args == (8,)
+
+    def test_sequential_run_is_timed_too(self):
+        """Test that the default mode keeps the order and reports timings"""
+        self.orchestrator.concurrent_stages = False
+
+        self.orchestrator.process_audio(self.audio)
+
+        assert self.orchestrator.last_timings['total'] >= 0.6
+
+    def test_default_budget_uses_every_core_once(self):
+        """Test that the default thread budgets add up to the CPU count"""
+        with patch('EchoInStone.processing.audio_processing_orchestrator.os.cpu_count', return_value=7):
+            assert AudioProcessingOrchestrator.default_stage_threads() == {'transcription': 4, 'diarization': 3}
@@ -0,0 +1,140 @@
+import time
+import shutil
+import tempfile
+import threading
+import numpy as np
+from unittest.mock import MagicMock, patch
+from pyannote.core import Annotation, Segment, SlidingWindow, SlidingWindowFeature
+from EchoInStone.capture.audio_buffer import AudioBuffer
+from EchoInStone.processing.chunked_diarizer import ChunkedDiarizer
+from EchoInStone.processing.embedding_cache import EmbeddingCache
+from EchoInStone.processing.model_registry import ModelRegistry
+from EchoInStone.processing.pyannote_diarizer import PyannoteDiarizer
+from EchoInStone.processing.speaker_index import SpeakerIndex
+
+
+class WindowDiarizer:
+    """Diarizer labelling the first voice of every window "A"; host and guest alternate in opening windows"""
+
+    def __init__(self):
+        self.windows = []
+
+    def diarize(self, audio, return_embeddings=False):
+        self.windows.append(audio.duration)
+        annotation = Annotation()
+        half = audio.duration / 2
+        host, guest = ("A", "B") if len(self.windows) % 2 else ("B", "A")
+        first, second = sorted((host, guest))
+        annotation[Segment(0, half)] = first
+        annotation[Segment(half, audio.duration)] = second
+        embeddings = {host: [1.0, 0.0], guest: [0.0, 1.0]}
+        return annotation, np.array([embeddings[label] for label in annotation.labels()])
+
+
+class EmbeddingPipeline:
+    """Fake pyannote pipeline splitting every window between two voices, recording how many calls overlap"""
+
+    def __init__(self):
+        self.params = {'clustering': {'threshold': 0.7}}
+        self.active = 0
+        self.max_active = 0
+        self.counter_lock = threading.Lock()
+
+    def get_segmentations(self, file, hook=None):
+        return SlidingWindowFeature(np.ones((2, 3, 2)), SlidingWindow(start=0.0, duration=5.0, step=5.0))
+
+    def get_embeddings(self, file, binary_segmentations, exclude_overlap=False, hook=None):
+        return np.ones((2, 2, 2))
+
+    def parameters(self, instantiated=False):
+        return {name: dict(values) for name, values in self.params.items()}
+
+    def instantiate(self, params):
+        self.params = params
+
+    def __call__(self, file, hook=None, **options):
+        with self.counter_lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            segmentations = self.get_segmentations(file, hook=hook)
+            self.get_embeddings(file, segmentations, exclude_overlap=True, hook=hook)
+            time.sleep(0.02)
+            duration = file['waveform'].shape[-1] / file['sample_rate']
+            annotation = Annotation()
+            annotation[Segment(0, duration / 2)] = "A"
+            annotation[Segment(duration / 2, duration)] = "B"
+            return annotation, np.array([[1.0, 0.0], [0.0, 1.0]])
+        finally:
+            with self.counter_lock:
+                self.active -= 1
+
+
+class TestChunkedDiarizer:
+
+    def setup_method(self):
+        """Setup a chunked diarizer with 10 s windows"""
+        self.inner = WindowDiarizer()
+        self.diarizer = ChunkedDiarizer(self.inner, window_s=10.0, max_workers=2)
+        self.audio = AudioBuffer(np.zeros(100 * 25), sample_rate=100)
+
+    def test_windows_are_merged_with_global_labels(self):
+        """Test that every window is diarized once and speakers keep one label throughout"""
+        diarization = self.diarizer.diarize(self.audio)
+
+        assert self.inner.windows == [10.0, 10.0, 5.0]
+        turns = [(turn.start, turn.end, label) for turn, _, label in diarization.itertracks(yield_label=True)]
+        assert turns == [(0.0, 5.0, "SPEAKER_00"), (5.0, 15.0, "SPEAKER_01"), (15.0, 22.5, "SPEAKER_00"),
+                         (22.5, 25.0, "SPEAKER_01")]
+
+    def test_known_voices_name_the_global_speakers(self):
+        """Test that the speaker index names the linked speakers once, not every window"""
+        self.diarizer.speaker_index = SpeakerIndex()
+        self.diarizer.speaker_index.enroll("Host", [1.0, 0.1])
+
+        with patch.object(SpeakerIndex, 'resolve', wraps=self.diarizer.speaker_index.resolve) as mock_resolve:
+            diarization = self.diarizer.diarize(self.audio)
+
+        mock_resolve.assert_called_once()
+        assert diarization.labels() == ["Host", "SPEAKER_01"]
+        assert sorted(self.diarizer.last_embeddings) == ["Host", "SPEAKER_01"]
+
+    def test_files_are_read_window_by_window(self):
+        """Test that a file path is streamed instead of decoded at once"""
+        blocks = [np.zeros(16000 * 10, dtype=np.float32), np.zeros(16000 * 4, dtype=np.float32)]
+
+        with patch.object(AudioBuffer, 'stream_file', return_value=iter(blocks)) as mock_stream:
+            diarization = self.diarizer.diarize("episode.wav")
+
+        mock_stream.assert_called_once_with("episode.wav", block_s=10.0)
+        assert diarization.get_timeline().extent() == Segment(0.0, 14.0)
+
+    def test_failed_window_returns_none(self):
+        """Test that a failed window is logged and reported as None"""
+        self.diarizer.diarizer = MagicMock()
+        self.diarizer.diarizer.diarize.return_value = None
+
+        assert self.diarizer.diarize(self.audio) is None
+
+    def test_parallel_windows_share_one_cached_pipeline(self):
+        """Test that windows diarized at once on a shared pipeline with an embedding cache all succeed"""
+        cache_dir = tempfile.mkdtemp()
+        try:
+            pipeline = EmbeddingPipeline()
+            inner = PyannoteDiarizer(registry=ModelRegistry(), embedding_cache=EmbeddingCache(cache_dir),
+                                     clustering={'threshold': 0.5})
+            inner.pipeline = pipeline
+            diarizer = ChunkedDiarizer(inner, window_s=10.0, max_workers=3)
+            audio = AudioBuffer(np.linspace(-1, 1, 100 * 60).astype(np.float32), sample_rate=100)
+
+            with patch('pyannote.audio.pipelines.utils.hook.ProgressHook', MagicMock()):
+                diarization = diarizer.diarize(audio)
+        finally:
+            shutil.rmtree(cache_dir)
+
+        assert diarization is not None
+        assert diarization.get_timeline().extent() == Segment(0.0, 60.0)
+        assert diarization.labels() == ["SPEAKER_00", "SPEAKER_01"]
+        assert pipeline.max_active == 1
+        assert pipeline.params['clustering'] == {'threshold': 0.7}
+        assert 'get_segmentations' not in vars(pipeline)
@@ -0,0 +1,168 @@
+import pytest
+import os
+import tempfile
+import shutil
+from unittest.mock import patch, MagicMock
+from EchoInStone.capture.download_cache import DownloadCache, CachedDownloader, normalize_url
+from EchoInStone.capture.downloader_factory import get_downloader
+from EchoInStone.capture.downloader_interface import DownloaderInterface
+from EchoInStone.capture.youtube_downloader import YouTubeDownloader
+from EchoInStone.capture.audio_downloader import AudioDownloader
+
+
+class TestDownloadCache:
+
+    def setup_method(self):
+        """Setup test environment before each test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, "cache")
+
+    def teardown_method(self):
+        """Cleanup test environment after each test"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def make_file(self, name, size):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(b'x' * size)
+        return path
+
+    def test_normalize_url(self):
+        """Test that equivalent URL spellings normalize to the same key"""
+        assert normalize_url("HTTPS://Example.COM:443/a.mp3?b=2&a=1#t=10") == "https://example.com/a.mp3?a=1&b=2"
+        assert normalize_url("http://example.com:8080") == "http://example.com:8080/"
+
+    def test_put_then_get_is_a_hit(self):
+        """Test storing and retrieving a converted file"""
+        cache = DownloadCache(self.cache_dir, max_bytes=1000)
+        cached_path = cache.put("url:a", self.make_file("a.wav", 10))
+
+        assert cache.get("url:a") == cached_path
+        assert cache.get("url:b") is None
+        assert cache.stats() == {'hits': 1, 'misses': 1, 'entries': 1, 'bytes': 10}
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test that the disk budget evicts the least recently used entry"""
+        cache = DownloadCache(self.cache_dir, max_bytes=250)
+        path_a = cache.put("url:a", self.make_file("a.wav", 100))
+        cache.put("url:b", self.make_file("b.wav", 100))
+        cache.get("url:a")
+        cache.put("url:c", self.make_file("c.wav", 100))
+
+        assert cache.get("url:b") is None
+        assert cache.get("url:a") == path_a
+        assert cache.get("url:c") is not None
+        assert cache.total_bytes == 200
+
+    def test_index_persists_across_instances(self):
+        """Test that a new cache instance sees the entries of a previous run"""
+        cache = DownloadCache(self.cache_dir)
+        cached_path = cache.put("url:a", self.make_file("a.wav", 10))
+
+        assert DownloadCache(self.cache_dir).get("url:a") == cached_path
+
+
+class TestCachedDownloader:
+
+    def setup_method(self):
+        """Setup test environment before each test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = DownloadCache(os.path.join(self.temp_dir, "cache"))
+        self.inner = MagicMock(spec=DownloaderInterface)
+        self.inner.download.side_effect = self.fake_download
+        self.inner.cache_fingerprint.return_value = "Fake:mono-16000"
+
+    def teardown_method(self):
+        """Cleanup test environment after each test"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def fake_download(self, url):
+        path = os.path.join(self.temp_dir, "converted.wav")
+        with open(path, 'wb') as f:
+            f.write(b'wav')
+        return path
+
+    @patch('EchoInStone.capture.download_cache.requests')
+    def test_second_download_skips_the_inner_downloader(self, mock_requests):
+        """Test that a cache hit skips both the download and the conversion"""
+        mock_requests.head.return_value.headers = {'ETag': '"v1"'}
+        downloader = CachedDownloader(self.inner, self.cache)
+
+        first = downloader.download("https://example.com/a.mp3")
+        second = downloader.download("https://EXAMPLE.com/a.mp3")
+
+        assert first == second
+        assert self.inner.download.call_count == 1
+        assert self.cache.stats()['hits'] == 1
+
+    @patch('EchoInStone.capture.download_cache.requests')
+    def test_changed_etag_is_a_miss(self, mock_requests):
+        """Test that a new ETag invalidates the cached conversion"""
+        downloader = CachedDownloader(self.inner, self.cache)
+        mock_requests.head.return_value.headers = {'ETag': '"v1"'}
+        downloader.download("https://example.com/a.mp3")
+        mock_requests.head.return_value.headers = {'ETag': '"v2"'}
+        downloader.download("https://example.com/a.mp3")
+
+        assert self.inner.download.call_count == 2
+
+    def test_local_files_are_keyed_on_content(self):
+        """Test that local files hit the cache by content hash, whatever their path"""
+        downloader = CachedDownloader(self.inner, self.cache)
+        source_a = os.path.join(self.temp_dir, "a.mp3")
+        source_b = os.path.join(self.temp_dir, "b.mp3")
+        for path in (source_a, source_b):
+            with open(path, 'wb') as f:
+                f.write(b'same content')
+
+        downloader.download(source_a)
+        downloader.download(source_b)
+
+        assert self.inner.download.call_count == 1
+
+    def test_failed_download_is_not_cached(self):
+        """Test that a failed download is returned as is"""
+        self.inner.download.side_effect = None
+        self.inner.download.return_value = None
+        downloader = CachedDownloader(self.inner, self.cache, use_http_validators=False)
+
+        assert downloader.download("https://example.com/a.mp3") is None
+        assert self.cache.stats()['entries'] == 0
+
+    def test_factory_wraps_downloader_when_cache_is_given(self):
+        """Test that get_downloader wraps the selected downloader"""
+        downloader = get_downloader("https://youtu.be/dQw4w9WgXcQ", self.temp_dir, cache=self.cache)
+
+        assert isinstance(downloader, CachedDownloader)
+        assert isinstance(downloader.downloader, YouTubeDownloader)
+        assert downloader.use_http_validators is False
+        assert downloader.output_dir == self.temp_dir
+
+    def test_validators_reuse_the_downloader_engine(self):
+        """Test that the HEAD request goes through the wrapped downloader's engine"""
+        self.inner.engine = MagicMock()
+        self.inner.engine.head.return_value.headers = {'Last-Modified': 'Tue, 01 Jul 2025 10:00:00 GMT'}
+        downloader = CachedDownloader(self.inner, self.cache)
+
+        key = downloader.cache_key("https://example.com/a.mp3")
+
+        self.inner.engine.head.assert_called_once_with("https://example.com/a.mp3")
+        assert key.endswith("|modified=Tue, 01 Jul 2025 10:00:00 GMT")
+
+    def test_other_conversion_settings_miss_the_cache(self):
+        """Test that downloaders converting differently do not share cached files"""
+        source = os.path.join(self.temp_dir, "episode.mp3")
+        with open(source, 'wb') as f:
+            f.write(b'mp3')
+        configurations = [AudioDownloader(self.temp_dir), AudioDownloader(self.temp_dir, stream_decode=True),
+                          AudioDownloader(self.temp_dir, stream_decode=True, sample_rate=8000),
+                          AudioDownloader(self.temp_dir, stream_decode=True)]
+
+        with patch.object(AudioDownloader, 'download', side_effect=self.fake_download) as mock_download:
+            paths = [CachedDownloader(inner, self.cache).download(source) for inner in configurations]
+
+        assert mock_download.call_count == 3
+        assert len(set(paths[:3])) == 3
+        assert paths[3] == paths[1]
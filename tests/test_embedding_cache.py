@@ -0,0 +1,166 @@
+import os
+import shutil
+import time
+import tempfile
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+from pyannote.core import SlidingWindow, SlidingWindowFeature
+from EchoInStone.capture.audio_buffer import AudioBuffer
+from EchoInStone.processing.embedding_cache import EmbeddingCache
+from EchoInStone.processing.model_registry import ModelRegistry
+from EchoInStone.processing.pyannote_diarizer import PyannoteDiarizer
+
+
+class FakeDiarizationPipeline:
+    """Pipeline running the segmentation, embedding and clustering steps like pyannote"""
+
+    def __init__(self):
+        self.segmentation_calls = 0
+        self.embedding_calls = 0
+        self.params = {'clustering': {'threshold': 0.7, 'method': "centroid"}}
+        self.runs = []
+
+    def get_segmentations(self, file, hook=None):
+        self.segmentation_calls += 1
+        return SlidingWindowFeature(np.ones((3, 5, 2)), SlidingWindow(start=0.0, duration=10.0, step=1.0))
+
+    def get_embeddings(self, file, binary_segmentations, exclude_overlap=False, hook=None):
+        self.embedding_calls += 1
+        return np.arange(3 * 2 * 4, dtype=np.float32).reshape(3, 2, 4)
+
+    def parameters(self, instantiated=False):
+        return {name: dict(values) for name, values in self.params.items()}
+
+    def instantiate(self, params):
+        self.params = params
+
+    def __call__(self, file, hook=None, **speakers):
+        segmentations = self.get_segmentations(file, hook=hook)
+        embeddings = self.get_embeddings(file, segmentations, exclude_overlap=True, hook=hook)
+        self.runs.append((segmentations.data.shape, embeddings.shape, speakers, self.params['clustering']['threshold']))
+        return "diarization"
+
+
+class SlowDiarizationPipeline(FakeDiarizationPipeline):
+    """Fake pipeline recording how many calls run at once"""
+
+    def __init__(self):
+        super().__init__()
+        self.active = 0
+        self.max_active = 0
+        self.counter_lock = threading.Lock()
+
+    def __call__(self, file, hook=None, **speakers):
+        with self.counter_lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.05)
+        try:
+            return super().__call__(file, hook=hook, **speakers)
+        finally:
+            with self.counter_lock:
+                self.active -= 1
+
+
+class TestEmbeddingCache:
+
+    def setup_method(self):
+        """Setup a cache in a temporary directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = EmbeddingCache(self.temp_dir)
+        self.audio = AudioBuffer(np.linspace(-1, 1, 16000))
+        self.segmentations = SlidingWindowFeature(np.random.default_rng(0).random((4, 6, 3)),
+                                                  SlidingWindow(start=0.0, duration=10.0, step=2.5))
+
+    def teardown_method(self):
+        """Cleanup the cache directory"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_entries_round_trip(self):
+        """Test that segmentations and embeddings are read back unchanged"""
+        key = self.cache.key(self.audio, "model:1")
+        embeddings = np.full((4, 3, 8), np.nan)
+        self.cache.save(key, self.segmentations, embeddings)
+
+        segmentations, loaded = self.cache.load(key)
+
+        np.testing.assert_array_equal(segmentations.data, self.segmentations.data)
+        assert segmentations.sliding_window.step == 2.5
+        assert np.isnan(loaded).all() and loaded.shape == (4, 3, 8)
+        assert self.cache.stats() == {'hits': 1, 'misses': 0}
+
+    def test_key_depends_on_audio_and_model(self):
+        """Test that other audio or another model version miss the cache"""
+        other_audio = AudioBuffer(np.zeros(16000))
+
+        assert self.cache.key(self.audio, "model:1") == self.cache.key(AudioBuffer(np.linspace(-1, 1, 16000)), "model:1")
+        assert self.cache.key(self.audio, "model:1") != self.cache.key(self.audio, "model:2")
+        assert self.cache.key(self.audio, "model:1") != self.cache.key(other_audio, "model:1")
+        assert self.cache.load(self.cache.key(other_audio, "model:1")) is None
+
+    def test_unreadable_entry_is_a_miss(self):
+        """Test that a corrupt file is ignored"""
+        with open(os.path.join(self.temp_dir, "broken.npz"), 'wb') as f:
+            f.write(b"not a zip")
+
+        assert self.cache.load("broken") is None
+        assert self.cache.misses == 1
+
+
+class TestDiarizerEmbeddingReuse:
+
+    def setup_method(self):
+        """Setup a diarizer around a fake pipeline with an embedding cache"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pipeline = FakeDiarizationPipeline()
+        self.diarizer = PyannoteDiarizer(registry=ModelRegistry(), embedding_cache=EmbeddingCache(self.temp_dir))
+        self.diarizer.pipeline = self.pipeline
+        self.audio = AudioBuffer(np.linspace(-1, 1, 16000))
+        self.hook_patch = patch('pyannote.audio.pipelines.utils.hook.ProgressHook', MagicMock())
+        self.hook_patch.start()
+
+    def teardown_method(self):
+        """Cleanup the cache directory"""
+        self.hook_patch.stop()
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_rerun_only_redoes_clustering(self):
+        """Test that a second run with other settings reuses segmentations and embeddings"""
+        assert self.diarizer.diarize(self.audio) == "diarization"
+        assert self.diarizer.diarize(self.audio, num_speakers=3, clustering={'threshold': 0.5}) == "diarization"
+
+        assert (self.pipeline.segmentation_calls, self.pipeline.embedding_calls) == (1, 1)
+        assert self.pipeline.runs[0] == ((3, 5, 2), (3, 2, 4), {}, 0.7)
+        assert self.pipeline.runs[1] == ((3, 5, 2), (3, 2, 4), {'num_speakers': 3}, 0.5)
+        assert self.pipeline.params['clustering'] == {'threshold': 0.7, 'method': "centroid"}
+        assert 'get_segmentations' not in vars(self.pipeline)
+
+    def test_without_cache_features_are_recomputed(self):
+        """Test that the pipeline runs every step when no cache is configured"""
+        self.diarizer.embedding_cache = None
+
+        self.diarizer.diarize(self.audio)
+        self.diarizer.diarize(self.audio)
+
+        assert (self.pipeline.segmentation_calls, self.pipeline.embedding_calls) == (2, 2)
+
+    def test_diarizers_sharing_a_pipeline_run_one_at_a_time(self):
+        """Test that concurrent calls on a shared pipeline keep their own settings and features"""
+        pipeline = SlowDiarizationPipeline()
+        cached = PyannoteDiarizer(registry=ModelRegistry(), embedding_cache=EmbeddingCache(self.temp_dir),
+                                  clustering={'threshold': 0.5})
+        plain = PyannoteDiarizer(registry=ModelRegistry())
+        cached.pipeline = plain.pipeline = pipeline
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda diarizer: diarizer.diarize(self.audio), [cached, plain] * 3))
+
+        assert results == ["diarization"] * 6
+        assert pipeline.max_active == 1
+        assert sorted(run[3] for run in pipeline.runs) == [0.5] * 3 + [0.7] * 3
+        assert pipeline.params['clustering'] == {'threshold': 0.7, 'method': "centroid"}
+        assert 'get_segmentations' not in vars(pipeline)
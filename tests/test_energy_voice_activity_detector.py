@@ -0,0 +1,71 @@
+import pytest
+import numpy as np
+from EchoInStone.capture.audio_buffer import AudioBuffer
+from EchoInStone.processing.energy_voice_activity_detector import EnergyVoiceActivityDetector
+
+SAMPLE_RATE = 16000
+
+
+def speech_like(seconds):
+    """Harmonic voice with a gliding pitch and a 4 Hz syllable envelope"""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    phase = 2 * np.pi * np.cumsum(120 + 20 * np.sin(2 * np.pi * 0.7 * t)) / SAMPLE_RATE
+    voice = sum(np.sin(k * phase) / k for k in range(1, 20))
+    envelope = 0.2 + 0.8 * np.clip(np.sin(2 * np.pi * 4 * t), 0, None)
+    return 0.3 * voice * envelope
+
+
+def steady_tone(seconds):
+    """Sustained chord standing in for a music bed"""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return 0.3 * (np.sin(2 * np.pi * 440 * t) + 0.5 * np.sin(2 * np.pi * 660 * t))
+
+
+class TestEnergyVoiceActivityDetector:
+
+    def setup_method(self):
+        """Setup detector and noise source before each test"""
+        self.detector = EnergyVoiceActivityDetector()
+        self.rng = np.random.default_rng(0)
+
+    def silence(self, seconds):
+        return 0.001 * self.rng.standard_normal(int(seconds * SAMPLE_RATE))
+
+    def white_noise(self, seconds):
+        return 0.1 * self.rng.standard_normal(int(seconds * SAMPLE_RATE))
+
+    def test_speech_is_found_between_silence_music_and_noise(self):
+        """Test that only the speech stretches end up in the timeline"""
+        samples = np.concatenate([
+            self.silence(3), speech_like(4), steady_tone(5), speech_like(3), self.white_noise(4), self.silence(2)
+        ])
+
+        timeline = self.detector.detect(AudioBuffer(samples))
+
+        assert len(timeline) == 2
+        (first_start, first_end), (second_start, second_end) = timeline.regions
+        assert first_start == pytest.approx(3.0, abs=0.5) and first_end == pytest.approx(7.0, abs=0.5)
+        assert second_start == pytest.approx(12.0, abs=0.5) and second_end == pytest.approx(15.0, abs=0.5)
+        assert timeline.skipped_seconds > 12
+
+    def test_silence_has_no_speech(self):
+        """Test that a quiet recording produces an empty timeline"""
+        timeline = self.detector.detect(AudioBuffer(self.silence(5)))
+
+        assert len(timeline) == 0
+        assert timeline.skipped_seconds == pytest.approx(5.0)
+
+    def test_short_gaps_are_bridged_and_regions_padded(self):
+        """Test that regions closer than min_silence_s are merged and padded"""
+        speech = np.zeros(100, dtype=bool)
+        speech[10:30] = True
+        speech[33:50] = True
+        speech[80:81] = True
+
+        regions = self.detector.to_regions(speech, hop_s=0.1, frame_s=0.1)
+
+        assert regions == [pytest.approx((0.8, 5.2))]
+
+    def test_audio_shorter_than_a_frame(self):
+        """Test that a buffer shorter than one frame is handled"""
+        assert len(self.detector.detect(AudioBuffer(np.zeros(10)))) == 0
@@ -0,0 +1,97 @@
+import pytest
+import numpy as np
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+from EchoInStone.capture.audio_buffer import AudioBuffer
+from EchoInStone.processing.faster_whisper_transcriber import FasterWhisperTranscriber
+from EchoInStone.processing.model_registry import ModelRegistry
+
+
+def make_segments():
+    return iter([
+        SimpleNamespace(start=0.0, end=2.5, text=" Bonjour à tous."),
+        SimpleNamespace(start=2.5, end=4.0, text=" Bienvenue."),
+    ])
+
+
+class TestFasterWhisperTranscriber:
+
+    def setup_method(self):
+        """Patch the optional faster-whisper classes before each test"""
+        self.model_patch = patch('EchoInStone.processing.faster_whisper_transcriber.WhisperModel')
+        self.batched_patch = patch('EchoInStone.processing.faster_whisper_transcriber.BatchedInferencePipeline')
+        self.mock_model = self.model_patch.start()
+        self.mock_batched = self.batched_patch.start()
+        info = SimpleNamespace(language="fr")
+        self.mock_model.return_value.transcribe.side_effect = lambda *args, **kwargs: (make_segments(), info)
+        self.mock_batched.return_value.transcribe.side_effect = lambda *args, **kwargs: (make_segments(), info)
+        self.audio = AudioBuffer(np.zeros(16000 * 4), sample_rate=16000)
+        self.registry = ModelRegistry()
+
+    def teardown_method(self):
+        """Remove the patches after each test"""
+        self.batched_patch.stop()
+        self.model_patch.stop()
+
+    def test_output_matches_the_transformers_chunk_shape(self):
+        """Test that text and timestamp chunks have the pipeline's shape"""
+        transcriber = FasterWhisperTranscriber(compute_type="int8", batch_size=8, registry=self.registry)
+
+        transcription, timestamps = transcriber.transcribe(self.audio)
+
+        assert transcription == " Bonjour à tous. Bienvenue."
+        assert timestamps == [
+            {'timestamp': (0.0, 2.5), 'text': " Bonjour à tous."},
+            {'timestamp': (2.5, 4.0), 'text': " Bienvenue."},
+        ]
+        self.mock_batched.return_value.transcribe.assert_called_once()
+        assert self.mock_batched.return_value.transcribe.call_args[1]['batch_size'] == 8
+        assert transcriber.last_real_time_factor is not None
+
+    def test_batch_size_one_decodes_sequentially(self):
+        """Test that batching is skipped when batch_size is 1"""
+        transcriber = FasterWhisperTranscriber(batch_size=1, registry=self.registry)
+
+        transcriber.transcribe(self.audio)
+
+        self.mock_batched.assert_not_called()
+        self.mock_model.return_value.transcribe.assert_called_once()
+        assert self.mock_model.call_args[1]['compute_type'] == "int8"
+
+    def test_word_timestamps_emit_one_chunk_per_word(self):
+        """Test that word mode flattens the words of every segment"""
+        words = [SimpleNamespace(start=0.0, end=0.6, word=" Bonjour"), SimpleNamespace(start=0.6, end=1.0, word=" Marc.")]
+        segments = [SimpleNamespace(start=0.0, end=1.0, text=" Bonjour Marc.", words=words),
+                    SimpleNamespace(start=1.0, end=1.0, text="", words=None)]
+        self.mock_model.return_value.transcribe.side_effect = lambda *args, **kwargs: (iter(segments), SimpleNamespace(language="fr"))
+        transcriber = FasterWhisperTranscriber(batch_size=1, word_timestamps=True, registry=self.registry)
+
+        transcription, timestamps = transcriber.transcribe(self.audio)
+
+        assert transcription == " Bonjour Marc."
+        assert timestamps == [{'timestamp': (0.0, 0.6), 'text': " Bonjour"}, {'timestamp': (0.6, 1.0), 'text': " Marc."}]
+        assert self.mock_model.return_value.transcribe.call_args[1]['word_timestamps'] is True
+
+    def test_runtime_error_returns_none(self):
+        """Test that decoding errors are logged and reported as None"""
+        transcriber = FasterWhisperTranscriber(batch_size=1, registry=self.registry)
+        self.mock_model.return_value.transcribe.side_effect = RuntimeError("bad model")
+
+        assert transcriber.transcribe(self.audio) == (None, None)
+
+    def test_missing_dependency_is_reported(self):
+        """Test that a clear error is raised when faster-whisper is not installed"""
+        with patch('EchoInStone.processing.faster_whisper_transcriber.WhisperModel', None):
+            with pytest.raises(ImportError, match="faster-whisper"):
+                FasterWhisperTranscriber()
+
+    def test_model_is_loaded_lazily_and_shared(self):
+        """Test that construction loads nothing and instances share one model"""
+        first = FasterWhisperTranscriber(batch_size=1, registry=self.registry)
+        second = FasterWhisperTranscriber(batch_size=1, registry=self.registry)
+        self.mock_model.assert_not_called()
+
+        first.transcribe(self.audio)
+        second.transcribe(self.audio)
+
+        self.mock_model.assert_called_once()
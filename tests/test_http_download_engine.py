@@ -0,0 +1,249 @@
+import pytest
+import os
+import json
+import tempfile
+import shutil
+from unittest.mock import patch, MagicMock
+from EchoInStone.capture.http_download_engine import HttpDownloadEngine
+
+
+class FakeResponse:
+    """Minimal stand-in for a streamed requests.Response"""
+
+    def __init__(self, status_code, body=b'', headers=None, fail_after=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.body = body
+        self.fail_after = fail_after
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"HTTP {self.status_code}")
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.body), 4):
+            if self.fail_after is not None and start >= self.fail_after:
+                raise ConnectionError("connection dropped")
+            yield self.body[start:start + 4]
+
+
+class FakeServer:
+    """Serves one payload with optional range support through a mocked session"""
+
+    def __init__(self, payload, accept_ranges=True, etag='"v1"'):
+        self.payload = payload
+        self.accept_ranges = accept_ranges
+        self.etag = etag
+        self.failures = {}
+        self.requests = []
+
+    def head(self, url, **kwargs):
+        headers = {'Content-Length': str(len(self.payload)), 'ETag': self.etag}
+        if self.accept_ranges:
+            headers['Accept-Ranges'] = 'bytes'
+        return FakeResponse(200, headers=headers)
+
+    def get(self, url, headers=None, **kwargs):
+        headers = headers or {}
+        byte_range = headers.get('Range')
+        self.requests.append(byte_range)
+        fail_after = self.failures.pop(byte_range, None)
+        if_range = headers.get('If-Range')
+        if byte_range and self.accept_ranges and if_range in (None, self.etag):
+            start, _, end = byte_range[len('bytes='):].partition('-')
+            end = int(end) if end else len(self.payload) - 1
+            content_range = {'Content-Range': f"bytes {start}-{end}/{len(self.payload)}"}
+            return FakeResponse(206, self.payload[int(start):end + 1], headers=content_range, fail_after=fail_after)
+        return FakeResponse(200, self.payload, fail_after=fail_after)
+
+
+class TestHttpDownloadEngine:
+
+    def setup_method(self):
+        """Setup test environment before each test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.destination = os.path.join(self.temp_dir, "episode.mp3")
+        self.payload = bytes(range(256)) * 4
+
+    def teardown_method(self):
+        """Cleanup test environment after each test"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def make_engine(self, server, **kwargs):
+        session = MagicMock()
+        session.head.side_effect = server.head
+        session.get.side_effect = server.get
+        return HttpDownloadEngine(session=session, part_size=100, min_parallel_size=200, max_retries=2, **kwargs)
+
+    def read_destination(self):
+        with open(self.destination, 'rb') as f:
+            return f.read()
+
+    def test_default_session_is_pooled_and_sends_user_agent(self):
+        """Test that the engine creates one pooled session carrying the User-Agent"""
+        engine = HttpDownloadEngine(max_workers=8)
+
+        assert 'Mozilla' in engine.session.headers['User-Agent']
+        assert engine.session.get_adapter('https://example.com')._pool_maxsize == 10
+
+    def test_head_response_is_reused(self):
+        """Test that validation and download share a single HEAD request"""
+        server = FakeServer(self.payload)
+        engine = self.make_engine(server)
+
+        engine.head("https://example.com/episode.mp3")
+        engine.download("https://example.com/episode.mp3", self.destination)
+
+        assert engine.session.head.call_count == 1
+
+    def test_ranged_download_reassembles_the_file(self):
+        """Test that parallel ranges are written at the right offsets"""
+        server = FakeServer(self.payload)
+        engine = self.make_engine(server, max_workers=4)
+
+        engine.download("https://example.com/episode.mp3", self.destination)
+
+        assert self.read_destination() == self.payload
+        assert len(server.requests) == 11
+        assert not os.path.exists(self.destination + '.part')
+        assert not os.path.exists(self.destination + '.part.json')
+
+    def test_failed_range_is_retried(self):
+        """Test that a dropped range is fetched again"""
+        server = FakeServer(self.payload)
+        server.failures['bytes=300-399'] = 8
+        engine = self.make_engine(server)
+
+        engine.download("https://example.com/episode.mp3", self.destination)
+
+        assert self.read_destination() == self.payload
+        assert server.requests.count('bytes=300-399') == 2
+
+    def test_interrupted_ranged_download_resumes(self):
+        """Test that completed ranges are not downloaded again after a failure"""
+        server = FakeServer(self.payload)
+        server.failures['bytes=500-599'] = 0
+        engine = self.make_engine(server, max_workers=1)
+        engine.max_retries = 1
+
+        with pytest.raises(ConnectionError):
+            engine.download("https://example.com/episode.mp3", self.destination)
+        with open(self.destination + '.part.json') as f:
+            completed = json.load(f)['completed']
+        assert 5 not in completed
+        assert 0 in completed
+
+        server.requests.clear()
+        engine.download("https://example.com/episode.mp3", self.destination)
+
+        assert self.read_destination() == self.payload
+        assert 'bytes=0-99' not in server.requests
+        assert len(server.requests) == 11 - len(completed)
+
+    def test_changed_remote_file_restarts_the_download(self):
+        """Test that a partial file is discarded when the ETag changed"""
+        server = FakeServer(self.payload)
+        server.failures['bytes=500-599'] = 0
+        engine = self.make_engine(server, max_workers=1)
+        engine.max_retries = 1
+        with pytest.raises(ConnectionError):
+            engine.download("https://example.com/episode.mp3", self.destination)
+
+        server.etag = '"v2"'
+        server.requests.clear()
+        engine = self.make_engine(server, max_workers=1)
+        engine.download("https://example.com/episode.mp3", self.destination)
+
+        assert self.read_destination() == self.payload
+        assert len(server.requests) == 11
+
+    def test_single_stream_resumes_with_range_header(self):
+        """Test that a small file resumes from the bytes already written"""
+        server = FakeServer(self.payload[:150])
+        server.failures[None] = 80
+        engine = self.make_engine(server)
+
+        engine.download("https://example.com/episode.mp3", self.destination)
+
+        assert self.read_destination() == self.payload[:150]
+        assert server.requests == [None, 'bytes=80-']
+
+    def test_server_without_ranges_restarts_the_stream(self):
+        """Test that a failed download restarts from zero without range support"""
+        server = FakeServer(self.payload, accept_ranges=False)
+        server.failures[None] = 80
+        engine = self.make_engine(server)
+
+        engine.download("https://example.com/episode.mp3", self.destination)
+
+        assert self.read_destination() == self.payload
+        assert server.requests == [None, None]
+
+    def test_failed_head_is_not_cached(self):
+        """Test that an error response is asked again on the next call"""
+        server = FakeServer(self.payload)
+        engine = self.make_engine(server)
+        engine.session.head.side_effect = [FakeResponse(503), FakeResponse(200, headers={'ETag': '"v1"'})]
+
+        assert engine.head("https://example.com/episode.mp3").status_code == 503
+        assert engine.head("https://example.com/episode.mp3").status_code == 200
+        assert engine.head("https://example.com/episode.mp3").status_code == 200
+        assert engine.session.head.call_count == 2
+
+    def test_head_response_expires(self):
+        """Test that validators older than head_ttl are fetched again"""
+        server = FakeServer(self.payload)
+        engine = self.make_engine(server, head_ttl=60)
+
+        with patch('EchoInStone.capture.http_download_engine.time.monotonic', side_effect=[0.0, 30.0, 90.0, 90.0]):
+            engine.head("https://example.com/episode.mp3")
+            engine.head("https://example.com/episode.mp3")
+            engine.head("https://example.com/episode.mp3")
+
+        assert engine.session.head.call_count == 2
+
+    def test_stream_resume_sends_the_validator(self):
+        """Test that a resumed stream asks for the rest of the same version of the file"""
+        server = FakeServer(self.payload[:150])
+        server.failures[None] = 80
+        engine = self.make_engine(server)
+        sent = []
+        engine.session.get.side_effect = lambda url, headers=None, **kwargs: sent.append(headers) or server.get(url, headers, **kwargs)
+
+        engine.download("https://example.com/episode.mp3", self.destination)
+
+        assert sent[1] == {'Range': 'bytes=80-', 'If-Range': '"v1"'}
+        assert not os.path.exists(self.destination + '.part.json')
+
+    def test_stale_partial_stream_is_not_resumed(self):
+        """Test that a partial file left by an older version of the file is discarded"""
+        server = FakeServer(self.payload[:150], etag='"v2"')
+        with open(self.destination + '.part', 'wb') as f:
+            f.write(b'old bytes')
+        with open(self.destination + '.part.json', 'w') as f:
+            json.dump({'size': None, 'etag': '"v1"', 'completed': []}, f)
+        engine = self.make_engine(server)
+
+        engine.download("https://example.com/episode.mp3", self.destination)
+
+        assert self.read_destination() == self.payload[:150]
+        assert server.requests == [None]
+
+    def test_changed_file_during_resume_is_downloaded_again(self):
+        """Test that a server answering If-Range with the whole file restarts the stream"""
+        server = FakeServer(self.payload[:150])
+        server.failures[None] = 80
+        engine = self.make_engine(server)
+        get = server.get
+
+        def change_then_get(url, headers=None, **kwargs):
+            if headers:
+                server.etag = '"v2"'
+            return get(url, headers, **kwargs)
+        engine.session.get.side_effect = change_then_get
+
+        engine.download("https://example.com/episode.mp3", self.destination)
+
+        assert self.read_destination() == self.payload[:150]
+        assert server.requests == [None, 'bytes=80-']
@@ -0,0 +1,65 @@
+import pytest
+import os
+import sys
+import json
+import tempfile
+import subprocess
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_SCRIPT = os.path.join(PROJECT_ROOT, 'main.py')
+HEAVY_MODULES = ['torch', 'transformers', 'pyannote.audio', 'pyannote.core']
+
+
+def import_in_fresh_interpreter(statement):
+    """Run an import in a new interpreter and report its duration and the heavy modules it loaded"""
+    code = (
+        "import sys, time, json\n"
+        "started = time.perf_counter()\n"
+        f"{statement}\n"
+        "elapsed = time.perf_counter() - started\n"
+        f"print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    # Run outside the repository so that configure_logging writes its app.log elsewhere
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [PROJECT_ROOT, os.environ.get('PYTHONPATH')])))
+    with tempfile.TemporaryDirectory() as work_dir:
+        result = subprocess.run([sys.executable, "-c", code], cwd=work_dir, env=env, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class TestImportBudget:
+
+    # Generous bound: importing torch alone takes several seconds
+    BUDGET_SECONDS = 3.0
+
+    def test_capture_package_does_not_load_model_libraries(self):
+        """Test that the capture package stays free of torch, transformers and pyannote"""
+        report = import_in_fresh_interpreter("import EchoInStone.capture")
+
+        assert report['loaded'] == []
+        assert report['seconds'] < self.BUDGET_SECONDS
+
+    def test_processing_package_is_lazy(self):
+        """Test that importing the processing package and its orchestrator loads no model library"""
+        report = import_in_fresh_interpreter(
+            "import EchoInStone.processing\nfrom EchoInStone.processing import AudioProcessingOrchestrator, SegmentPlanner"
+        )
+
+        assert report['loaded'] == []
+
+    def test_model_classes_defer_their_libraries(self):
+        """Test that the model modules only import their libraries when a model is built"""
+        report = import_in_fresh_interpreter(
+            "from EchoInStone.processing import WhisperAudioTranscriber, PyannoteDiarizer, EnergyVoiceActivityDetector"
+        )
+
+        assert report['loaded'] == []
+
+    def test_cli_help_does_not_load_model_libraries(self):
+        """Test that --help answers without importing the model libraries"""
+        report = import_in_fresh_interpreter(
+            "import runpy\nsys.argv = ['main.py', '--help']\n"
+            f"try:\n    runpy.run_path({MAIN_SCRIPT!r}, run_name='__main__')\nexcept SystemExit:\n    pass"
+        )
+
+        assert report['loaded'] == []
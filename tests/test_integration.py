@@ -26,34 +26,27 @@ class TestIntegration:
         downloader = get_downloader(rfi_url, self.temp_dir)
         assert isinstance(downloader, AudioDownloader)
     
-    @patch('EchoInStone.capture.audio_downloader.requests')
     @patch('EchoInStone.capture.audio_downloader.AudioSegment')
-    def test_rfi_mp3_url_download_process(self, mock_audio, mock_requests):
+    def test_rfi_mp3_url_download_process(self, mock_audio):
         """Test that the RFI MP3 URL follows the correct download process"""
         rfi_url = "https://aod-rfi.akamaized.net/rfi/francais/audio/modules/actu/202505/RADIO_FOOT_30-05-25_-_PSG_Reims.mp3"
         
         # Setup mocks
-        mock_response = MagicMock()
-        mock_response.iter_content.return_value = [b'fake', b'mp3', b'content']
-        mock_response.raise_for_status.return_value = None
-        mock_requests.get.return_value = mock_response
-        
         mock_audio_instance = MagicMock()
         mock_audio.from_file.return_value = mock_audio_instance
         
         # Get downloader and test download
         downloader = get_downloader(rfi_url, self.temp_dir)
         
-        # Mock file writing
-        with patch('builtins.open') as mock_file:
+        # Mock the network transfer
+        with patch.object(downloader.engine, 'download') as mock_download:
             result = downloader.download(rfi_url)
             
-            # Verify URL was requested with proper headers
-            mock_requests.get.assert_called_once()
-            args, kwargs = mock_requests.get.call_args
+            # Verify URL was requested through the engine's session, which carries the User-Agent
+            mock_download.assert_called_once()
+            args, kwargs = mock_download.call_args
             assert args[0] == rfi_url
-            assert kwargs['stream'] == True
-            assert 'User-Agent' in kwargs['headers']
+            assert 'Mozilla' in downloader.engine.session.headers['User-Agent']
             
             # Verify the result
             assert result is not None
@@ -0,0 +1,122 @@
+import pytest
+import threading
+import time
+from unittest.mock import patch, MagicMock
+from EchoInStone.processing.model_registry import ModelRegistry
+from EchoInStone.processing.pyannote_diarizer import PyannoteDiarizer
+from EchoInStone.processing.whisper_audio_transcriber import WhisperAudioTranscriber
+
+
+class TestModelRegistry:
+
+    def setup_method(self):
+        """Setup an empty registry before each test"""
+        self.registry = ModelRegistry()
+
+    def teardown_method(self):
+        """Stop any sweeper thread after each test"""
+        self.registry.clear()
+
+    def test_model_is_loaded_once_per_key(self):
+        """Test that later lookups reuse the loaded model"""
+        loader = MagicMock(side_effect=lambda: object())
+
+        first = self.registry.get(("whisper", "tiny", "cpu", "float32"), loader)
+        second = self.registry.get(("whisper", "tiny", "cpu", "float32"), loader)
+        other = self.registry.get(("whisper", "tiny", "cpu", "float16"), loader)
+
+        assert first is second
+        assert other is not first
+        assert loader.call_count == 2
+        assert self.registry.stats() == {'loads': 2, 'hits': 1, 'models': 2}
+
+    def test_concurrent_callers_share_a_single_load(self):
+        """Test that threads asking for the same key wait for one load"""
+        calls = []
+
+        def slow_loader():
+            calls.append(1)
+            time.sleep(0.05)
+            return object()
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.registry.get("model", slow_loader))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+
+    def test_failed_load_is_not_cached(self):
+        """Test that a failing loader is retried on the next lookup"""
+        loader = MagicMock(side_effect=[RuntimeError("no network"), "model"])
+
+        with pytest.raises(RuntimeError):
+            self.registry.get("model", loader)
+
+        assert self.registry.get("model", loader) == "model"
+
+    def test_idle_models_are_released(self):
+        """Test that models unused for idle_timeout seconds are evicted"""
+        self.registry.idle_timeout = 10
+        self.registry.get("old", lambda: "a")
+        self.registry.get("recent", lambda: "b")
+        self.registry._entries["old"]['last_used'] -= 20
+
+        assert self.registry.evict_idle() == ["old"]
+        assert "old" not in self.registry and "recent" in self.registry
+
+    def test_no_timeout_keeps_models(self):
+        """Test that nothing is evicted without an idle timeout"""
+        self.registry.get("model", lambda: "a")
+
+        assert self.registry.evict_idle(now=time.monotonic() + 10 ** 6) == []
+        assert self.registry.evict("model") is True
+        assert self.registry.evict("model") is False
+
+
+class TestLazyModelClasses:
+
+    def setup_method(self):
+        """Setup an empty registry before each test"""
+        self.registry = ModelRegistry()
+
+    @patch('pyannote.audio.Pipeline')
+    def test_diarizer_loads_on_first_use_and_is_shared(self, mock_pipeline):
+        """Test that diarizers load nothing when built and share the pipeline"""
+        first = PyannoteDiarizer(registry=self.registry)
+        second = PyannoteDiarizer(registry=self.registry)
+        mock_pipeline.from_pretrained.assert_not_called()
+
+        assert first.pipeline is second.pipeline
+        mock_pipeline.from_pretrained.assert_called_once()
+
+    @patch('pyannote.audio.Pipeline')
+    def test_diarizer_load_failure_returns_none(self, mock_pipeline):
+        """Test that a failed load is reported as a missing pipeline"""
+        mock_pipeline.from_pretrained.side_effect = OSError("gated model")
+
+        assert PyannoteDiarizer(registry=self.registry).diarize("episode.wav") is None
+
+    def test_transcribers_share_the_whisper_model(self):
+        """Test that the model is loaded once for every transcriber with the same key"""
+        import transformers
+
+        # Resolve the lazy attribute first, so the patch lands on the module the transcriber imports from
+        transformers.pipeline
+        processor = MagicMock()
+        with patch.object(WhisperAudioTranscriber, '_load_model', return_value=("model", processor)) as mock_load, \
+                patch('transformers.pipeline') as mock_pipeline:
+            first = WhisperAudioTranscriber(registry=self.registry)
+            second = WhisperAudioTranscriber(chunking="batched", registry=self.registry)
+            mock_load.assert_not_called()
+
+            first.pipe
+            second.pipe
+
+        mock_load.assert_called_once()
+        assert first.model_key == second.model_key
+        assert mock_pipeline.call_args_list[0][1]['model'] is mock_pipeline.call_args_list[1][1]['model'] == "model"
+        assert mock_pipeline.call_args_list[1][1]['chunk_length_s'] == 30
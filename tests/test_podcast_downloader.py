@@ -0,0 +1,305 @@
+import pytest
+import os
+import tempfile
+import shutil
+import threading
+import time
+import feedparser
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+from EchoInStone.capture.episode_selector import EpisodeSelector
+from EchoInStone.capture.feed_sync_index import FeedSyncIndex
+from EchoInStone.capture.podcast_downloader import PodcastDownloader
+
+# Captured before the tests patch feedparser.parse
+parse_feed = feedparser.parse
+
+FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+  <channel>
+    <title>Test show</title>
+    <item>
+      <title>Episode 3: Finale!</title>
+      <guid>ep-3</guid>
+      <pubDate>Wed, 05 Mar 2025 08:00:00 GMT</pubDate>
+      <enclosure url="https://example.com/ep3.mp3" type="audio/mpeg" length="1"/>
+    </item>
+    <item>
+      <title>Episode 2</title>
+      <guid>ep-2</guid>
+      <pubDate>Wed, 26 Feb 2025 08:00:00 GMT</pubDate>
+      <enclosure url="https://example.com/ep2.mp3" type="audio/mpeg" length="1"/>
+    </item>
+    <item>
+      <title>Trailer without audio</title>
+      <guid>trailer</guid>
+      <pubDate>Thu, 27 Feb 2025 08:00:00 GMT</pubDate>
+    </item>
+    <item>
+      <title>Episode 1</title>
+      <guid>ep-1</guid>
+      <pubDate>Wed, 19 Feb 2025 08:00:00 GMT</pubDate>
+      <enclosure url="https://example.com/ep1.m4a" type="audio/mp4" length="1"/>
+    </item>
+  </channel>
+</rss>
+"""
+
+
+class TestEpisodeSelector:
+
+    def setup_method(self):
+        """Parse the sample feed before each test"""
+        self.entries = feedparser.parse(FEED).entries
+
+    def guids(self, entries):
+        return [EpisodeSelector.guid(entry) for entry in entries]
+
+    def test_latest_n(self):
+        """Test selecting the most recent episodes"""
+        assert self.guids(EpisodeSelector.latest_n(2).select(self.entries)) == ['ep-3', 'trailer']
+
+    def test_date_range(self):
+        """Test selecting episodes by publication date"""
+        selector = EpisodeSelector.date_range(datetime(2025, 2, 20), datetime(2025, 3, 1))
+        assert self.guids(selector.select(self.entries)) == ['trailer', 'ep-2']
+
+    def test_guid_list(self):
+        """Test selecting episodes by GUID"""
+        assert self.guids(EpisodeSelector.by_guid(['ep-1', 'ep-3']).select(self.entries)) == ['ep-3', 'ep-1']
+
+
+class TestPodcastDownloader:
+
+    def setup_method(self):
+        """Setup test environment before each test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.engine = MagicMock()
+        self.engine.download.side_effect = self.fake_download
+        self.downloader = PodcastDownloader(output_dir=self.temp_dir, max_workers=3, engine=self.engine)
+        self.feed = feedparser.parse(FEED)
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def teardown_method(self):
+        """Cleanup test environment after each test"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def fake_download(self, url, destination):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.05)
+        with open(destination, 'wb') as f:
+            f.write(b'audio')
+        with self.lock:
+            self.active -= 1
+        return destination
+
+    @patch('EchoInStone.capture.podcast_downloader.decode_file')
+    @patch('EchoInStone.capture.podcast_downloader.feedparser.parse')
+    def test_batch_download_returns_converted_paths(self, mock_parse, mock_decode):
+        """Test that every selected episode is downloaded concurrently and converted"""
+        mock_parse.return_value = self.feed
+
+        paths = self.downloader.download_episodes("https://example.com/feed.xml")
+
+        assert paths == [
+            os.path.join(self.temp_dir, "Episode_3_Finale_966b3dd8.wav"),
+            os.path.join(self.temp_dir, "Episode_2_529ef3d7.wav"),
+            os.path.join(self.temp_dir, "Episode_1_f3773a6a.wav"),
+        ]
+        destinations = sorted(c.args[1] for c in self.engine.download.call_args_list)
+        assert destinations == sorted(os.path.join(self.temp_dir, name) for name in ("Episode_3_Finale_966b3dd8.mp3", "Episode_2_529ef3d7.mp3", "Episode_1_f3773a6a.m4a"))
+        assert mock_decode.call_count == 3
+        assert self.max_active > 1
+
+    @patch('EchoInStone.capture.podcast_downloader.decode_file')
+    @patch('EchoInStone.capture.podcast_downloader.feedparser.parse')
+    def test_download_returns_latest_episode_path(self, mock_parse, mock_decode):
+        """Test that download returns the path of the most recent episode with audio"""
+        mock_parse.return_value = self.feed
+
+        result = self.downloader.download("https://example.com/feed.xml")
+
+        assert result == os.path.join(self.temp_dir, "Episode_3_Finale_966b3dd8.wav")
+        self.engine.download.assert_called_once()
+
+    @patch('EchoInStone.capture.podcast_downloader.decode_file')
+    @patch('EchoInStone.capture.podcast_downloader.feedparser.parse')
+    def test_failed_episode_is_left_out(self, mock_parse, mock_decode):
+        """Test that one failed episode does not fail the whole batch"""
+        mock_parse.return_value = self.feed
+        mock_decode.side_effect = lambda source, wav, **kwargs: self.fail_on(source, "Episode_2")
+
+        paths = self.downloader.download_episodes("https://example.com/feed.xml", EpisodeSelector.latest_n(2))
+
+        assert paths == [os.path.join(self.temp_dir, "Episode_3_Finale_966b3dd8.wav")]
+
+    def fail_on(self, source, name):
+        if name in source:
+            raise RuntimeError("corrupt file")
+
+    @patch('EchoInStone.capture.podcast_downloader.decode_file')
+    @patch('EchoInStone.capture.podcast_downloader.feedparser.parse')
+    def test_episodes_are_yielded_as_soon_as_they_are_ready(self, mock_parse, mock_decode):
+        """Test that batch iteration hands over the first finished episode while others still download"""
+        mock_parse.return_value = self.feed
+        release = threading.Event()
+        self.engine.download.side_effect = lambda url, destination: (
+            destination if url.endswith("ep3.mp3") else release.wait(5) and destination)
+        self.downloader.selector = EpisodeSelector()
+
+        episodes = self.downloader.iter_download("https://example.com/feed.xml")
+        first = next(episodes)
+        assert not release.is_set()
+        release.set()
+
+        assert first == os.path.join(self.temp_dir, "Episode_3_Finale_966b3dd8.wav")
+        assert sorted(episodes) == [os.path.join(self.temp_dir, "Episode_1_f3773a6a.wav"),
+                                    os.path.join(self.temp_dir, "Episode_2_529ef3d7.wav")]
+
+    @patch('EchoInStone.capture.podcast_downloader.decode_file')
+    @patch('EchoInStone.capture.podcast_downloader.feedparser.parse')
+    def test_repeated_titles_get_their_own_files(self, mock_parse, mock_decode):
+        """Test that rebroadcasts with the same title are not written to the same file"""
+        mock_parse.return_value = parse_feed(FEED.replace("<title>Episode 2</title>", "<title>Episode 1</title>"))
+
+        paths = self.downloader.download_episodes("https://example.com/feed.xml")
+
+        assert len(set(paths)) == 3
+        destinations = [c.args[1] for c in self.engine.download.call_args_list]
+        assert len(set(destinations)) == 3
+
+
+class TestPodcastSync:
+
+    def setup_method(self):
+        """Setup test environment before each test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.index = FeedSyncIndex(os.path.join(self.temp_dir, "feed_index.json"))
+        self.engine = MagicMock()
+        self.engine.download.side_effect = lambda url, destination: destination
+        self.downloader = PodcastDownloader(output_dir=self.temp_dir, engine=self.engine)
+        self.url = "https://example.com/feed.xml"
+
+    def teardown_method(self):
+        """Cleanup test environment after each test"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def fetched(self, xml=FEED, etag='"v1"'):
+        feed = parse_feed(xml)
+        feed['status'] = 200
+        feed['etag'] = etag
+        return feed
+
+    @patch('EchoInStone.capture.podcast_downloader.decode_file')
+    @patch('EchoInStone.capture.podcast_downloader.feedparser.parse')
+    def test_unchanged_feed_downloads_nothing(self, mock_parse, mock_decode):
+        """Test that a 304 answer ends the poll without downloading"""
+        mock_parse.return_value = self.fetched()
+        for path in self.downloader.sync(self.url, self.index):
+            self.downloader.acknowledge(path)
+
+        mock_parse.return_value = feedparser.FeedParserDict(status=304, entries=[])
+        self.engine.download.reset_mock()
+
+        assert self.downloader.sync(self.url, self.index) == []
+        assert mock_parse.call_args.kwargs['etag'] == '"v1"'
+        self.engine.download.assert_not_called()
+
+    @patch('EchoInStone.capture.podcast_downloader.decode_file')
+    @patch('EchoInStone.capture.podcast_downloader.feedparser.parse')
+    def test_only_new_episodes_are_downloaded(self, mock_parse, mock_decode):
+        """Test that processed GUIDs are skipped on the next poll"""
+        self.index.mark_processed(self.url, ['ep-1', 'ep-2'])
+        mock_parse.return_value = self.fetched()
+
+        paths = self.downloader.sync(self.url, self.index)
+        for path in paths:
+            self.downloader.acknowledge(path)
+
+        assert paths == [os.path.join(self.temp_dir, "Episode_3_Finale_966b3dd8.wav")]
+        reloaded = FeedSyncIndex(self.index.index_path)
+        assert reloaded.processed(self.url) == {'ep-1', 'ep-2', 'ep-3'}
+        assert reloaded.validators(self.url) == ('"v1"', None)
+
+    @patch('EchoInStone.capture.podcast_downloader.decode_file')
+    @patch('EchoInStone.capture.podcast_downloader.feedparser.parse')
+    def test_failed_episode_keeps_previous_validators(self, mock_parse, mock_decode):
+        """Test that a failed episode is retried on the next poll"""
+        mock_parse.return_value = self.fetched()
+        mock_decode.side_effect = lambda source, wav, **kwargs: self.fail_on(source, "Episode_2")
+
+        for path in self.downloader.sync(self.url, self.index):
+            self.downloader.acknowledge(path)
+
+        assert self.index.processed(self.url) == {'ep-1', 'ep-3'}
+        assert self.index.validators(self.url) == (None, None)
+
+    @patch('EchoInStone.capture.podcast_downloader.decode_file')
+    @patch('EchoInStone.capture.podcast_downloader.feedparser.parse')
+    def test_unacknowledged_episode_is_handed_back(self, mock_parse, mock_decode):
+        """Test that an episode whose processing failed is downloaded again by the next sync"""
+        mock_parse.return_value = self.fetched()
+        paths = self.downloader.sync(self.url, self.index)
+        for path in paths[1:]:
+            self.downloader.acknowledge(path)
+
+        reloaded = FeedSyncIndex(self.index.index_path)
+        assert reloaded.processed(self.url) == {'ep-1', 'ep-2'}
+        assert reloaded.validators(self.url) == (None, None)
+
+        self.engine.download.reset_mock()
+        assert self.downloader.sync(self.url, reloaded) == [paths[0]]
+        self.engine.download.assert_called_once()
+
+    @patch('EchoInStone.capture.podcast_downloader.decode_file')
+    @patch('EchoInStone.capture.podcast_downloader.feedparser.parse')
+    def test_failed_fetch_keeps_the_validators(self, mock_parse, mock_decode):
+        """Test that a fetch without a 2xx status does not overwrite the stored validators"""
+        self.index.update_validators(self.url, '"v1"', "Wed, 05 Mar 2025 08:00:00 GMT")
+        mock_parse.return_value = feedparser.FeedParserDict(bozo=1, entries=[])
+
+        assert self.downloader.sync(self.url, self.index) == []
+        assert self.index.validators(self.url) == ('"v1"', "Wed, 05 Mar 2025 08:00:00 GMT")
+
+    @patch('EchoInStone.capture.podcast_downloader.decode_file')
+    @patch('EchoInStone.capture.podcast_downloader.feedparser.parse')
+    def test_unselected_new_episodes_keep_the_validators(self, mock_parse, mock_decode):
+        """Test that episodes left out by the selector are picked up by the next poll"""
+        self.index.mark_processed(self.url, ['ep-1'])
+        mock_parse.return_value = self.fetched()
+
+        for path in self.downloader.sync(self.url, self.index, EpisodeSelector.latest_n(1)):
+            self.downloader.acknowledge(path)
+
+        assert self.index.processed(self.url) == {'ep-1', 'ep-3'}
+        assert self.index.validators(self.url) == (None, None)
+
+        paths = self.downloader.sync(self.url, self.index, EpisodeSelector.latest_n(1))
+        for path in paths:
+            self.downloader.acknowledge(path)
+
+        assert mock_parse.call_args.kwargs['etag'] is None
+        assert paths == [os.path.join(self.temp_dir, "Episode_2_529ef3d7.wav")]
+        assert self.index.processed(self.url) == {'ep-1', 'ep-2', 'ep-3'}
+        assert self.index.validators(self.url) == ('"v1"', None)
+
+    def fail_on(self, source, name):
+        if name in source:
+            raise RuntimeError("corrupt file")
+
+    @patch('EchoInStone.capture.podcast_downloader.decode_file')
+    @patch('EchoInStone.capture.podcast_downloader.feedparser.parse')
+    def test_validated_feed_is_parsed_once(self, mock_parse, mock_decode):
+        """Test that download reuses the feed parsed by validate_url"""
+        mock_parse.return_value = self.fetched()
+
+        assert self.downloader.validate_url(self.url)
+        self.downloader.download(self.url)
+
+        assert mock_parse.call_count == 1
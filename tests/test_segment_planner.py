@@ -0,0 +1,49 @@
+import pytest
+from pyannote.core import Annotation, Segment
+from EchoInStone.processing.segment_planner import SegmentPlanner
+
+
+def make_diarization(turns):
+    """Build an annotation from (start, end, speaker) turns"""
+    diarization = Annotation()
+    for index, (start, end, speaker) in enumerate(turns):
+        diarization[Segment(start, end), index] = speaker
+    return diarization
+
+
+class TestSegmentPlanner:
+
+    def setup_method(self):
+        """Setup planner before each test"""
+        self.planner = SegmentPlanner(target_s=10.0, max_s=15.0, min_s=0.2, merge_gap_s=0.5)
+
+    def test_close_turns_of_a_speaker_are_merged_up_to_target(self):
+        """Test that short same-speaker turns grow into one segment"""
+        segments = self.planner.plan(make_diarization([
+            (0.0, 3.0, "A"), (3.2, 6.0, "A"), (6.3, 9.0, "A"), (9.2, 12.0, "A"),
+        ]))
+
+        assert segments == [(0.0, 9.0, "A"), (9.2, 12.0, "A")]
+
+    def test_speaker_change_and_long_gap_start_new_segments(self):
+        """Test that merging stops at another speaker or a long silence"""
+        segments = self.planner.plan(make_diarization([
+            (0.0, 2.0, "A"), (2.1, 4.0, "B"), (6.0, 8.0, "B"),
+        ]))
+
+        assert segments == [(0.0, 2.0, "A"), (2.1, 4.0, "B"), (6.0, 8.0, "B")]
+
+    def test_long_turn_is_split_into_equal_pieces(self):
+        """Test that a turn longer than max_s is split to fit the model window"""
+        segments = self.planner.plan(make_diarization([(0.0, 25.0, "A")]))
+
+        assert segments == [pytest.approx((0.0, 25 / 3, "A")), pytest.approx((25 / 3, 50 / 3, "A")), pytest.approx((50 / 3, 25.0, "A"))]
+        assert all(end - start <= 15.0 for start, end, _ in segments)
+
+    def test_tiny_turns_are_dropped(self):
+        """Test that turns shorter than min_s are ignored"""
+        assert self.planner.plan(make_diarization([(1.0, 1.1, "A"), (2.0, 3.0, "B")])) == [(2.0, 3.0, "B")]
+
+    def test_missing_diarization(self):
+        """Test that no diarization yields no segments"""
+        assert self.planner.plan(None) == []
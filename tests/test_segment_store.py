@@ -0,0 +1,139 @@
+import os
+import json
+import shutil
+import tempfile
+import numpy as np
+from EchoInStone.utils.data_saver import DataSaver
+from EchoInStone.utils.segment_store import SegmentStore
+
+
+class TestSegmentStore:
+
+    def setup_method(self):
+        """Setup a short conversation between two speakers"""
+        self.segments = [
+            ("A", 0.0, 1.0, " Bonjour"), ("A", 1.0, 2.0, " à tous."), ("B", 2.5, 4.0, " Salut"),
+            ("A", 4.0, 5.0, " Merci"), ("A", 5.0, None, " bien."),
+        ]
+        self.store = SegmentStore.from_segments(self.segments)
+
+    def test_rows_round_trip(self):
+        """Test that rows read back as the tuples they were built from"""
+        assert len(self.store) == 5
+        assert self.store == self.segments
+        assert self.store[2] == ("B", 2.5, 4.0, " Salut")
+        assert self.store[-1] == ("A", 5.0, None, " bien.")
+        assert self.store.labels == ["A", "B"]
+        assert self.store.speaker_ids.tolist() == [0, 0, 1, 0, 0]
+        assert self.store.text_bytes == len("".join(text for *_, text in self.segments).encode('utf-8'))
+
+    def test_appends_grow_the_columns(self):
+        """Test that appending one segment at a time matches building at once"""
+        store = SegmentStore()
+        for segment in self.segments:
+            store.append(*segment)
+
+        assert store == self.store
+        assert len(store.starts) == 5 and len(store._starts) >= 16
+
+    def test_chunks_have_no_speaker(self):
+        """Test that transcription chunks are stored without a speaker"""
+        chunks = [{'timestamp': (0.0, 1.5), 'text': " Hello"}, {'timestamp': (1.5, None), 'text': " there"}]
+
+        store = SegmentStore.from_chunks(chunks)
+
+        assert store.to_list() == [(None, 0.0, 1.5, " Hello"), (None, 1.5, None, " there")]
+        assert store.to_chunks() == chunks
+        assert SegmentStore.from_chunks(store) is store
+
+    def test_consecutive_segments_are_merged(self):
+        """Test that runs of a speaker are merged like SpeakerAligner.merge_consecutive_segments"""
+        merged = self.store.merge_consecutive()
+
+        assert merged == [("A", 0.0, 2.0, " Bonjour à tous."), ("B", 2.5, 4.0, " Salut"), ("A", 4.0, None, " Merci bien.")]
+        assert merged._text is self.store._text
+        assert SegmentStore().merge_consecutive() == []
+
+    def test_time_slices_share_the_columns(self):
+        """Test that slicing by time returns views on the same memory"""
+        view = self.store.between(1.5, 4.2)
+
+        assert view == self.segments[1:4]
+        assert np.shares_memory(view.starts, self.store.starts)
+        assert view._text is self.store._text
+        assert self.store.between(10.0, 20.0) == self.segments[4:]
+        assert self.store.between(2.1, 2.4) == []
+
+    def test_appending_to_a_view_leaves_the_source_alone(self):
+        """Test that views copy their data on the first write"""
+        view = self.store[1:3]
+
+        view.append("C", 4.0, 4.5, " Hé")
+
+        assert view == self.segments[1:3] + [("C", 4.0, 4.5, " Hé")]
+        assert self.store == self.segments
+        self.store.append("B", 6.0, 7.0, " Au revoir")
+        assert view[-1] == ("C", 4.0, 4.5, " Hé")
+
+    def test_new_speakers_of_derived_stores_leave_the_source_alone(self):
+        """Test that views and merged stores copy the label table before adding a speaker"""
+        view = self.store.between(0.0, 1.0)
+        merged = self.store.merge_consecutive()
+
+        view.append("C", 6.0, 7.0, " Hé")
+        merged.append("D", 6.0, 7.0, " ok")
+        merged.label_id("E")
+
+        assert self.store.labels == ["A", "B"]
+        assert repr(self.store) == f"SegmentStore(segments=5, speakers=2, text_bytes={self.store.text_bytes})"
+        assert view.labels == ["A", "B", "C"] and view[-1] == ("C", 6.0, 7.0, " Hé")
+        assert merged.labels == ["A", "B", "D", "E"]
+        self.store.append("F", 8.0, 9.0, " fin")
+        assert view.labels == ["A", "B", "C"]
+
+    def test_select_and_extend(self):
+        """Test that subsets are gathered and other stores appended with their labels remapped"""
+        picked = self.store.select(np.array([False, True, True, False, True]))
+        assert picked == [self.segments[1], self.segments[2], self.segments[4]]
+
+        other = SegmentStore.from_segments([("B", 8.0, 9.0, " ok"), ("C", 9.0, 10.0, " ça va"), (None, 10.0, 11.0, " ?")])
+        picked.extend(other)
+        picked.extend(picked[:1])
+
+        assert picked.to_list()[3:] == [("B", 8.0, 9.0, " ok"), ("C", 9.0, 10.0, " ça va"), (None, 10.0, 11.0, " ?"),
+                                        self.segments[1]]
+        assert picked.labels == ["A", "B", "C"]
+
+    def test_columns_are_smaller_than_tuples(self):
+        """Test that a long transcript takes a fraction of the memory of its tuples"""
+        store = SegmentStore()
+        for index in range(10000):
+            store.append(f"SPEAKER_{index % 3:02d}", index * 2.0, index * 2.0 + 1.5, " some words here")
+
+        assert store.nbytes < 60 * len(store)
+
+
+class TestDataSaverSegments:
+
+    def setup_method(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.saver = DataSaver(output_dir=self.output_dir)
+
+    def teardown_method(self):
+        shutil.rmtree(self.output_dir)
+
+    def test_store_is_saved_like_a_list_of_tuples(self):
+        """Test that the row-by-row JSON is the same as the JSON of the tuples"""
+        segments = [("A", 0.0, 1.0, " Hé \"ho\"\n"), ("B", 1.0, None, " ça")]
+
+        self.saver.save_data("store.json", SegmentStore.from_segments(segments))
+        self.saver.save_data("list.json", segments)
+        self.saver.save_data("empty.json", SegmentStore())
+
+        with open(os.path.join(self.output_dir, "store.json"), encoding='utf-8') as f:
+            saved = f.read()
+        with open(os.path.join(self.output_dir, "list.json"), encoding='utf-8') as f:
+            assert saved == f.read()
+        assert json.loads(saved) == [list(segment) for segment in segments]
+        with open(os.path.join(self.output_dir, "empty.json"), encoding='utf-8') as f:
+            assert f.read() == "[]"
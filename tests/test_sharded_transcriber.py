@@ -0,0 +1,77 @@
+import pytest
+import numpy as np
+import torch
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from EchoInStone.capture.audio_buffer import AudioBuffer
+from EchoInStone.processing import sharded_transcriber
+from EchoInStone.processing.sharded_transcriber import ShardedTranscriber
+
+
+class SecondsTranscriber:
+    """Transcriber emitting one chunk per second of its input"""
+
+    def __init__(self, label="x"):
+        self.label = label
+
+    def transcribe(self, audio):
+        chunks = [{'timestamp': (float(second), float(second + 1)), 'text': f" {self.label}"}
+                  for second in range(int(audio.duration))]
+        return "".join(chunk['text'] for chunk in chunks), chunks
+
+
+class TestShardedTranscriber:
+
+    def setup_method(self):
+        """Setup a transcriber whose workers are threads of the test process"""
+        self.threads = torch.get_num_threads()
+        self.transcriber = ShardedTranscriber(shards=3, threads_per_shard=1, transcriber_class=SecondsTranscriber,
+                                              transcriber_options={'label': "w"}, min_shard_s=10.0,
+                                              search_s=5.0, overlap_s=1.0)
+        self.transcriber._pool = ThreadPoolExecutor(max_workers=3, initializer=sharded_transcriber._init_worker,
+                                                    initargs=(1, SecondsTranscriber, {'label': "w"}))
+
+    def teardown_method(self):
+        self.transcriber.close()
+        torch.set_num_threads(self.threads)
+
+    def test_cuts_are_placed_in_silence(self):
+        """Test that shard boundaries move to the nearest quiet stretch"""
+        sample_rate = 100
+        samples = np.random.default_rng(0).normal(0, 0.3, sample_rate * 60)
+        samples[22 * sample_rate:23 * sample_rate] = 0.0
+        samples[38 * sample_rate:39 * sample_rate] = 0.0
+
+        spans = self.transcriber.split(AudioBuffer(samples, sample_rate=sample_rate))
+
+        assert len(spans) == 3
+        assert spans[0][0] == 0.0 and spans[-1][1] == 60.0
+        assert 22.0 <= spans[0][1] <= 23.0
+        assert 38.0 <= spans[1][1] <= 39.0
+
+    def test_short_audio_uses_fewer_shards(self):
+        """Test that shards are never shorter than the minimum length"""
+        spans = self.transcriber.split(AudioBuffer(np.zeros(100 * 25), sample_rate=100))
+
+        assert len(spans) == 2
+
+    def test_chunks_are_merged_without_duplicates(self):
+        """Test that overlapping shards yield every second exactly once on the global timeline"""
+        with patch.object(ShardedTranscriber, 'split', return_value=[(0.0, 10.0), (10.0, 20.0), (20.0, 30.0)]):
+            transcription, chunks = self.transcriber.transcribe(AudioBuffer(np.zeros(100 * 30), sample_rate=100))
+
+        assert [chunk['timestamp'] for chunk in chunks] == [(float(s), float(s + 1)) for s in range(30)]
+        assert transcription == " w" * 30
+        assert torch.get_num_threads() == 1
+
+    def test_worker_failure_returns_none(self):
+        """Test that a failed shard is logged and reported as None"""
+        with patch.object(SecondsTranscriber, 'transcribe', return_value=(None, None)):
+            assert self.transcriber.transcribe(AudioBuffer(np.zeros(100 * 30), sample_rate=100)) == (None, None)
+
+    def test_keep_own_chunks_uses_the_chunk_middle(self):
+        """Test that a chunk straddling a cut belongs to the shard holding its middle"""
+        chunks = [{'timestamp': (9.0, 10.6), 'text': "a"}, {'timestamp': (9.8, 11.0), 'text': "b"}]
+
+        assert ShardedTranscriber.keep_own_chunks(chunks, 0.0, 10.0) == [chunks[0]]
+        assert ShardedTranscriber.keep_own_chunks(chunks, 10.0, 20.0) == [chunks[1]]
@@ -0,0 +1,106 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+from unittest.mock import MagicMock, patch
+from pyannote.core import Annotation, Segment
+from EchoInStone.capture.audio_buffer import AudioBuffer
+from EchoInStone.processing.model_registry import ModelRegistry
+from EchoInStone.processing.pyannote_diarizer import PyannoteDiarizer
+from EchoInStone.processing.speaker_aligner import SpeakerAligner
+from EchoInStone.processing.speaker_index import SpeakerIndex
+
+
+class TestSpeakerIndex:
+
+    def setup_method(self):
+        """Setup an index with two known voices"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "speakers.npz")
+        self.index = SpeakerIndex(self.path, min_similarity=0.5)
+        self.index.enroll("Alice", [3.0, 0.0, 0.0])
+        self.index.enroll("Bob", [0.0, 2.0, 0.0])
+
+    def teardown_method(self):
+        """Cleanup the index directory"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_match_finds_the_most_similar_voice(self):
+        """Test vectorized matching with a similarity threshold"""
+        names, scores = self.index.match(np.array([[0.1, 1.0, 0.0], [1.0, 0.1, 0.0], [0.0, 0.0, 1.0]]))
+
+        assert names == ["Bob", "Alice", None]
+        assert scores[0] > 0.99 and scores[2] == 0.0
+
+    def test_resolve_names_each_voice_once(self):
+        """Test that two labels matching the same voice do not share its name"""
+        resolved = self.index.resolve(["SPEAKER_00", "SPEAKER_01", "SPEAKER_02"],
+                                      np.array([[0.9, 0.3, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 0.0]]))
+
+        assert resolved == {"SPEAKER_01": "Alice"}
+
+    def test_enrolling_again_refines_the_centroid(self):
+        """Test that repeated enrollment averages the voice instead of adding a row"""
+        self.index.enroll("Alice", [0.0, 0.0, 1.0])
+
+        assert len(self.index) == 2
+        np.testing.assert_allclose(self.index.embeddings[0], [np.sqrt(0.5), 0.0, np.sqrt(0.5)], rtol=1e-6)
+
+    def test_index_is_saved_and_loaded(self):
+        """Test that names and centroids survive a round trip through disk"""
+        for number in range(40):
+            self.index.enroll(f"guest{number}", np.eye(3)[number % 3] + number)
+        self.index.save()
+
+        loaded = SpeakerIndex(self.path)
+
+        assert loaded.names == self.index.names
+        assert loaded.embeddings.dtype == np.float32
+        np.testing.assert_array_equal(loaded.embeddings, self.index.embeddings)
+
+    def test_remove_keeps_the_matrix_dense(self):
+        """Test that the last voice takes the place of a removed one"""
+        self.index.enroll("Carol", [0.0, 0.0, 1.0])
+
+        assert self.index.remove("Alice")
+        assert not self.index.remove("Alice")
+        assert self.index.names == ["Carol", "Bob"]
+        assert self.index.match(np.array([[0.0, 0.0, 1.0]]))[0] == ["Carol"]
+
+
+class TestDiarizerSpeakerNames:
+
+    def setup_method(self):
+        """Setup a diarizer whose pipeline finds a host and an unknown guest"""
+        self.index = SpeakerIndex(min_similarity=0.5)
+        self.index.enroll("Alice", [1.0, 0.0])
+        annotation = Annotation()
+        annotation[Segment(0, 5)] = "SPEAKER_00"
+        annotation[Segment(5, 9)] = "SPEAKER_01"
+        self.pipeline = MagicMock(return_value=(annotation, np.array([[0.0, 1.0], [0.9, 0.1]])))
+        self.diarizer = PyannoteDiarizer(registry=ModelRegistry(), speaker_index=self.index)
+        self.diarizer.pipeline = self.pipeline
+        self.hook_patch = patch('pyannote.audio.pipelines.utils.hook.ProgressHook', MagicMock())
+        self.hook_patch.start()
+
+    def teardown_method(self):
+        self.hook_patch.stop()
+
+    def test_recognised_speakers_carry_their_names(self):
+        """Test that aligned segments use the names of known voices"""
+        diarization = self.diarizer.diarize(AudioBuffer(np.zeros(16000)))
+        timestamps = [{'timestamp': (0.0, 4.0), 'text': " Hello"}, {'timestamp': (5.0, 8.0), 'text': " Hi"}]
+
+        assert self.pipeline.call_args.kwargs['return_embeddings'] is True
+        assert SpeakerAligner().align(" Hello Hi", timestamps, diarization) == [
+            ("SPEAKER_00", 0.0, 4.0, " Hello"), ("Alice", 5.0, 8.0, " Hi")
+        ]
+        assert sorted(self.diarizer.last_embeddings) == ["Alice", "SPEAKER_00"]
+
+    def test_embeddings_follow_the_renamed_labels(self):
+        """Test that returned embeddings are in the order of the new labels"""
+        diarization, embeddings = self.diarizer.diarize(AudioBuffer(np.zeros(16000)), return_embeddings=True)
+
+        assert diarization.labels() == ["Alice", "SPEAKER_00"]
+        np.testing.assert_array_equal(embeddings, [[0.9, 0.1], [0.0, 1.0]])
@@ -0,0 +1,53 @@
+import numpy as np
+from pyannote.core import Annotation, Segment
+from EchoInStone.processing.speaker_linker import SpeakerLinker, normalize_rows
+
+
+def window(turns):
+    """Build an annotation from (start, end, label) turns"""
+    annotation = Annotation()
+    for start, end, label in turns:
+        annotation[Segment(start, end)] = label
+    return annotation
+
+
+class TestSpeakerLinker:
+
+    def setup_method(self):
+        """Setup a linker and two well separated voices"""
+        self.linker = SpeakerLinker(min_similarity=0.5)
+        self.host = np.array([1.0, 0.1, 0.0])
+        self.guest = np.array([0.0, 1.0, 0.2])
+
+    def test_speakers_are_linked_across_windows(self):
+        """Test that local labels of later windows map to the matching global speaker"""
+        first = self.linker.link(window([(0, 10, "A"), (10, 20, "B")]), np.stack([self.host, self.guest]))
+        # Local labels come in the other order in the second window
+        second = self.linker.link(window([(0, 5, "A"), (5, 20, "B")]), np.stack([self.guest * 3, self.host]))
+
+        assert first == {"A": "SPEAKER_00", "B": "SPEAKER_01"}
+        assert second == {"A": "SPEAKER_01", "B": "SPEAKER_00"}
+        assert len(self.linker) == 2
+        np.testing.assert_allclose(self.linker.weights, [25.0, 15.0])
+
+    def test_unmatched_speaker_becomes_a_new_global_speaker(self):
+        """Test that a voice below the similarity threshold is not merged"""
+        self.linker.link(window([(0, 10, "A")]), self.host[np.newaxis])
+        mapping = self.linker.link(window([(0, 10, "A"), (10, 12, "B")]),
+                                   np.stack([self.host, np.array([0.0, 0.0, 1.0])]))
+
+        assert mapping == {"A": "SPEAKER_00", "B": "SPEAKER_01"}
+
+    def test_two_local_speakers_never_share_a_global_one(self):
+        """Test that matching is one to one within a window"""
+        self.linker.link(window([(0, 10, "A")]), self.host[np.newaxis])
+        mapping = self.linker.link(window([(0, 10, "A"), (10, 20, "B")]), np.stack([self.host, self.host * 0.9 + 0.05]))
+
+        assert sorted(mapping.values()) == ["SPEAKER_00", "SPEAKER_01"]
+
+    def test_missing_embedding_is_kept_apart(self):
+        """Test that speakers without an embedding get their own label"""
+        mapping = self.linker.link(window([(0, 10, "A"), (10, 11, "B")]), np.stack([self.host, np.zeros(3)]))
+
+        assert mapping == {"A": "SPEAKER_00", "B": "SPEAKER_01"}
+        assert np.isnan(normalize_rows(np.zeros((1, 3)))).all()
@@ -0,0 +1,58 @@
+import pytest
+import numpy as np
+from pyannote.core import Annotation, Segment
+from EchoInStone.capture.audio_buffer import AudioBuffer
+from EchoInStone.processing.speech_timeline import SpeechTimeline
+
+
+class TestSpeechTimeline:
+
+    def setup_method(self):
+        """Setup a timeline with speech at 2-4 s and 10-13 s of a 20 s file"""
+        self.timeline = SpeechTimeline([(10.0, 13.0), (2.0, 4.0)], duration=20.0)
+
+    def test_regions_are_sorted_merged_and_clipped(self):
+        """Test that overlapping and out-of-range regions are normalised"""
+        timeline = SpeechTimeline([(5, 8), (-1, 2), (7, 9), (19, 25)], duration=20)
+
+        assert timeline.regions == [(0.0, 2.0), (5.0, 9.0), (19.0, 20.0)]
+        assert timeline.speech_seconds == pytest.approx(7.0)
+        assert timeline.skipped_seconds == pytest.approx(13.0)
+
+    def test_compact_keeps_only_speech_samples(self):
+        """Test that the compacted buffer holds the speech regions back to back"""
+        samples = np.repeat(np.arange(20, dtype=np.float32), 100)
+        audio = AudioBuffer(samples, sample_rate=100, source_path="episode.wav")
+
+        compacted = self.timeline.compact(audio)
+
+        assert compacted.duration == pytest.approx(5.0)
+        assert compacted.source_path == "episode.wav"
+        assert list(np.unique(compacted.samples)) == [2, 3, 10, 11, 12]
+
+    def test_times_map_back_to_the_original_audio(self):
+        """Test compacted-to-original time mapping, including region junctions"""
+        assert self.timeline.to_original(0.5) == pytest.approx(2.5)
+        assert self.timeline.to_original(2.0) == pytest.approx(10.0)
+        assert self.timeline.to_original(2.0, is_end=True) == pytest.approx(4.0)
+        assert self.timeline.to_original(4.5) == pytest.approx(12.5)
+
+    def test_transcription_timestamps_are_remapped(self):
+        """Test that chunk timestamps move to the original timeline and None ends are kept"""
+        chunks = [{'timestamp': (0.0, 2.0), 'text': " Hello"}, {'timestamp': (2.5, None), 'text': " world"}]
+
+        remapped = self.timeline.remap_timestamps(chunks)
+
+        assert remapped == [{'timestamp': (2.0, 4.0), 'text': " Hello"}, {'timestamp': (10.5, None), 'text': " world"}]
+        assert chunks[0]['timestamp'] == (0.0, 2.0)
+
+    def test_diarization_turns_are_split_at_skipped_audio(self):
+        """Test that a turn spanning a junction does not cover the skipped audio"""
+        diarization = Annotation(uri="episode")
+        diarization[Segment(0.0, 1.0), "A"] = "SPEAKER_00"
+        diarization[Segment(1.5, 4.0), "B"] = "SPEAKER_01"
+
+        remapped = self.timeline.remap_diarization(diarization)
+
+        turns = [(round(turn.start, 3), round(turn.end, 3), speaker) for turn, _, speaker in remapped.itertracks(yield_label=True)]
+        assert turns == [(2.0, 3.0, "SPEAKER_00"), (3.5, 4.0, "SPEAKER_01"), (10.0, 12.0, "SPEAKER_01")]
@@ -0,0 +1,85 @@
+import numpy as np
+from pyannote.core import Annotation, Segment
+from EchoInStone.processing.speaker_aligner import SpeakerAligner
+from EchoInStone.processing.sweep_line_speaker_aligner import SweepLineSpeakerAligner, assign_turns, candidate_pairs, turn_arrays
+
+
+def random_diarization(rng, turns, duration):
+    """Build an annotation of random, partly overlapping turns"""
+    annotation = Annotation()
+    starts = np.sort(rng.uniform(0, duration, turns))
+    for index, start in enumerate(starts):
+        length = rng.choice([rng.uniform(0.2, 4.0), rng.uniform(10.0, 60.0)], p=[0.95, 0.05])
+        annotation[Segment(round(start, 2), round(start + length, 2)), f"T{index}"] = f"SPEAKER_{rng.integers(4):02d}"
+    return annotation
+
+
+def random_chunks(rng, duration):
+    """Build contiguous 5 s chunks with an open-ended last chunk"""
+    edges = np.round(np.arange(0.0, duration, 5.0), 2)
+    chunks = [{'timestamp': (float(start), float(start) + 5.0), 'text': f" w{index}"} for index, start in enumerate(edges)]
+    chunks[-1]['timestamp'] = (chunks[-1]['timestamp'][0], None)
+    return chunks
+
+
+class TestSweepLineSpeakerAligner:
+
+    def setup_method(self):
+        """Setup both aligners"""
+        self.reference = SpeakerAligner()
+        self.aligner = SweepLineSpeakerAligner()
+
+    def test_output_is_identical_to_the_reference_aligner(self):
+        """Test random diarizations, overlapping turns and ties against SpeakerAligner"""
+        rng = np.random.default_rng(7)
+        for _ in range(20):
+            diarization = random_diarization(rng, turns=int(rng.integers(1, 120)), duration=300.0)
+            chunks = random_chunks(rng, 300.0)
+
+            expected = self.reference.align("", chunks, diarization)
+            assert self.aligner.align("", chunks, diarization) == expected
+
+    def test_ties_go_to_the_earlier_turn(self):
+        """Test that equal overlaps keep the first turn in itertracks order"""
+        diarization = Annotation()
+        diarization[Segment(0.0, 2.0)] = "A"
+        diarization[Segment(1.0, 3.0)] = "B"
+        chunks = [{'timestamp': (1.0, 2.0), 'text': " x"}, {'timestamp': (5.0, 6.0), 'text': " gap"}]
+
+        assert self.aligner.align("", chunks, diarization) == self.reference.align("", chunks, diarization) == [("A", 1.0, 2.0, " x")]
+
+    def test_assign_turns_skips_turns_that_cannot_overlap(self):
+        """Test the sweep with a long turn reaching over later ones"""
+        turn_starts, turn_ends, label_ids, labels = turn_arrays(random_diarization(np.random.default_rng(1), 50, 100.0))
+
+        best = assign_turns([0.0, 40.0, 99.0, 500.0], [1.0, 45.0, 100.0, 501.0], turn_starts, turn_ends)
+
+        brute = []
+        for start, end in [(0.0, 1.0), (40.0, 45.0), (99.0, 100.0), (500.0, 501.0)]:
+            overlap = np.minimum(end, turn_ends) - np.maximum(start, turn_starts)
+            brute.append(int(np.argmax(overlap)) if overlap.max() > 0 else -1)
+        assert best.tolist() == brute
+        assert len(labels) <= 4 and label_ids.dtype == np.int32
+
+    def test_a_spanning_turn_keeps_the_pairs_bounded(self):
+        """Test that one turn covering the file does not make every chunk meet every later turn"""
+        turn_starts = np.concatenate([[0.0], np.arange(20000) * 2.0])
+        turn_ends = np.concatenate([[40000.0], np.arange(20000) * 2.0 + 1.5])
+        chunk_starts = np.arange(0.0, 40000.0, 1.0)
+
+        intervals, turns = candidate_pairs(chunk_starts, chunk_starts + 1.0, turn_starts, turn_ends)
+        best = assign_turns(chunk_starts, chunk_starts + 1.0, turn_starts, turn_ends)
+
+        assert len(intervals) < 4 * (len(chunk_starts) + len(turn_starts))
+        # Chunks inside a short turn tie with the spanning turn, which comes first
+        assert (best == 0).all()
+        best = assign_turns(chunk_starts + 0.5, chunk_starts + 1.5, turn_starts[1:], turn_ends[1:])
+        assert best[:4].tolist() == [0, 1, 1, 2]
+
+    def test_empty_inputs(self):
+        """Test that nothing is aligned without turns or chunks"""
+        diarization = Annotation()
+        diarization[Segment(0.0, 1.0)] = "A"
+
+        assert self.aligner.align("", [], diarization) == []
+        assert self.aligner.align("", [{'timestamp': (0.0, 1.0), 'text': " x"}], Annotation()) == []
@@ -0,0 +1,45 @@
+import pytest
+import os
+from EchoInStone.processing.transcription_accuracy import normalize_words, word_error_rate, compare_cpu_profile, SAMPLE_SPEECH
+
+
+class FakeTranscriber:
+    """Stands in for WhisperAudioTranscriber, text depending on the profile"""
+    instances = []
+
+    def __init__(self, model_name, chunking, registry, cpu_profile=False, compile_encoder=False):
+        self.cpu_profile = cpu_profile
+        self.last_real_time_factor = None
+        FakeTranscriber.instances.append(self)
+
+    def transcribe(self, audio):
+        self.last_real_time_factor = 0.2 if self.cpu_profile else 0.5
+        text = " The quick brown fox jumps." if not self.cpu_profile else " The quick brown fox jumped."
+        return text, []
+
+
+class TestTranscriptionAccuracy:
+
+    def test_words_are_normalized(self):
+        """Test that case and punctuation do not count as errors"""
+        assert normalize_words(" Hello, World! It's me.") == ["hello", "world", "it's", "me"]
+        assert word_error_rate("Hello, world.", "hello world") == 0.0
+
+    def test_word_error_rate_counts_edits(self):
+        """Test substitutions, deletions and insertions"""
+        assert word_error_rate("a b c d", "a x c d") == pytest.approx(0.25)
+        assert word_error_rate("a b c d", "a c d") == pytest.approx(0.25)
+        assert word_error_rate("a b c d", "a b c d e f") == pytest.approx(0.5)
+        assert word_error_rate("", "") == 0.0
+        assert word_error_rate("", "noise") == 1.0
+
+    def test_profile_is_compared_against_fp32_on_the_sample(self):
+        """Test that both configurations transcribe the sample and are scored"""
+        FakeTranscriber.instances = []
+
+        report = compare_cpu_profile(transcriber_class=FakeTranscriber)
+
+        assert os.path.exists(SAMPLE_SPEECH)
+        assert [instance.cpu_profile for instance in FakeTranscriber.instances] == [False, True]
+        assert report["wer"] == pytest.approx(0.2)
+        assert report["fp32_rtf"] == 0.5 and report["cpu_profile_rtf"] == 0.2
@@ -0,0 +1,218 @@
+import pytest
+import numpy as np
+import torch
+from unittest.mock import patch, MagicMock
+from EchoInStone.capture.audio_buffer import AudioBuffer
+from EchoInStone.processing.whisper_audio_transcriber import WhisperAudioTranscriber, CHUNKING_STRATEGIES
+from EchoInStone.processing.model_registry import ModelRegistry
+
+
+class TestWhisperSegmentTranscription:
+
+    def setup_method(self):
+        """Setup a transcriber with a mocked pipeline instead of the real model"""
+        self.transcriber = WhisperAudioTranscriber(batch_size=4, segment_padding_s=0.5, registry=ModelRegistry())
+        self.transcriber.pipe = MagicMock()
+        self.transcriber.pipe.side_effect = lambda inputs, **kwargs: [
+            {'text': f" {len(item['raw']) / item['sampling_rate']:.1f}s"} for item in inputs
+        ]
+        self.audio = AudioBuffer(np.zeros(100 * 20), sample_rate=100)
+
+    def test_segments_are_batched_without_chunking(self):
+        """Test that every segment is one padded pipeline input decoded in batches"""
+        segments = [(1.0, 2.0, "A"), (3.0, 9.0, "B"), (19.8, 20.0, "A")]
+
+        results = self.transcriber.transcribe_segments(self.audio, segments)
+
+        args, kwargs = self.transcriber.pipe.call_args
+        assert kwargs == {'batch_size': 4, 'chunk_length_s': 0, 'return_timestamps': False}
+        assert [len(item['raw']) for item in args[0]] == [700, 200, 70]
+        assert results == [("A", 1.0, 2.0, " 2.0s"), ("B", 3.0, 9.0, " 7.0s"), ("A", 19.8, 20.0, " 0.7s")]
+
+    def test_pipeline_failure_returns_none(self):
+        """Test that errors are logged and reported as None"""
+        self.transcriber.pipe.side_effect = RuntimeError("out of memory")
+
+        assert self.transcriber.transcribe_segments(self.audio, [(0.0, 1.0, "A")]) is None
+
+
+class TestWhisperChunkingStrategies:
+
+    def make_transcriber(self, chunking, batch_size=8):
+        return WhisperAudioTranscriber(chunking=chunking, batch_size=batch_size, registry=ModelRegistry())
+
+    def test_short_windows_keep_the_original_settings(self):
+        """Test that the default strategy is the 5 s window with 1 s strides"""
+        assert self.make_transcriber("short").pipeline_options() == {'chunk_length_s': 5, 'stride_length_s': (1, 1)}
+
+    def test_batched_windows_use_the_batch_size(self):
+        """Test that batched decoding uses full 30 s windows and the configured batch size"""
+        assert self.make_transcriber("batched", batch_size=16).pipeline_options() == {'chunk_length_s': 30, 'batch_size': 16}
+
+    def test_sequential_decoding_disables_chunking(self):
+        """Test that long-form decoding leaves chunking to the model"""
+        assert self.make_transcriber("sequential").pipeline_options() == {}
+
+    def test_unknown_strategy_is_rejected(self):
+        """Test that an unknown strategy fails before any model is loaded"""
+        with patch.object(WhisperAudioTranscriber, '_load_model') as mock_load:
+            with pytest.raises(ValueError):
+                WhisperAudioTranscriber(chunking="huge")
+            mock_load.assert_not_called()
+        assert set(CHUNKING_STRATEGIES) == {"short", "batched", "sequential"}
+
+    def test_real_time_factor_is_recorded(self):
+        """Test that each transcription records its real-time factor"""
+        transcriber = self.make_transcriber("short")
+        transcriber.pipe = MagicMock(return_value={'text': " hi", 'chunks': [{'timestamp': (0.0, 1.0), 'text': " hi"}]})
+
+        with patch('EchoInStone.processing.whisper_audio_transcriber.time.perf_counter', side_effect=[10.0, 11.0]):
+            transcription, _ = transcriber.transcribe(AudioBuffer(np.zeros(16000 * 4)))
+
+        assert transcription == " hi"
+        assert transcriber.last_real_time_factor == pytest.approx(0.25)
+
+
+class TestWhisperCpuProfile:
+
+    def test_linear_layers_are_quantized_and_output_kept(self):
+        """Test that the CPU profile swaps linear layers for int8 dynamic ones"""
+        torch.manual_seed(0)
+        model = torch.nn.Sequential(torch.nn.Linear(16, 32), torch.nn.ReLU(), torch.nn.Linear(32, 4))
+        inputs = torch.randn(8, 16)
+        expected = model(inputs)
+
+        quantized = WhisperAudioTranscriber.apply_cpu_profile(model)
+
+        assert all(not type(layer) is torch.nn.Linear for layer in quantized.modules())
+        with torch.inference_mode():
+            assert torch.allclose(quantized(inputs), expected, atol=0.05)
+
+    def test_missing_quantization_keeps_the_model(self, caplog):
+        """Test that a torch release without torch.ao.quantization leaves the model in full precision"""
+        model = torch.nn.Sequential(torch.nn.Linear(4, 4))
+
+        with patch.object(torch.ao, 'quantization', new=object()):
+            assert WhisperAudioTranscriber.apply_cpu_profile(model) is model
+
+        assert type(model[0]) is torch.nn.Linear
+        assert "int8 dynamic quantization is not available" in caplog.text
+
+    def test_encoder_compile_failure_falls_back_to_eager(self):
+        """Test that a failing compile leaves the quantized model usable"""
+        model = MagicMock()
+        model.get_encoder.return_value.compile.side_effect = RuntimeError("no compiler")
+
+        with patch('torch.ao.quantization.quantize_dynamic', side_effect=lambda m, *a, **k: m):
+            assert WhisperAudioTranscriber.apply_cpu_profile(model, compile_encoder=True) is model
+        model.get_encoder.return_value.compile.assert_called_once()
+
+
+class TestWhisperStreamingTranscription:
+
+    def setup_method(self):
+        """Setup a transcriber whose pipeline emits one chunk per 4 s of its window"""
+        self.transcriber = WhisperAudioTranscriber(registry=ModelRegistry())
+        self.windows = []
+
+        def fake_pipe(inputs, **kwargs):
+            duration = len(inputs['raw']) / inputs['sampling_rate']
+            self.windows.append(duration)
+            starts = np.arange(0.0, duration, 4.0)
+            return {'chunks': [{'timestamp': (start, min(start + 4.0, duration)), 'text': f" {start:.0f}"} for start in starts]}
+
+        self.transcriber.pipe = MagicMock(side_effect=fake_pipe)
+
+    def test_chunks_are_yielded_per_window_on_the_global_timeline(self):
+        """Test that the cut last chunk of a window is decoded again in the next one"""
+        audio = AudioBuffer(np.zeros(100 * 25), sample_rate=100)
+
+        stream = self.transcriber.transcribe_stream(audio, window_s=10.0)
+        first = next(stream)
+        assert self.windows == [10.0]
+        chunks = [first] + list(stream)
+
+        assert [chunk['timestamp'] for chunk in chunks] == [
+            (0.0, 4.0), (4.0, 8.0), (8.0, 12.0), (12.0, 16.0), (16.0, 20.0), (20.0, 24.0), (24.0, 25.0)
+        ]
+        assert self.windows == [10.0, 10.0, 9.0]
+        assert self.transcriber.pipe.call_args.kwargs == {'chunk_length_s': 0, 'return_timestamps': True}
+
+    def test_files_are_read_block_by_block(self):
+        """Test that a file path is streamed instead of decoded at once"""
+        blocks = [np.zeros(16000 * 10, dtype=np.float32), np.zeros(16000 * 3, dtype=np.float32)]
+
+        with patch.object(AudioBuffer, 'stream_file', return_value=iter(blocks)) as mock_stream, \
+                patch.object(AudioBuffer, 'from_file') as mock_from_file:
+            chunks = list(self.transcriber.transcribe_stream("episode.mp3", window_s=10.0))
+            mock_from_file.assert_not_called()
+
+        mock_stream.assert_called_once_with("episode.mp3", block_s=10.0, sample_rate=16000)
+        assert chunks[-1]['timestamp'] == (12.0, 13.0)
+
+    def test_pipeline_failure_ends_the_stream(self):
+        """Test that errors are logged and end the stream"""
+        self.transcriber.pipe.side_effect = RuntimeError("out of memory")
+
+        assert list(self.transcriber.transcribe_stream(AudioBuffer(np.zeros(100 * 5), sample_rate=100))) == []
+
+    def test_word_timestamps_are_requested_per_window(self):
+        """Test that word mode asks every window for one chunk per word"""
+        transcriber = WhisperAudioTranscriber(word_timestamps=True, registry=ModelRegistry())
+        transcriber.pipe = self.transcriber.pipe
+
+        list(transcriber.transcribe_stream(AudioBuffer(np.zeros(100 * 5), sample_rate=100)))
+
+        assert transcriber.pipe.call_args.kwargs['return_timestamps'] == "word"
+
+
+class TestWhisperAssistedDecoding:
+
+    def setup_method(self):
+        """Setup a transcriber whose models are never loaded"""
+        self.registry = ModelRegistry()
+
+    def teardown_method(self):
+        self.registry.clear()
+
+    def test_draft_model_is_passed_to_greedy_generation(self):
+        """Test that the draft model is handed to generate with greedy decoding"""
+        with patch.object(WhisperAudioTranscriber, '_load_model', return_value=("model", "processor")), \
+                patch.object(WhisperAudioTranscriber, '_load_assistant', return_value="draft") as mock_draft:
+            transcriber = WhisperAudioTranscriber(assistant_model_name="openai/whisper-large-v3-turbo", registry=self.registry)
+            mock_draft.assert_not_called()
+
+            options = transcriber.generate_kwargs()
+
+        assert options == {'max_new_tokens': 400, 'assistant_model': "draft", 'num_beams': 1, 'do_sample': False}
+
+    def test_generation_without_draft_is_unchanged(self):
+        """Test that no assistant options are set by default"""
+        with patch.object(WhisperAudioTranscriber, '_load_model', return_value=("model", "processor")):
+            transcriber = WhisperAudioTranscriber(registry=self.registry)
+
+        assert transcriber.assistant_model is None
+        assert transcriber.generate_kwargs() == {'max_new_tokens': 400}
+
+    def test_batched_chunking_is_rejected(self):
+        """Test that assisted decoding refuses batched windows"""
+        with pytest.raises(ValueError):
+            WhisperAudioTranscriber(chunking="batched", assistant_model_name="openai/whisper-large-v3-turbo",
+                                    registry=self.registry)
+
+    def test_segments_are_decoded_one_at_a_time(self):
+        """Test that speaker segments are not batched while a draft model is used"""
+        transcriber = WhisperAudioTranscriber(segment_padding_s=0.0, assistant_model_name="openai/whisper-large-v3-turbo",
+                                              registry=self.registry)
+        transcriber.pipe = MagicMock(side_effect=lambda inputs, **kwargs: [{'text': " hi"} for _ in inputs])
+        monitor = MagicMock()
+        monitor.__enter__.return_value = monitor
+
+        with patch.object(WhisperAudioTranscriber, '_decoding_monitor', return_value=monitor):
+            results = transcriber.transcribe_segments(AudioBuffer(np.zeros(100 * 5), sample_rate=100), [(0.0, 1.0, "A")])
+
+        assert transcriber.pipe.call_args.kwargs['batch_size'] == 1
+        assert results == [("A", 0.0, 1.0, " hi")]
+        monitor.add_text.assert_called_once_with(" hi")
+        assert transcriber.last_decoding_monitor is monitor
+
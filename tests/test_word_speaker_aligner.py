@@ -0,0 +1,53 @@
+import numpy as np
+from pyannote.core import Annotation, Segment
+from EchoInStone.processing.word_speaker_aligner import WordSpeakerAligner
+
+
+def words(*items):
+    """Build word chunks from (start, end, text) tuples"""
+    return [{'timestamp': (start, end), 'text': text} for start, end, text in items]
+
+
+class TestWordSpeakerAligner:
+
+    def setup_method(self):
+        """Setup a host and a guest who interrupts mid-sentence"""
+        self.aligner = WordSpeakerAligner()
+        self.diarization = Annotation()
+        self.diarization[Segment(0.0, 2.0)] = "HOST"
+        self.diarization[Segment(2.0, 4.0)] = "GUEST"
+        self.diarization[Segment(4.5, 6.0)] = "HOST"
+
+    def test_sentence_is_split_at_the_speaker_change(self):
+        """Test that words of one sentence go to the speaker who says them"""
+        timestamps = words((0.0, 0.5, " So"), (0.5, 1.5, " tell"), (1.6, 2.2, " me"), (2.3, 3.0, " Well"),
+                           (3.0, 3.9, " yes"), (4.6, 5.0, " Thanks"), (5.0, None, " bye"))
+
+        assert self.aligner.align("", timestamps, self.diarization) == [
+            ("HOST", 0.0, 2.2, " So tell me"), ("GUEST", 2.3, 3.9, " Well yes"), ("HOST", 4.6, 6.0, " Thanks bye")
+        ]
+
+    def test_words_outside_turns_follow_the_previous_word(self):
+        """Test that pauses and zero-length words do not drop text"""
+        timestamps = words((-0.5, -0.1, " Hi"), (1.0, 1.0, " uh"), (4.1, 4.3, " um"), (4.6, 5.0, " ok"))
+
+        assert self.aligner.align("", timestamps, self.diarization) == [("HOST", -0.5, 5.0, " Hi uh um ok")]
+
+    def test_empty_inputs(self):
+        """Test that nothing is aligned without words or turns"""
+        assert self.aligner.align("", [], self.diarization) == []
+        assert self.aligner.align("", words((0.0, 1.0, " x")), Annotation()) == []
+
+    def test_hundreds_of_thousands_of_words(self):
+        """Test that a long file is aligned in one vectorized pass"""
+        diarization = Annotation()
+        for index in range(2000):
+            diarization[Segment(index * 60.0, index * 60.0 + 59.5)] = f"SPEAKER_{index % 3:02d}"
+        starts = np.arange(0.0, 120000.0, 0.4)
+        timestamps = [{'timestamp': (start, start + 0.3), 'text': " w"} for start in starts.tolist()]
+
+        segments = self.aligner.align("", timestamps, diarization)
+
+        assert len(timestamps) == 300000
+        assert len(segments) == 2000
+        assert sum(len(text) for _, _, _, text in segments) == 2 * len(timestamps)
@@ -0,0 +1,126 @@
+import pytest
+import os
+import tempfile
+import shutil
+import threading
+import time
+from unittest.mock import patch, MagicMock
+from EchoInStone.capture.youtube_downloader import YouTubeDownloader
+
+
+def make_stream(abr, codec, subtype, bitrate=None):
+    """Build a fake audio-only pytubefix stream"""
+    stream = MagicMock()
+    stream.abr = abr
+    stream.audio_codec = codec
+    stream.subtype = subtype
+    stream.mime_type = f"audio/{subtype}"
+    stream.bitrate = bitrate
+    return stream
+
+
+class TestYouTubeDownloader:
+
+    def setup_method(self):
+        """Setup test environment before each test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.downloader = YouTubeDownloader(output_dir=self.temp_dir)
+        self.m4a_128 = make_stream("128kbps", "mp4a.40.2", "mp4")
+        self.opus_160 = make_stream("160kbps", "opus", "webm")
+        self.opus_50 = make_stream("50kbps", "opus", "webm")
+        self.m4a_48 = make_stream("48kbps", "mp4a.40.5", "mp4")
+        self.opus_48 = make_stream("48kbps", "opus", "webm")
+
+    def teardown_method(self):
+        """Cleanup test environment after each test"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_smallest_good_enough_stream_is_selected(self):
+        """Test that the lowest bitrate at or above the ASR threshold wins"""
+        streams = [self.m4a_128, self.opus_160, self.opus_50]
+        assert self.downloader.select_audio_stream(streams) is self.opus_50
+
+    def test_opus_wins_bitrate_ties(self):
+        """Test that Opus is preferred over AAC at the same bitrate"""
+        assert self.downloader.select_audio_stream([self.m4a_48, self.opus_48]) is self.opus_48
+
+    def test_best_stream_is_used_below_threshold(self):
+        """Test the fallback when every stream is below the threshold"""
+        low = make_stream("32kbps", "opus", "webm")
+        lower = make_stream("24kbps", "opus", "webm")
+        assert self.downloader.select_audio_stream([lower, low]) is low
+
+    def test_numeric_bitrate_takes_precedence(self):
+        """Test that the exact bitrate is used when pytubefix provides it"""
+        precise = make_stream("48kbps", "opus", "webm", bitrate=47000)
+        assert self.downloader.select_audio_stream([precise, self.opus_50]) is self.opus_50
+
+    @patch('EchoInStone.capture.youtube_downloader.decode_file')
+    @patch('EchoInStone.capture.youtube_downloader.YouTube')
+    def test_selected_container_is_decoded_without_rename(self, mock_youtube, mock_decode):
+        """Test that the container is decoded directly to a 16 kHz WAV and then removed"""
+        mock_youtube.return_value.title = "My video: part 1"
+        mock_youtube.return_value.video_id = "abc"
+        mock_youtube.return_value.streams.filter.return_value = [self.m4a_128, self.opus_50]
+        container = os.path.join(self.temp_dir, "My_video_part_1_abc.webm")
+        self.opus_50.download.side_effect = lambda output_path, filename: open(container, 'wb').close() or container
+
+        result = self.downloader.download("https://www.youtube.com/watch?v=abc")
+
+        assert result == os.path.join(self.temp_dir, "My_video_part_1_abc.wav")
+        self.opus_50.download.assert_called_once_with(output_path=self.temp_dir, filename="My_video_part_1_abc.webm")
+        mock_decode.assert_called_once_with(container, result, sample_rate=16000)
+        assert not os.path.exists(container)
+
+    @patch('EchoInStone.capture.youtube_downloader.Playlist')
+    def test_playlist_url_is_expanded(self, mock_playlist):
+        """Test that a watch URL carrying a list parameter expands to the playlist videos"""
+        mock_playlist.return_value.video_urls = ["https://www.youtube.com/watch?v=a", "https://www.youtube.com/watch?v=b"]
+
+        urls = self.downloader.expand("https://www.youtube.com/watch?v=a&list=PL123")
+
+        assert urls == ["https://www.youtube.com/watch?v=a", "https://www.youtube.com/watch?v=b"]
+
+    @patch('EchoInStone.capture.youtube_downloader.Channel')
+    def test_channel_url_is_expanded(self, mock_channel):
+        """Test that channel handles expand to the channel videos"""
+        mock_channel.return_value.video_urls = ["https://www.youtube.com/watch?v=c"]
+
+        assert self.downloader.expand("https://www.youtube.com/@somechannel") == ["https://www.youtube.com/watch?v=c"]
+
+    def test_single_video_is_not_expanded(self):
+        """Test that a plain video URL stays a single item"""
+        assert self.downloader.expand("https://youtu.be/abc") == ["https://youtu.be/abc"]
+
+    def test_playlist_items_are_yielded_as_they_finish(self):
+        """Test that videos are downloaded by a bounded pool and yielded in completion order"""
+        finished = {"https://www.youtube.com/watch?v=slow": threading.Event()}
+        active = []
+        lock = threading.Lock()
+        max_active = [0]
+
+        def fake_download(url):
+            with lock:
+                active.append(url)
+                max_active[0] = max(max_active[0], len(active))
+            if url in finished:
+                finished[url].wait(timeout=5)
+            else:
+                time.sleep(0.02)
+            with lock:
+                active.remove(url)
+            return None if url.endswith("broken") else url + ".wav"
+
+        urls = ["https://www.youtube.com/watch?v=slow"] + [f"https://www.youtube.com/watch?v={i}" for i in range(4)] + ["https://www.youtube.com/watch?v=broken"]
+        with patch.object(self.downloader, 'expand', return_value=urls), \
+             patch.object(self.downloader, 'download', side_effect=fake_download):
+            results = []
+            for path in self.downloader.iter_download("https://www.youtube.com/playlist?list=PL123"):
+                results.append(path)
+                if len(results) == 4:
+                    finished["https://www.youtube.com/watch?v=slow"].set()
+
+        assert results[-1] == "https://www.youtube.com/watch?v=slow.wav"
+        assert len(results) == 5
+        assert max_active[0] <= self.downloader.max_workers